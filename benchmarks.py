@@ -0,0 +1,967 @@
+"""
+Benchmarks for the performance work on the `Article` classes.
+Run every benchmark with `python benchmarks.py`, or select benchmarks by name:
+    python benchmarks.py tokenizer --sizes 1 10 100
+Sizes are given in megabytes of generated article content. The defaults are
+kept small so a full run finishes quickly; pass larger sizes explicitly.
+"""
+from __future__ import annotations
+
+import argparse
+import collections
+import concurrent.futures
+import datetime
+import heapq
+import itertools
+import math
+import os
+import random
+import string
+import sys
+import tempfile
+import timeit
+import tracemalloc
+import typing
+
+import clocks
+from duplicates import DuplicateIndex, MinHash, SimHash
+import introduction
+import fields
+import ids
+from keywords import KeywordIndex
+import ordering
+from fields import ArticleField, SlottedFields
+import parallel
+import qualifier
+import revisions
+from search import SearchIndex
+from store import ArticleStore
+import tokenizer
+from wordfreq import WordFrequencyIndex
+
+MEGABYTE = 1 << 20
+
+Benchmark = typing.Callable[[argparse.Namespace], None]
+BENCHMARKS: typing.Dict[str, Benchmark] = {}
+
+
+def benchmark(func: Benchmark) -> Benchmark:
+    """Register `func` as a benchmark under its name without the `bench_` prefix."""
+    BENCHMARKS[func.__name__[len("bench_"):]] = func
+    return func
+
+
+def best_of(func: typing.Callable[[], typing.Any], repeat: int, number: int = 1) -> float:
+    """Return the fastest time per call of `repeat` runs of `number` calls of `func`, in seconds."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def make_content(n_characters: int, vocabulary_size: int = 5000, seed: int = 2020) -> str:
+    """Generate article-like content of exactly `n_characters` characters."""
+    rng = random.Random(seed)
+    vocabulary = [
+        "".join(rng.choices(string.ascii_letters, k=rng.randint(1, 10)))
+        for _ in range(vocabulary_size)
+    ]
+    separators = [" "] * 12 + [", ", ". ", "\n", "'", " 42 ", "! "]
+
+    # Build a block of words and repeat it; generating every word separately
+    # would make generating the input slower than the code being measured.
+    block = "".join(
+        rng.choice(vocabulary) + rng.choice(separators) for _ in range(20000)
+    )
+    repeats = n_characters // len(block) + 1
+    return (block * repeats)[:n_characters]
+
+
+def write_row(*columns: typing.Any) -> None:
+    """Write a row of a results table."""
+    print("".join(f"{column!s:>16}" for column in columns))
+
+
+def _generator_words(content: str) -> typing.List[str]:
+    """Tokenize `content` with the original per-character generator of `solution.py`."""
+    clean_content = "".join(
+        char if char in string.ascii_lowercase else " "
+        for char in content.lower()
+    )
+    return clean_content.split()
+
+
+@benchmark
+def bench_tokenizer(args: argparse.Namespace) -> None:
+    """Compare the regex tokenizer with the original per-character generator."""
+    write_row("size (MB)", "generator (s)", "tokenizer (s)", "speedup", "same order")
+    for size in args.sizes:
+        content = make_content(int(size * MEGABYTE))
+
+        old = best_of(lambda: collections.Counter(_generator_words(content)), args.repeat)
+        new = best_of(lambda: WordFrequencyIndex.from_words(tokenizer.iter_words(content)), args.repeat)
+
+        # The original implementation relied on `Counter.most_common`, which
+        # keeps words with equal counts in order of first occurrence.
+        expected = collections.Counter(_generator_words(content)).most_common()
+        index = WordFrequencyIndex.from_words(tokenizer.iter_words(content))
+        same_order = expected == list(index.most_common(len(index)).items())
+
+        write_row(size, f"{old:.3f}", f"{new:.3f}", f"{old / new:.1f}x", same_order)
+
+
+@benchmark
+def bench_normalization(args: argparse.Namespace) -> None:
+    """Compare most_common_words with Tokenizer options to the default and to a Python wrapper."""
+    stop_words = tokenizer.ENGLISH_STOP_WORDS
+    rules = tokenizer.Tokenizer(stop_words, stem=True)
+    folding = tokenizer.Tokenizer(stop_words, fold_unicode=True, stem=True)
+
+    def wrapper(content: str) -> typing.Dict[str, int]:
+        # What a caller would write around the default tokenizer without a Tokenizer.
+        words = [tokenizer._stem(word) for word in tokenizer.iter_words(content) if word not in stop_words]
+        return WordFrequencyIndex.from_words(words).most_common(10)
+
+    def fresh(content: str) -> qualifier.Article:
+        return qualifier.Article("title", "author", datetime.datetime(2020, 7, 2), content)
+
+    write_row("size (MB)", "text", "default (s)", "wrapper (s)", "stop+stem (s)", "+fold (s)", "same")
+    for size in args.sizes:
+        ascii_content = make_content(int(size * MEGABYTE))
+        # Accented letters make every chunk take the Unicode paths.
+        for text, content in (("ascii", ascii_content), ("accented", ascii_content.replace(". ", "é. "))):
+            default = best_of(lambda: fresh(content).most_common_words(10), args.repeat)
+            wrapped = best_of(lambda: wrapper(content), args.repeat)
+            stemmed = best_of(lambda: fresh(content).most_common_words(10, rules=rules), args.repeat)
+            folded = best_of(lambda: fresh(content).most_common_words(10, rules=folding), args.repeat)
+            same = wrapper(content) == fresh(content).most_common_words(10, rules=rules)
+            write_row(size, text, f"{default:.3f}", f"{wrapped:.3f}", f"{stemmed:.3f}", f"{folded:.3f}", same)
+
+
+def _double_sort_most_common(words: typing.Iterable[str], n: int) -> typing.Dict[str, int]:
+    """Select the top words the way the original `qualifier.py` did: sort everything twice."""
+    result = {}
+    cal_dict = {}
+    for idx, val in enumerate(words):
+        try:
+            cal_dict[val]["count"] += 1
+        except KeyError:
+            cal_dict[val] = {"count": 1, "idx": idx}
+
+    cal_dict = sorted(cal_dict.items(), key=lambda x: (x[1]["idx"]))
+    cal_dict = sorted(cal_dict, key=lambda x: (x[1]["count"]), reverse=True)
+    for word, entry in cal_dict[:n]:
+        result[word] = entry["count"]
+    return result
+
+
+@benchmark
+def bench_top_k(args: argparse.Namespace) -> None:
+    """Compare bounded top-k selection with the original double sort over the vocabulary."""
+    write_row("size (MB)", "vocabulary", "n", "double sort (s)", "top-k (s)", "speedup", "same result")
+    for size in args.sizes:
+        content = make_content(int(size * MEGABYTE), vocabulary_size=200_000)
+        words = list(tokenizer.iter_words(content))
+        index = WordFrequencyIndex.from_words(words)
+
+        def select_top_k() -> typing.Dict[str, int]:
+            index._ranking = None
+            return index.most_common(n)
+
+        for n in (5, 100, 10_000):
+            old = best_of(lambda: _double_sort_most_common(words, n), args.repeat)
+            new = best_of(select_top_k, args.repeat)
+            same = list(_double_sort_most_common(words, n).items()) == list(select_top_k().items())
+            write_row(size, len(index), n, f"{old:.4f}", f"{new:.4f}", f"{old / new:.1f}x", same)
+
+
+def make_articles(n_articles: int, n_characters: int) -> typing.List[qualifier.Article]:
+    """Create `n_articles` articles with `n_characters` of generated content each."""
+    content = make_content(n_characters * 2)
+    return [
+        qualifier.Article(
+            title=f"Article {i}",
+            author="Benchmark",
+            publication_date=datetime.datetime(2020, 7, 2) + datetime.timedelta(minutes=i),
+            content=content[i % n_characters:i % n_characters + n_characters],
+        )
+        for i in range(n_articles)
+    ]
+
+
+def worker_counts() -> typing.List[int]:
+    """Return 1, 2, 4, ... up to and including the number of CPUs."""
+    cpus = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 < cpus:
+        counts.append(counts[-1] * 2)
+    if cpus > 1:
+        counts.append(cpus)
+    return counts
+
+
+@benchmark
+def bench_parallel(args: argparse.Namespace) -> None:
+    """Measure how most_common_words_many scales with the number of worker processes."""
+    write_row("size (MB)", "workers", "time (s)", "speedup", "efficiency")
+    for size in args.sizes:
+        # Use articles of 64 KiB, which is on the large side for a news article.
+        article_size = 1 << 16
+        articles = make_articles(int(size * MEGABYTE) // article_size, article_size)
+
+        serial = best_of(
+            lambda: [
+                WordFrequencyIndex.from_words(tokenizer.iter_words(article.content)).most_common(10)
+                for article in articles
+            ],
+            args.repeat,
+        )
+        write_row(size, "serial", f"{serial:.3f}", "1.0x", "")
+
+        for workers in worker_counts():
+            duration = best_of(
+                lambda: parallel.most_common_words_many(articles, 10, workers=workers), args.repeat
+            )
+            speedup = serial / duration
+            write_row(size, workers, f"{duration:.3f}", f"{speedup:.1f}x", f"{speedup / workers:.0%}")
+
+
+@benchmark
+def bench_chunked(args: argparse.Namespace) -> None:
+    """Measure counting the words of a single large text in chunks across processes."""
+    write_row("size (MB)", "workers", "time (s)", "speedup", "same result")
+    for size in args.sizes:
+        content = make_content(int(size * MEGABYTE))
+        chunk_size = max(1 << 16, len(content) // 16)
+
+        expected = WordFrequencyIndex.from_words(tokenizer.iter_words(content))
+        serial = best_of(lambda: WordFrequencyIndex.from_words(tokenizer.iter_words(content)), args.repeat)
+        write_row(size, "serial", f"{serial:.3f}", "1.0x", "")
+
+        for workers in worker_counts():
+            duration = best_of(lambda: parallel.count_words(content, workers, chunk_size), args.repeat)
+            index = parallel.count_words(content, workers, chunk_size)
+            same = index.most_common(len(index)) == expected.most_common(len(expected))
+            write_row(size, workers, f"{duration:.3f}", f"{serial / duration:.1f}x", same)
+
+
+def _split_short_introduction(content: str, n_characters: int) -> str:
+    """Build the introduction the way the original `qualifier.py` did: split all words."""
+    ret_list = []
+    total_len = 0
+    for word in content.split():
+        total_len += len(word)
+        if n_characters >= total_len:
+            ret_list.append(word)
+        else:
+            break
+        total_len += 1
+    return " ".join(ret_list)
+
+
+@benchmark
+def bench_short_introduction(args: argparse.Namespace) -> None:
+    """Show that short_introduction takes constant time with respect to the content length."""
+    write_row("size (MB)", "n", "split (us)", "rfind (us)")
+    for size in [1 / 1024, *args.sizes]:
+        content = make_content(int(size * MEGABYTE))
+        for n in (60, 140, 280):
+            # The original implementation is linear in the size of the content
+            # and builds a list of every word, so we skip it for huge inputs.
+            if size <= 100:
+                old = best_of(lambda: _split_short_introduction(content, n), 1)
+                old = f"{old * 1e6:.1f}"
+            else:
+                old = "-"
+            new = best_of(lambda: introduction.short_introduction(content, n), args.repeat, 10_000)
+            write_row(f"{size:.3g}", n, old, f"{new * 1e6:.2f}")
+
+
+def _dict_article_class() -> type:
+    """Return a copy of `qualifier.Article` that stores its attributes in a `__dict__`."""
+    slots = qualifier.Article.__slots__
+    namespace = {
+        name: value
+        for name, value in vars(qualifier.Article).items()
+        if name != "__slots__" and name not in slots
+    }
+    return type("DictArticle", (), namespace)
+
+
+def _traced_bytes(func: typing.Callable[[], typing.Any]) -> typing.Tuple[typing.Any, int]:
+    """Call `func` and return its result with the memory that is still allocated afterwards."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = func()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, after - before
+
+
+def bytes_per_instance(factory: typing.Callable[[int], typing.Any], n_instances: int) -> float:
+    """Return the memory allocated per object created by `factory`, measured with `tracemalloc`."""
+    objects, size = _traced_bytes(lambda: [factory(i) for i in range(n_instances)])
+
+    # Don't count the list holding the objects.
+    return (size - sys.getsizeof(objects)) / n_instances
+
+
+@benchmark
+def bench_memory(args: argparse.Namespace) -> None:
+    """Compare the memory used per Article with and without __slots__."""
+    publication_date = datetime.datetime(2020, 7, 2)
+    classes = {"__dict__": _dict_article_class(), "__slots__": qualifier.Article}
+
+    write_row("articles", "storage", "bytes/article")
+    for n_instances in (10_000, 100_000):
+        for storage, cls in classes.items():
+            # The title, author, date and content are shared by all articles,
+            # so we only measure the article objects themselves (and their ids).
+            size = bytes_per_instance(
+                lambda i: cls("title", "author", publication_date, "content"), n_instances
+            )
+            write_row(n_instances, storage, f"{size:.0f}")
+
+
+@benchmark
+def bench_store(args: argparse.Namespace) -> None:
+    """Compare the memory used by a list of Articles with an ArticleStore holding the same data."""
+    authors = [f"Author {i}" for i in range(100)]
+    start = datetime.datetime(2020, 7, 2)
+    content = make_content(1 << 16)
+
+    def rows(n_articles: int) -> typing.Iterator[typing.Tuple[str, str, datetime.datetime, str]]:
+        # Every article gets its own title, date and content objects, as it
+        # would when they're loaded from a database.
+        for i in range(n_articles):
+            offset = i % (len(content) - 200)
+            yield (
+                f"Article {i}",
+                authors[i % len(authors)],
+                start + datetime.timedelta(minutes=i),
+                content[offset:offset + 200],
+            )
+
+    def fill_store(n_articles: int) -> ArticleStore:
+        store = ArticleStore()
+        for row in rows(n_articles):
+            store.create(*row)
+        return store
+
+    write_row("articles", "storage", "bytes/article", "build (s)", "sort (s)")
+    for n_articles in (10_000, 100_000):
+        articles, size = _traced_bytes(lambda: [qualifier.Article(*row) for row in rows(n_articles)])
+        build = best_of(lambda: [qualifier.Article(*row) for row in rows(n_articles)], 1)
+        sort = best_of(lambda: sorted(articles), args.repeat)
+        write_row(n_articles, "Article", f"{size / n_articles:.0f}", f"{build:.3f}", f"{sort:.3f}")
+        del articles
+
+        store, size = _traced_bytes(lambda: fill_store(n_articles))
+        build = best_of(lambda: fill_store(n_articles), 1)
+        sort = best_of(store.by_publication_date, args.repeat)
+        write_row(n_articles, "ArticleStore", f"{size / n_articles:.0f}", f"{build:.3f}", f"{sort:.3f}")
+
+
+@benchmark
+def bench_sorted_index(args: argparse.Namespace) -> None:
+    """Compare sort keys and the SortedArticles index with sorting the whole feed again."""
+    rng = random.Random(2020)
+    start = datetime.datetime(2020, 7, 2)
+    n_queries = 20
+
+    write_row("articles", "operation", "sorted() (s)", "new (s)", "speedup")
+    for n_articles in (10_000, 100_000, 1_000_000):
+        articles = [
+            qualifier.Article("title", "author", start + datetime.timedelta(seconds=rng.randrange(10 ** 8)), "")
+            for _ in range(n_articles)
+        ]
+        new_articles = [
+            qualifier.Article("title", "author", start + datetime.timedelta(seconds=rng.randrange(10 ** 8)), "")
+            for _ in range(n_queries)
+        ]
+
+        old = best_of(lambda: sorted(articles), args.repeat)
+        new = best_of(lambda: sorted(articles, key=ordering.by_publication_date), args.repeat)
+        write_row(n_articles, "sort", f"{old:.3f}", f"{new:.3f}", f"{old / new:.1f}x")
+
+        # A feed that receives new articles and is asked for the latest ten
+        # after each one: either sort everything again or keep an index.
+        def resort() -> None:
+            feed = list(articles)
+            for article in new_articles:
+                feed.append(article)
+                sorted(feed)[-10:]
+
+        def keep_index() -> None:
+            index = ordering.SortedArticles(articles)
+            for article in new_articles:
+                index.add(article)
+                index.latest(10)
+
+        # Sorting a million articles for every query takes minutes, so we skip it.
+        if n_articles > 100_000:
+            continue
+        old = best_of(resort, 1)
+        new = best_of(keep_index, 1)
+        write_row(n_articles, f"{n_queries} x latest", f"{old:.3f}", f"{new:.3f}", f"{old / new:.1f}x")
+
+
+@benchmark
+def bench_merge(args: argparse.Namespace) -> None:
+    """Compare merging sorted feeds of Articles with merging (date, id, article) tuples."""
+    rng = random.Random(2020)
+    start = datetime.datetime(2020, 7, 2)
+
+    write_row("articles", "feeds", "tuples (s)", "merge_feeds (s)", "speedup")
+    for n_articles in (100_000, 1_000_000):
+        for n_feeds in (4, 64):
+            feeds = [
+                sorted(
+                    qualifier.Article("title", "author", start + datetime.timedelta(seconds=rng.randrange(10 ** 8)), "")
+                    for _ in range(n_articles // n_feeds)
+                )
+                for _ in range(n_feeds)
+            ]
+
+            def merge_tuples() -> None:
+                wrapped = (((article.publication_date, article.id, article) for article in feed) for feed in feeds)
+                collections.deque(heapq.merge(*wrapped), maxlen=0)
+
+            def merge_articles() -> None:
+                collections.deque(ordering.merge_feeds(*feeds), maxlen=0)
+
+            old = best_of(merge_tuples, args.repeat)
+            new = best_of(merge_articles, args.repeat)
+            write_row(n_articles, n_feeds, f"{old:.3f}", f"{new:.3f}", f"{old / new:.1f}x")
+
+
+# The allocator used by `_allocate_ids` in the worker processes of `bench_ids`.
+_worker_allocator: typing.Optional[typing.Iterator[int]] = None
+
+
+def _use_allocator(allocator: typing.Iterator[int]) -> None:
+    """Set the allocator of a worker process (runs in the worker)."""
+    global _worker_allocator
+    _worker_allocator = allocator
+
+
+def _allocate_ids(n_ids: int) -> int:
+    """Take `n_ids` ids from the allocator and return the last one (runs in a worker)."""
+    allocator = _worker_allocator
+    for _ in range(n_ids - 1):
+        next(allocator)
+    return next(allocator)
+
+
+@benchmark
+def bench_ids(args: argparse.Namespace) -> None:
+    """Measure id allocation throughput of the allocators with 1, 8 and 32 threads or processes."""
+    n_ids = 200_000
+    directory = tempfile.TemporaryDirectory()
+
+    def allocators() -> typing.Dict[str, typing.Iterator[int]]:
+        path = os.path.join(directory.name, "ids")
+        if os.path.exists(path):
+            os.remove(path)
+        return {
+            "count": itertools.count(),
+            "SharedCounter": ids.SharedCounter(),
+            "FileCounter": ids.FileCounter(path),
+            "blocks (shared)": ids.BlockAllocator(ids.SharedCounter()),
+            "blocks (file)": ids.BlockAllocator(ids.FileCounter(path)),
+        }
+
+    write_row("workers", "kind", "allocator", "ids/s")
+    with directory:
+        for workers in (1, 8, 32):
+            for name, allocator in allocators().items():
+                # The ids of `count` would collide between processes.
+                kinds = ["threads"] if name == "count" else ["threads", "processes"]
+                for kind in kinds:
+                    if kind == "threads":
+                        _use_allocator(allocator)
+                        executor = concurrent.futures.ThreadPoolExecutor(workers)
+                    else:
+                        executor = concurrent.futures.ProcessPoolExecutor(
+                            workers, initializer=_use_allocator, initargs=(allocator,)
+                        )
+
+                    with executor:
+                        # Start every worker before we start timing.
+                        list(executor.map(_allocate_ids, [1] * workers))
+                        duration = best_of(
+                            lambda: list(executor.map(_allocate_ids, [n_ids // workers] * workers)),
+                            args.repeat,
+                        )
+                    write_row(workers, kind, name, f"{n_ids / duration:,.0f}")
+
+
+@benchmark
+def bench_clocks(args: argparse.Namespace) -> None:
+    """Compare the cost of setting the content of an Article with each last_edited clock."""
+    article = qualifier.Article("title", "author", datetime.datetime(2020, 7, 2), "content")
+    number = 200_000
+    choices = {
+        "datetime.now": None,
+        "monotonic": clocks.monotonic,
+        "coarse (10 ms)": clocks.CoarseClock(0.01),
+    }
+
+    write_row("clock", "set (k/s)", "set+read (k/s)")
+    try:
+        for name, clock in choices.items():
+            qualifier.Article.clock = clock
+            namespace = {"article": article}
+            set_ = min(timeit.repeat("article.content = 'x'", globals=namespace, number=number, repeat=args.repeat))
+            set_and_read = min(timeit.repeat(
+                "article.content = 'x'; article.last_edited", globals=namespace, number=number, repeat=args.repeat
+            ))
+            write_row(name, f"{number / set_ / 1e3:.0f}", f"{number / set_and_read / 1e3:.0f}")
+    finally:
+        qualifier.Article.clock = None
+
+
+@benchmark
+def bench_edits(args: argparse.Namespace) -> None:
+    """Compare editing content in place with setting the whole content, including a recount."""
+    paragraph = make_content(500, seed=1) + "\n"
+    n_edits = 20
+
+    write_row("size (MB)", "edit", "setter (ms)", "edit API (ms)", "speedup")
+    for size in args.sizes:
+        content = make_content(int(size * MEGABYTE))
+        middle = len(content) // 2
+
+        def set_content(edit: typing.Callable[[str], str]) -> float:
+            article = qualifier.Article("title", "author", datetime.datetime(2020, 7, 2), content)
+            article.most_common_words(10)
+            start = timeit.default_timer()
+            for _ in range(n_edits):
+                article.content = edit(article.content)
+                article.most_common_words(10)
+            return (timeit.default_timer() - start) / n_edits
+
+        def edit_in_place(edit: typing.Callable[[qualifier.Article], None]) -> float:
+            article = qualifier.Article("title", "author", datetime.datetime(2020, 7, 2), content)
+            article.most_common_words(10)
+            start = timeit.default_timer()
+            for _ in range(n_edits):
+                edit(article)
+                article.most_common_words(10)
+            return (timeit.default_timer() - start) / n_edits
+
+        cases = {
+            "append": (lambda text: text + paragraph, lambda article: article.append(paragraph)),
+            "insert middle": (
+                lambda text: text[:middle] + paragraph + text[middle:],
+                lambda article: article.insert(middle, paragraph),
+            ),
+        }
+        for name, (string_edit, article_edit) in cases.items():
+            # Time only the edits, not counting the words of the original content.
+            old = min(set_content(string_edit) for _ in range(args.repeat))
+            new = min(edit_in_place(article_edit) for _ in range(args.repeat))
+            write_row(size, name, f"{old * 1e3:.2f}", f"{new * 1e3:.2f}", f"{old / new:.0f}x")
+
+
+@benchmark
+def bench_revisions(args: argparse.Namespace) -> None:
+    """Measure the memory and speed of a RevisionLog over 1,000 edits of a large article."""
+    n_edits = 1000
+    rng = random.Random(2020)
+
+    write_row("size (MB)", "copies (MB)", "log (MB)", "snapshots", "edit (ms)", "edit+log (ms)", "get (ms)")
+    for size in args.sizes:
+        content = make_content(int(size * MEGABYTE))
+        edits = []
+        for _ in range(n_edits):
+            start = rng.randrange(len(content))
+            edits.append((start, start + rng.randint(0, 20), rng.choice(["", "word ", "a longer phrase. "])))
+
+        def edit(log: bool) -> typing.Tuple[qualifier.Article, typing.Optional[revisions.RevisionLog], float]:
+            article = qualifier.Article("title", "author", datetime.datetime(2020, 7, 2), content)
+            revision_log = revisions.RevisionLog(article) if log else None
+            begin = timeit.default_timer()
+            for start, end, text in edits:
+                end = min(end, len(article))
+                article.replace_range(min(start, end), end, text)
+            return article, revision_log, (timeit.default_timer() - begin) / n_edits
+
+        _, _, plain = edit(log=False)
+        article, log, logged = edit(log=True)
+
+        # Keeping a copy of every revision takes the size of each one of them.
+        full_copies = sum(sys.getsizeof(revision.content) for revision in log)
+        numbers = [rng.randrange(len(log)) for _ in range(20)]
+        get = best_of(lambda: [log[number] for number in numbers], args.repeat) / len(numbers)
+        write_row(
+            size,
+            f"{full_copies / MEGABYTE:.0f}",
+            f"{log.nbytes() / MEGABYTE:.1f}",
+            len(log._snapshots),
+            f"{plain * 1e3:.2f}",
+            f"{logged * 1e3:.2f}",
+            f"{get * 1e3:.1f}",
+        )
+
+
+@benchmark
+def bench_search(args: argparse.Namespace) -> None:
+    """Compare tokenizing every article per query with looking the words up in a SearchIndex."""
+    rng = random.Random(2020)
+    n_queries = 20
+
+    write_row("articles", "query", "index (s)", "scan (ms)", "search (ms)", "speedup", "same")
+    for n_articles in (1000, 10_000):
+        articles = make_articles(n_articles, 2000)
+        build = best_of(lambda: SearchIndex(articles), 1)
+        index = SearchIndex(articles)
+
+        words = sorted(index._postings)
+        queries = [" ".join(rng.sample(words, 2)) for _ in range(n_queries)]
+        phrases = []
+        for _ in range(n_queries):
+            article_words = list(tokenizer.iter_words(rng.choice(articles).content))
+            start = rng.randrange(len(article_words) - 3)
+            phrases.append(" ".join(article_words[start:start + 3]))
+
+        def scan(query: str, phrase: bool) -> typing.List[int]:
+            query_words = list(tokenizer.iter_words(query))
+            found = []
+            for article in articles:
+                article_words = list(tokenizer.iter_words(article.content))
+                if phrase:
+                    n = len(query_words)
+                    matches = any(
+                        article_words[i:i + n] == query_words for i in range(len(article_words) - n + 1)
+                    )
+                else:
+                    matches = set(query_words).issubset(article_words)
+                if matches:
+                    found.append(article.id)
+            return found
+
+        for kind, kind_queries, search in (
+            ("all_of", queries, index.all_of),
+            ("phrase", phrases, index.phrase),
+        ):
+            phrase = kind == "phrase"
+            old = best_of(lambda: [scan(query, phrase) for query in kind_queries], 1) / n_queries
+            new = best_of(lambda: [search(query) for query in kind_queries], args.repeat) / n_queries
+            same = all(
+                scan(query, phrase) == sorted(hit.article.id for hit in search(query))
+                for query in kind_queries
+            )
+            write_row(n_articles, kind, f"{build:.2f}", f"{old * 1e3:.1f}", f"{new * 1e3:.3f}", f"{old / new:.0f}x", same)
+
+
+@benchmark
+def bench_keywords(args: argparse.Namespace) -> None:
+    """Compare recounting document frequencies with the cached ones of a KeywordIndex."""
+    n_queries = 20
+
+    def recount(articles: typing.List[qualifier.Article]) -> typing.Counter[str]:
+        document_frequencies: typing.Counter[str] = collections.Counter()
+        for article in articles:
+            document_frequencies.update(article.word_index().counts.keys())
+        return document_frequencies
+
+    def keywords(
+        article: qualifier.Article, document_frequencies: typing.Counter[str], n_articles: int,
+    ) -> typing.List[str]:
+        counts = article.word_index().counts
+        total = sum(counts.values())
+        scores = {
+            word: count / total * (math.log((1 + n_articles) / (1 + document_frequencies[word])) + 1)
+            for word, count in counts.items()
+        }
+        return heapq.nsmallest(10, scores, key=lambda word: (-scores[word], word))
+
+    write_row("articles", "step", "recount (ms)", "index (ms)", "speedup", "same")
+    for n_articles in (1000, 10_000):
+        articles = make_articles(n_articles + 1, 2000)
+        extra = articles.pop()
+        for article in articles:
+            article.word_index()
+        index = KeywordIndex(articles)
+        queries = articles[:n_queries]
+
+        old = best_of(lambda: recount(articles), 1)
+
+        def add_one() -> None:
+            index.add(extra)
+            index.remove(extra)
+
+        new = best_of(add_one, args.repeat) / 2
+        write_row(n_articles, "add article", f"{old * 1e3:.1f}", f"{new * 1e3:.3f}", f"{old / new:.0f}x", "")
+
+        document_frequencies = recount(articles)
+        old = best_of(
+            lambda: [keywords(article, document_frequencies, n_articles) for article in queries], args.repeat
+        ) / n_queries
+        new = best_of(lambda: [index.keywords(article, 10) for article in queries], args.repeat) / n_queries
+        same = all(
+            keywords(article, document_frequencies, n_articles) == list(index.keywords(article, 10))
+            for article in queries
+        )
+        write_row(n_articles, "top 10", f"{old * 1e3:.3f}", f"{new * 1e3:.3f}", f"{old / new:.1f}x", same)
+
+
+@benchmark
+def bench_duplicates(args: argparse.Namespace) -> None:
+    """Find the near-duplicates among 100,000 articles with LSH, and estimate the pairwise cost."""
+    n_articles = 100_000
+    n_copies = n_articles // 10
+    rng = random.Random(2020)
+    vocabulary = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9))) for _ in range(20_000)]
+
+    # Every tenth article is a syndicated copy of an earlier one with a few words changed.
+    texts = [rng.choices(vocabulary, k=100) for _ in range(n_articles - n_copies)]
+    planted = set()
+    for _ in range(n_copies):
+        source = rng.randrange(len(texts))
+        words = list(texts[source])
+        for _ in range(rng.randint(0, 5)):
+            words[rng.randrange(len(words))] = rng.choice(vocabulary)
+        planted.add((source, len(texts)))
+        texts.append(words)
+
+    def shingles(words: typing.List[str]) -> typing.Set[typing.Tuple[str, ...]]:
+        return set(zip(words, words[1:], words[2:]))
+
+    start = datetime.datetime(2020, 7, 2)
+    articles = [qualifier.Article(f"Article {i}", "Wire", start, " ".join(words)) for i, words in enumerate(texts)]
+    first_id = articles[0].id
+
+    # Comparing the shingles of every pair is quadratic: time a sample and scale it up.
+    sample = [shingles(words) for words in texts[:1000]]
+
+    def compare_all() -> None:
+        for i, first in enumerate(sample):
+            for second in sample[i + 1:]:
+                len(first & second) / len(first | second)
+
+    pairwise = best_of(compare_all, 1) * (n_articles / len(sample)) ** 2
+
+    # The copies that are still at least 80% similar, counting shingles, are the ones to find.
+    similar = set()
+    for first, second in planted:
+        first_shingles, second_shingles = shingles(texts[first]), shingles(texts[second])
+        if len(first_shingles & second_shingles) >= 0.8 * len(first_shingles | second_shingles):
+            similar.add((first, second))
+
+    write_row("scheme", "build (s)", "pairs (s)", "pairwise (s)", "similar", "found", "recall")
+    for name, scheme in (("MinHash", MinHash()), ("SimHash", SimHash())):
+        begin = timeit.default_timer()
+        index = DuplicateIndex(articles, scheme=scheme)
+        build = timeit.default_timer() - begin
+
+        begin = timeit.default_timer()
+        found = {(first.id - first_id, second.id - first_id) for first, second, _ in index.pairs()}
+        pairs = timeit.default_timer() - begin
+
+        recall = len(found & similar) / len(similar)
+        write_row(name, f"{build:.1f}", f"{pairs:.2f}", f"{pairwise:.0f}", len(similar), len(found), f"{recall:.3f}")
+
+
+@benchmark
+def bench_encoded(args: argparse.Namespace) -> None:
+    """Compare decoding UTF-8 content for an Article with handing it the bytes, in time and peak memory."""
+
+    def use(content: typing.Union[str, bytes]) -> None:
+        article = qualifier.Article("title", "author", datetime.datetime(2020, 7, 2), content)
+        len(article)
+        article.short_introduction(200)
+        article.most_common_words(10)
+
+    def peak(func: typing.Callable[[], typing.Any]) -> int:
+        tracemalloc.start()
+        try:
+            func()
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    write_row("size (MB)", "text", "decode (s)", "bytes (s)", "decode (MB)", "bytes (MB)", "same")
+    for size in args.sizes:
+        ascii_content = make_content(int(size * MEGABYTE))
+        for text, content in (("ascii", ascii_content), ("accented", ascii_content.replace(". ", "é. "))):
+            data = content.encode("utf-8")
+            old = best_of(lambda: use(data.decode("utf-8")), args.repeat)
+            new = best_of(lambda: use(data), args.repeat)
+            old_peak = peak(lambda: use(data.decode("utf-8")))
+            new_peak = peak(lambda: use(data))
+
+            decoded = qualifier.Article("title", "author", datetime.datetime(2020, 7, 2), content)
+            encoded = qualifier.Article("title", "author", datetime.datetime(2020, 7, 2), data)
+            same = (len(decoded), decoded.short_introduction(200), decoded.most_common_words(10)) == (
+                len(encoded), encoded.short_introduction(200), encoded.most_common_words(10)
+            )
+            write_row(
+                size,
+                text,
+                f"{old:.3f}",
+                f"{new:.3f}",
+                f"{old_peak / MEGABYTE:.1f}",
+                f"{new_peak / MEGABYTE:.1f}",
+                same,
+            )
+
+
+class _PlainModel:
+    """Model with a plain instance attribute."""
+
+    __slots__ = ("value",)
+
+
+class _PropertyModel:
+    """Model with a property that validates the type on assignment."""
+
+    __slots__ = ("_value",)
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    @value.setter
+    def value(self, new_value: int) -> None:
+        if not isinstance(new_value, int):
+            raise TypeError("expected an int")
+        self._value = new_value
+
+
+class _DescriptorField:
+    """The `ArticleField` descriptor as it was before it became a `property`."""
+
+    def __init__(self, field_type: type) -> None:
+        self.field_type = field_type
+        self.attribute_name = None
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        if self.attribute_name is None:
+            self.attribute_name = name
+
+    def __get__(self, obj: typing.Any, owner: type) -> typing.Any:
+        if obj is None:
+            return self
+        try:
+            value = obj.__dict__[self.attribute_name]
+        except KeyError:
+            raise AttributeError(f"{owner.__name__!r} object has no attribute {self.attribute_name!r}") from None
+        return value
+
+    def __set__(self, obj: typing.Any, new_value: typing.Any) -> None:
+        if not isinstance(new_value, self.field_type):
+            raise TypeError(f"expected an instance of type {self.field_type.__name__!r}")
+        obj.__dict__[self.attribute_name] = new_value
+
+
+class _DescriptorModel:
+    """Model with the original descriptor, stored in the instance `__dict__`."""
+
+    value = _DescriptorField(int)
+
+
+class _DictFieldModel:
+    """Model with an ArticleField stored in the instance `__dict__`."""
+
+    value = ArticleField(int)
+
+
+class _SlotFieldModel(metaclass=SlottedFields):
+    """Model with an ArticleField stored in a hidden slot."""
+
+    value = ArticleField(int)
+
+
+@benchmark
+def bench_fields(args: argparse.Namespace) -> None:
+    """Compare attribute get/set throughput of ArticleField with a plain attribute, a property and the old descriptor."""
+    models = {
+        "plain attribute": _PlainModel,
+        "property": _PropertyModel,
+        "descriptor": _DescriptorModel,
+        "field (__dict__)": _DictFieldModel,
+        "field (slot)": _SlotFieldModel,
+    }
+    number = 1_000_000
+
+    write_row("storage", "get (M/s)", "set (M/s)")
+    for storage, cls in models.items():
+        obj = cls()
+        obj.value = 1
+
+        # Time statements rather than lambdas so we don't measure a function
+        # call on top of every attribute access.
+        get = min(timeit.repeat("obj.value", globals={"obj": obj}, number=number, repeat=args.repeat))
+        set_ = min(timeit.repeat("obj.value = 1", globals={"obj": obj}, number=number, repeat=args.repeat))
+        write_row(storage, f"{number / get / 1e6:.1f}", f"{number / set_ / 1e6:.1f}")
+
+
+@benchmark
+def bench_validators(args: argparse.Namespace) -> None:
+    """Show that the cost of assigning to an ArticleField stays flat for richer declared types."""
+    declarations = {
+        "int": ArticleField(int),
+        "Optional[int]": ArticleField(typing.Optional[int]),
+        "Union of 5": ArticleField(typing.Union[bool, int, float, complex, None]),
+        "int, 0..100": ArticleField(int, min_value=0, max_value=100),
+        "Optional, 0..100": ArticleField(typing.Optional[int], min_value=0, max_value=100),
+    }
+    number = 1_000_000
+
+    write_row("declared type", "set (M/s)")
+    for declaration, field in declarations.items():
+        cls = type("Model", (), {"value": field})
+        obj = cls()
+        duration = min(timeit.repeat("obj.value = 1", globals={"obj": obj}, number=number, repeat=args.repeat))
+        write_row(declaration, f"{number / duration / 1e6:.1f}")
+
+
+class _ArchiveRow(fields.FieldModel, metaclass=SlottedFields):
+    """A row loaded from the archive."""
+
+    id = ArticleField(int, min_value=0)
+    title = ArticleField(str, max_length=200)
+    author = ArticleField(str)
+    publication_date = ArticleField(datetime.datetime)
+
+    def __init__(self, id: int, title: str, author: str, publication_date: datetime.datetime):
+        self.id = id
+        self.title = title
+        self.author = author
+        self.publication_date = publication_date
+
+
+@benchmark
+def bench_bulk_create(args: argparse.Namespace) -> None:
+    """Compare bulk_create with creating and validating the same objects one at a time."""
+    write_row("rows", "per object (s)", "bulk (s)", "speedup")
+    for n_rows in (50_000, 500_000):
+        start = datetime.datetime(2020, 7, 2)
+        rows = [(i, f"Article {i}", "Author", start + datetime.timedelta(minutes=i)) for i in range(n_rows)]
+
+        per_object = best_of(lambda: [_ArchiveRow(*row) for row in rows], args.repeat)
+        bulk = best_of(lambda: _ArchiveRow.bulk_create(rows), args.repeat)
+        write_row(n_rows, f"{per_object:.3f}", f"{bulk:.3f}", f"{per_object / bulk:.1f}x")
+
+
+def main() -> None:
+    """Run the benchmarks selected on the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("names", nargs="*", metavar="name", help=", ".join(BENCHMARKS))
+    parser.add_argument("--sizes", nargs="+", type=float, default=[1, 10], metavar="MB")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    unknown = set(args.names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+
+    for name in args.names or BENCHMARKS:
+        print(f"== {name}: {BENCHMARKS[name].__doc__}")
+        BENCHMARKS[name](args)
+        print()
+
+
+if __name__ == "__main__":
+    main()
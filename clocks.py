@@ -0,0 +1,64 @@
+"""
+Clocks for stamping `Article.last_edited` cheaply.
+Setting the content of an article stamps it with `datetime.datetime.now()`,
+which builds a new datetime object from the system time on every edit. An
+editor that sets the content many times per second can use a cheaper clock
+through the `Article.clock` class attribute:
+- `monotonic` returns `time.monotonic_ns()`. The article keeps this integer
+  and only turns it into a datetime when `last_edited` is read.
+- `CoarseClock` returns a cached datetime and only asks the system for the
+  time again once it's older than its resolution.
+A clock is any callable without arguments that returns either a datetime or
+a `time.monotonic_ns()` integer.
+"""
+from __future__ import annotations
+
+import datetime
+import time
+import typing
+
+# The wall time at a moment of the monotonic clock, to convert one into the other.
+_WALL_ANCHOR = datetime.datetime.now()
+_MONOTONIC_ANCHOR = time.monotonic_ns()
+
+Clock = typing.Callable[[], typing.Union[datetime.datetime, int]]
+
+monotonic: Clock = time.monotonic_ns
+
+
+def from_monotonic(nanoseconds: int) -> datetime.datetime:
+    """
+    Return the local time at which `time.monotonic_ns()` returned `nanoseconds`.
+    The monotonic clock is anchored to the wall clock once, when this module
+    is imported. Changes to the system time after that don't affect the
+    result, so stamps from the monotonic clock never go backwards.
+    """
+    return _WALL_ANCHOR + datetime.timedelta(microseconds=(nanoseconds - _MONOTONIC_ANCHOR) // 1000)
+
+
+class CoarseClock:
+    """
+    A clock that returns the same datetime until it's `resolution` seconds old.
+    Checking whether the cached time has expired takes one call to
+    `time.monotonic_ns()`, which is much cheaper than creating a datetime.
+    Stamps may be up to `resolution` seconds earlier than the actual time.
+    """
+
+    __slots__ = ("resolution", "_expires", "_now")
+
+    def __init__(self, resolution: float = 0.01) -> None:
+        self.resolution = resolution
+        self._expires = 0
+        self._now: typing.Optional[datetime.datetime] = None
+
+    def __repr__(self) -> str:
+        """Return the 'official' string representation of the clock."""
+        return f"{self.__class__.__name__}(resolution={self.resolution!r})"
+
+    def __call__(self) -> datetime.datetime:
+        """Return the current time, give or take `resolution` seconds."""
+        ticks = time.monotonic_ns()
+        if ticks >= self._expires:
+            self._now = datetime.datetime.now()
+            self._expires = ticks + int(self.resolution * 1e9)
+        return self._now
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import datetime
+import typing
+
+from wordfreq import WordFrequencyIndex
+
+if typing.TYPE_CHECKING:
+    from qualifier import Article
+
+
+class ArticleIndex:
+    """
+    The bookkeeping shared by the containers that keep data about articles.
+    Articles are kept by id, in the order in which they were added, and the
+    container listens to their content. Subclasses keep their own data up
+    to date through two hooks: `_index` is called with an article that was
+    added and `_unindex` with the id of one that was removed. When the content
+    of an article changes, it's unindexed and indexed again.
+    Subclasses set up their own attributes before calling `__init__`, which
+    adds the initial articles.
+    """
+
+    # What the container is called in error messages.
+    kind = "index"
+
+    def __init__(self, articles: typing.Iterable[Article] = ()) -> None:
+        self._articles: typing.Dict[int, Article] = {}
+
+        for article in articles:
+            self.add(article)
+
+    def __repr__(self) -> str:
+        """Return the 'official' string representation of the container."""
+        cls_name = self.__class__.__name__
+        return f"<{cls_name} articles={len(self)}>"
+
+    def __len__(self) -> int:
+        """Return the number of articles."""
+        return len(self._articles)
+
+    def __contains__(self, article: object) -> bool:
+        """Return `True` if `article` is in the container."""
+        return self._articles.get(getattr(article, "id", None)) is article
+
+    def add(self, article: Article) -> None:
+        """Add an article."""
+        if article.id in self._articles:
+            raise ValueError(f"an article with id {article.id!r} is already in the {self.kind}")
+
+        self._articles[article.id] = article
+        article.add_content_listener(self._content_changed)
+        self._index(article)
+
+    def remove(self, article: Article) -> None:
+        """Remove an article."""
+        if article not in self:
+            raise KeyError(article)
+
+        del self._articles[article.id]
+        article.remove_content_listener(self._content_changed)
+        self._unindex(article.id)
+
+    def _index(self, article: Article) -> None:
+        """Add the data about an article that was just added."""
+
+    def _unindex(self, id_: int) -> None:
+        """Remove the data about the article with id `id_`."""
+
+    def _content_changed(self, article: Article) -> None:
+        """Replace the data about an article after its content has changed."""
+        self._unindex(article.id)
+        self._index(article)
+
+
+class ArticleCollection(ArticleIndex):
+    """
+    A collection of articles that can report the most common words across all of them.
+    The collection keeps a corpus-level `WordFrequencyIndex` that is the sum
+    of the word indexes of its articles. It's built the first time it's needed
+    and kept up to date from then on: adding or removing an article adds or
+    subtracts that article's counts, and setting the content of an article in
+    the collection replaces its old counts by the new ones.
+    Ties are broken by the order in which words first entered the collection,
+    which for articles that never change is the order in which they were added
+    followed by the order of the words within each article.
+    """
+
+    kind = "collection"
+
+    def __init__(self, articles: typing.Iterable[Article] = ()) -> None:
+        # The corpus index and copies of the article indexes it was built
+        # from. We keep the latter so we can subtract the old counts of an
+        # article after its content has changed, as the article itself no
+        # longer has them: editing an article updates its index in place.
+        self._corpus: typing.Optional[WordFrequencyIndex] = None
+        self._indexes: typing.Dict[int, WordFrequencyIndex] = {}
+
+        super().__init__(articles)
+
+    def __iter__(self) -> typing.Iterator[Article]:
+        """Iterate over the articles in the order in which they were added."""
+        return iter(self._articles.values())
+
+    def select(
+        self,
+        author: typing.Optional[str] = None,
+        start: typing.Optional[datetime.datetime] = None,
+        end: typing.Optional[datetime.datetime] = None,
+    ) -> typing.Iterator[Article]:
+        """
+        Iterate over the articles by `author` published in the range [`start`, `end`).
+        Every filter that is `None` is not applied.
+        """
+        for article in self._articles.values():
+            if author is not None and article.author != author:
+                continue
+            if start is not None and article.publication_date < start:
+                continue
+            if end is not None and article.publication_date >= end:
+                continue
+            yield article
+
+    def most_common_words(
+        self,
+        n_words: int,
+        author: typing.Optional[str] = None,
+        start: typing.Optional[datetime.datetime] = None,
+        end: typing.Optional[datetime.datetime] = None,
+    ) -> typing.Dict[str, int]:
+        """
+        Return the `n_words` most common words across the articles with their counts.
+        Without filters, this answers from the corpus index. With filters (see
+        `select`), the indexes of the selected articles are summed on the fly.
+        """
+        if author is None and start is None and end is None:
+            return self._corpus_index().most_common(n_words)
+
+        subset = WordFrequencyIndex()
+        for article in self.select(author, start, end):
+            subset.add(article.word_index())
+        return subset.most_common(n_words)
+
+    def _corpus_index(self) -> WordFrequencyIndex:
+        """Return the corpus index, building it on first use."""
+        if self._corpus is None:
+            self._corpus = WordFrequencyIndex()
+            for article in self._articles.values():
+                self._add_to_corpus(article)
+        return self._corpus
+
+    def _add_to_corpus(self, article: Article) -> None:
+        """Add the counts of `article` to the corpus index."""
+        index = article.word_index()
+        self._indexes[article.id] = index.copy()
+        self._corpus.add(index)
+
+    def _index(self, article: Article) -> None:
+        """Add the counts of an article to the corpus index, if it was built already."""
+        if self._corpus is not None:
+            self._add_to_corpus(article)
+
+    def _unindex(self, id_: int) -> None:
+        """Subtract the counts of an article from the corpus index, if it was built already."""
+        if self._corpus is not None:
+            self._corpus.subtract(self._indexes.pop(id_))
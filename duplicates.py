@@ -0,0 +1,284 @@
+"""
+Near-duplicate detection with compact signatures of the content of articles.
+Comparing the content of every pair of articles is quadratic. Instead, we
+compute a small signature per article from its words (found with the same
+rules as `most_common_words`, see `tokenizer`), such that similar content
+gets similar signatures:
+- `MinHash` estimates the Jaccard similarity of the sets of word shingles
+  (runs of consecutive words) of two articles.
+- `SimHash` estimates the cosine similarity of their word counts as the
+  fraction of equal bits in a 64-bit fingerprint.
+A `DuplicateIndex` then puts every article in one bucket per band (a slice
+of its signature) and only compares articles that share a bucket, which is
+locality-sensitive hashing (LSH):
+    index = DuplicateIndex(articles)
+    index.duplicates(article)
+    index.pairs()
+Signatures only depend on the words of the content, so they can be compared
+between processes, as long as those run the same version of Python: `MinHash`
+relies on the (unsalted) hash of tuples of integers.
+"""
+from __future__ import annotations
+
+import collections
+import functools
+import hashlib
+import operator
+import sys
+import typing
+import zlib
+from array import array
+
+import tokenizer
+from collection import ArticleIndex
+
+if typing.TYPE_CHECKING:
+    from qualifier import Article
+
+Signature = typing.Union[array, int]
+
+
+class MinHash:
+    """
+    One-permutation MinHash of the word shingles of a text.
+    Classic MinHash hashes every shingle with `n_hashes` hash functions and
+    keeps the minimum of each, which would be `n_hashes` Python operations per
+    shingle. We hash every shingle once instead, use the low bits of its hash
+    to pick one of `n_hashes` bins and keep the minimum per bin. Bins that
+    get no shingle borrow the minimum of the next bin that does, rehashed with
+    the distance, so texts that are equal still get equal values. The
+    fraction of bins with the same minimum estimates the Jaccard similarity.
+    The signature is split into `bands` bands of `n_hashes // bands` rows.
+    Two texts with Jaccard similarity `s` share a band with probability
+    `1 - (1 - s ** rows) ** bands`, which rises steeply around
+    `(1 / bands) ** (1 / rows)`: about 0.7 with the defaults.
+    """
+
+    def __init__(self, n_hashes: int = 128, bands: int = 16, shingle_size: int = 3) -> None:
+        if n_hashes <= 0 or n_hashes & (n_hashes - 1):
+            raise ValueError(f"n_hashes must be a power of two, got {n_hashes!r}")
+        if bands <= 0 or n_hashes % bands:
+            raise ValueError(f"bands must divide n_hashes ({n_hashes}), got {bands!r}")
+        if shingle_size <= 0:
+            raise ValueError(f"shingle_size must be positive, got {shingle_size!r}")
+
+        self.n_hashes = n_hashes
+        self.bands = bands
+        self.shingle_size = shingle_size
+
+    def __repr__(self) -> str:
+        """Return the 'official' string representation of the scheme."""
+        cls_name = self.__class__.__name__
+        return f"{cls_name}(n_hashes={self.n_hashes!r}, bands={self.bands!r}, shingle_size={self.shingle_size!r})"
+
+    def signature(self, text: str) -> array:
+        """Return the signature of `text` as an array of `n_hashes` integers."""
+        words = list(tokenizer.iter_words(text))
+        word_hashes = list(map(zlib.crc32, map(str.encode, words)))
+
+        size = self.shingle_size
+        if len(word_hashes) > size:
+            shingles = zip(*(word_hashes[offset:] for offset in range(size)))
+        else:
+            shingles = iter([tuple(word_hashes)])
+
+        # Iterating from the largest hash down leaves the smallest one per bin.
+        n_hashes = self.n_hashes
+        mask = n_hashes - 1
+        minimums = {value & mask: value for value in sorted(set(map(hash, shingles)), reverse=True)}
+        values = list(map(minimums.get, range(n_hashes)))
+
+        # Walk backwards (and around) from the first bin with a minimum, so
+        # `source` is always the nearest bin on the right that has one.
+        if len(minimums) < n_hashes:
+            first = source = min(minimums)
+            for step in range(1, n_hashes):
+                bin_ = (first - step) % n_hashes
+                if values[bin_] is None:
+                    values[bin_] = hash((minimums[source], (source - bin_) % n_hashes))
+                else:
+                    source = bin_
+        return array("q", values)
+
+    def band_keys(self, signature: array) -> typing.List[bytes]:
+        """Return the bucket key of every band of a signature."""
+        rows = self.n_hashes // self.bands
+        data = signature.tobytes()
+        return [data[start:start + 8 * rows] for start in range(0, len(data), 8 * rows)]
+
+    def similarity(self, first: array, second: array) -> float:
+        """Return the estimated Jaccard similarity of the texts of two signatures."""
+        return sum(map(operator.eq, first, second)) / self.n_hashes
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def _spread_bits(word: str) -> int:
+    """
+    Return the 64-bit hash of `word` with every bit moved into a 32-bit lane.
+    Adding these integers adds up the bits of many hashes in one go: lane `b`
+    of the sum is the number of hashes that have bit `b` set.
+    """
+    value = int.from_bytes(hashlib.blake2b(word.encode(), digest_size=8).digest(), "little")
+    spread = 0
+    for bit in range(64):
+        if value >> bit & 1:
+            spread |= 1 << (32 * bit)
+    return spread
+
+
+class SimHash:
+    """
+    A 64-bit SimHash of the word counts of a text.
+    Every word is hashed to 64 bits. Bit `b` of the fingerprint is set when
+    the words with bit `b` set in their hash make up more than half of the
+    text, counting every occurrence. Instead of updating 64 counters per word
+    in Python, we add up the hashes with their bits spread out into lanes of
+    a big integer (see `_spread_bits`), so each word is one multiplication
+    and addition that happens in C.
+    The fingerprint is split into `bands` bands. Fingerprints that differ
+    in fewer than `bands` bits always share one of them.
+    """
+
+    bits = 64
+
+    def __init__(self, bands: int = 4) -> None:
+        if bands <= 0 or self.bits % bands:
+            raise ValueError(f"bands must divide {self.bits}, got {bands!r}")
+        self.bands = bands
+
+    def __repr__(self) -> str:
+        """Return the 'official' string representation of the scheme."""
+        return f"{self.__class__.__name__}(bands={self.bands!r})"
+
+    def signature(self, text: str) -> int:
+        """Return the fingerprint of `text`."""
+        counts = collections.Counter(tokenizer.iter_words(text))
+        lanes = sum(count * _spread_bits(word) for word, count in counts.items())
+
+        # Unpack the lanes of the sum into 64 counters at once; the array
+        # reads its items in native byte order.
+        sums = array("I", lanes.to_bytes(4 * self.bits, sys.byteorder))
+        total = sum(counts.values())
+        bits = "".join("1" if 2 * bit_sum > total else "0" for bit_sum in reversed(sums))
+        return int(bits, 2)
+
+    def band_keys(self, signature: int) -> typing.List[int]:
+        """Return the bucket key of every band of a fingerprint."""
+        width = self.bits // self.bands
+        mask = (1 << width) - 1
+        return [signature >> (width * band) & mask for band in range(self.bands)]
+
+    def similarity(self, first: int, second: int) -> float:
+        """Return the fraction of equal bits of two fingerprints."""
+        return 1 - bin(first ^ second).count("1") / self.bits
+
+
+class Duplicate(typing.NamedTuple):
+    """An article that is similar to another one, with the estimated similarity."""
+
+    article: Article
+    similarity: float
+
+
+class DuplicateIndex(ArticleIndex):
+    """
+    An LSH index of the signatures of a number of articles.
+    Every band of a signature has its own table of buckets, from the key of
+    the band to the ids of the articles with that key. Articles that share a
+    bucket in any band are candidates, and only candidates are compared by
+    their full signatures; those with a similarity of at least `threshold`
+    are duplicates. Like every `ArticleIndex`, the index listens to its
+    articles and computes a new signature when their content changes.
+    """
+
+    def __init__(
+        self,
+        articles: typing.Iterable[Article] = (),
+        scheme: typing.Union[MinHash, SimHash, None] = None,
+        threshold: float = 0.8,
+    ) -> None:
+        self.scheme = MinHash() if scheme is None else scheme
+        self.threshold = threshold
+
+        self._signatures: typing.Dict[int, Signature] = {}
+        self._buckets: typing.List[typing.Dict[typing.Hashable, typing.Set[int]]] = [
+            {} for _ in range(self.scheme.bands)
+        ]
+
+        super().__init__(articles)
+
+    def __repr__(self) -> str:
+        """Return the 'official' string representation of the index."""
+        cls_name = self.__class__.__name__
+        return f"<{cls_name} articles={len(self)} scheme={self.scheme!r}>"
+
+    def signature(self, article: Article) -> Signature:
+        """Return the signature of an article, computing it if it's not in the index."""
+        if article in self:
+            return self._signatures[article.id]
+        return self.scheme.signature(article.content)
+
+    def duplicates(self, article: Article) -> typing.List[Duplicate]:
+        """
+        Return the other articles in the index that are near-duplicates of `article`.
+        The article itself doesn't have to be in the index. The most similar
+        articles come first, and articles that are equally similar by id.
+        """
+        signature = self.signature(article)
+        candidates = set()
+        for buckets, key in zip(self._buckets, self.scheme.band_keys(signature)):
+            candidates.update(buckets.get(key, ()))
+        candidates.discard(article.id)
+
+        similarity = self.scheme.similarity
+        signatures = self._signatures
+        found = []
+        for id_ in sorted(candidates):
+            score = similarity(signature, signatures[id_])
+            if score >= self.threshold:
+                found.append(Duplicate(self._articles[id_], score))
+        found.sort(key=operator.attrgetter("similarity"), reverse=True)
+        return found
+
+    def pairs(self) -> typing.Iterator[typing.Tuple[Article, Article, float]]:
+        """
+        Iterate over every pair of near-duplicates in the index, with their similarity.
+        Each pair is reported once, ordered by id, however many buckets its
+        articles share.
+        """
+        similarity = self.scheme.similarity
+        signatures = self._signatures
+        articles = self._articles
+        seen: typing.Set[typing.Tuple[int, int]] = set()
+
+        for buckets in self._buckets:
+            for ids in buckets.values():
+                if len(ids) < 2:
+                    continue
+                ids = sorted(ids)
+                for i, first in enumerate(ids):
+                    for second in ids[i + 1:]:
+                        if (first, second) in seen:
+                            continue
+                        seen.add((first, second))
+                        score = similarity(signatures[first], signatures[second])
+                        if score >= self.threshold:
+                            yield articles[first], articles[second], score
+
+    def _index(self, article: Article) -> None:
+        """Compute the signature of an article and put it in its buckets."""
+        signature = self._signatures[article.id] = self.scheme.signature(article.content)
+        for buckets, key in zip(self._buckets, self.scheme.band_keys(signature)):
+            if key in buckets:
+                buckets[key].add(article.id)
+            else:
+                buckets[key] = {article.id}
+
+    def _unindex(self, id_: int) -> None:
+        """Take an article out of its buckets and forget its signature."""
+        signature = self._signatures.pop(id_)
+        for buckets, key in zip(self._buckets, self.scheme.band_keys(signature)):
+            bucket = buckets[key]
+            bucket.discard(id_)
+            if not bucket:
+                del buckets[key]
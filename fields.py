@@ -0,0 +1,540 @@
+from __future__ import annotations
+
+import collections.abc
+import itertools
+import operator
+import re
+import types
+import typing
+
+AnyType = typing.TypeVar("AnyType")
+Predicate = typing.Callable[[typing.Any], bool]
+
+# `X | Y` unions have their own type since Python 3.10.
+_UNION_TYPES = (typing.Union, getattr(types, "UnionType", typing.Union))
+
+
+class ArticleField(property):
+    """
+    A data descriptor that validates the type of the values assigned to it.
+    Values are stored on the instance in one of two ways. By default, they go
+    in the instance's `__dict__` under the name of the field. Classes created
+    with the `SlottedFields` metaclass have no `__dict__`; instead, the
+    metaclass adds a hidden slot for every field, which the field stores its
+    value in. The field picks the right storage when it learns its name.
+    A descriptor written in Python pays for a Python-level `__get__` call on
+    every attribute access. That's why `ArticleField` is a `property`: once
+    it knows its name and storage, it hands `property` a getter and a setter
+    made for that storage, so reading a field only runs a small getter that
+    reads the slot or the `__dict__` directly.
+    Besides classes, `field_type` may be a typing construct such as
+    `Optional[str]`, `Union[int, float]` or `List[int]` (see `type_checker`).
+    Values can be constrained further with `min_value`/`max_value`,
+    `min_length`/`max_length` and a regex `pattern` the whole value must
+    match; violating a constraint raises a `ValueError`. A `None` allowed by
+    an `Optional` type is not subject to the constraints.
+    """
+
+    def __init__(
+        self,
+        field_type: typing.Any,
+        *,
+        min_value: typing.Any = None,
+        max_value: typing.Any = None,
+        min_length: typing.Optional[int] = None,
+        max_length: typing.Optional[int] = None,
+        pattern: typing.Optional[str] = None,
+    ):
+        super().__init__()
+        self.field_type = field_type
+        self.min_value = min_value
+        self.max_value = max_value
+        self.min_length = min_length
+        self.max_length = max_length
+        self.pattern = pattern
+        self.attribute_name = None
+
+        # The name of the hidden slot holding the values, if the owner class
+        # has one for this field. `None` means we use `obj.__dict__`.
+        self.slot_name = None
+
+    def __repr__(self) -> str:
+        """Return the 'official' string representation of the descriptor."""
+        cls_name = self.__class__.__name__
+        return f"<{cls_name} descriptor with field_type={self.field_type!r}>"
+
+    @staticmethod
+    def hidden_slot_name(name: str) -> str:
+        """Return the name of the hidden slot used for a field called `name`."""
+        return f"_field_{name}"
+
+    def __set_name__(self, owner: typing.Type[typing.Any], name: str) -> None:
+        """
+        Capture the fully qualified name assigned to the descriptor instance.
+        As Python allows you to alias the descriptor instance by assigning another
+        class attribute to the descriptor instance, we only capture the name the
+        first time `__set_name__` runs.
+        This is similar to what happens when creating function objects: The `__name__`
+        attribute of the function object is only assigned when the function object is
+        first created. Subsequent aliasing of the function by assigning another name
+        to it does not change the `__name__` attribute.
+        As `__set_name__` runs after the owner class was created, this is also
+        where we can see whether the class has a hidden slot for this field and
+        set up the getter and setter for the storage we're going to use.
+        >>> def foo(): pass
+        >>> foo.__name__
+        'foo'
+        >>> bar = foo
+        >>> bar.__name__
+        'foo'
+        """
+        if self.attribute_name is not None:
+            return
+
+        self.attribute_name = name
+        slot_name = self.hidden_slot_name(name)
+        if isinstance(vars(owner).get(slot_name), types.MemberDescriptorType):
+            self.slot_name = slot_name
+            getter = self._slot_getter(owner.__name__, name, slot_name)
+        else:
+            getter = self._dict_getter(owner.__name__, name)
+
+        # `property.__init__` is what stores the getter and setter, so we call
+        # it again now that we have them.
+        property.__init__(self, getter, self._make_setter())
+
+    @staticmethod
+    def _dict_getter(cls_name: str, name: str) -> typing.Callable[[typing.Any], typing.Any]:
+        """Return a getter for values stored in `obj.__dict__` under `name`."""
+        def get(obj: typing.Any) -> typing.Any:
+            # Since a missing key raises a KeyError, not an AttributeError, we
+            # catch the exception and raise an AttributeError instead.
+            try:
+                return obj.__dict__[name]
+            except KeyError:
+                raise AttributeError(f"{cls_name!r} object has no attribute {name!r}") from None
+
+        return get
+
+    @staticmethod
+    def _slot_getter(cls_name: str, name: str, slot_name: str) -> typing.Callable[[typing.Any], typing.Any]:
+        """Return a getter for values stored in the hidden slot `slot_name`."""
+        # Reading an unset slot raises an AttributeError that names the hidden
+        # slot, so we raise one that names the field instead. The slot is read
+        # with an attribute access written into the source of the getter,
+        # which is faster than calling `getattr`.
+        source = "\n".join([
+            "def get(obj):",
+            "    try:",
+            f"        return obj.{slot_name}",
+            "    except AttributeError:",
+            "        raise AttributeError(message) from None",
+        ])
+        namespace = {"message": f"{cls_name!r} object has no attribute {name!r}"}
+        exec(source, namespace)
+        return namespace["get"]
+
+    def _make_setter(self) -> typing.Callable[[typing.Any, typing.Any], None]:
+        """
+        Return a setter that validates a value and then stores it.
+        Rather than have a generic setter look up which checks apply on every
+        assignment, we write the source of a setter that does exactly the
+        checks this field needs and compile it once. If the type boils down
+        to a tuple of classes, which includes `Optional` and `Union` of
+        classes, checking it is a single `isinstance` call.
+        """
+        name = self.attribute_name
+        classes, is_valid = self._classes, self._is_valid = type_checker(self.field_type)
+        namespace = {
+            "name": name,
+            "classes": classes,
+            "is_valid": is_valid,
+            "min_value": self.min_value,
+            "max_value": self.max_value,
+            "min_length": self.min_length,
+            "max_length": self.max_length,
+            "match": re.compile(self.pattern).fullmatch if self.pattern is not None else None,
+            "type_error": self._type_error,
+            "value_error": self._value_error,
+        }
+
+        lines = ["def set(obj, new_value):"]
+        if classes is not None:
+            lines.append("    if not isinstance(new_value, classes):")
+        else:
+            lines.append("    if not is_valid(new_value):")
+        lines.append("        raise type_error(new_value)")
+
+        constraints = []
+        if self.min_value is not None:
+            constraints.append(("new_value < min_value", "'at least', min_value"))
+        if self.max_value is not None:
+            constraints.append(("new_value > max_value", "'at most', max_value"))
+        if self.min_length is not None:
+            constraints.append(("len(new_value) < min_length", "'of length at least', min_length"))
+        if self.max_length is not None:
+            constraints.append(("len(new_value) > max_length", "'of length at most', max_length"))
+        if self.pattern is not None:
+            constraints.append(("match(new_value) is None", "'matching', match.__self__.pattern"))
+
+        indent = "    "
+        if constraints and (classes is None or type(None) in classes):
+            lines.append("    if new_value is not None:")
+            indent += "    "
+        for condition, details in constraints:
+            lines.append(f"{indent}if {condition}:")
+            lines.append(f"{indent}    raise value_error(new_value, {details})")
+
+        # The storage is decided here as well, so the setter doesn't have to
+        # check which one to use on every assignment.
+        if self.slot_name is not None:
+            lines.append(f"    obj.{self.slot_name} = new_value")
+        else:
+            lines.append("    obj.__dict__[name] = new_value")
+
+        exec("\n".join(lines), namespace)
+        return namespace["set"]
+
+    def validate_column(self, values: typing.Sequence[typing.Any]) -> typing.List[typing.Tuple[int, Exception]]:
+        """
+        Validate a whole column of values for this field in one go.
+        Returns a list of `(index, error)` pairs, one for every invalid value,
+        with the error the setter would have raised for it. Every check first
+        runs over the entire column in C (`all(map(...))`, `min`, `max`); only
+        when a check fails do we look for the values that failed it.
+        """
+        if self.attribute_name is None:
+            raise RuntimeError(f"{self!r} is not assigned to a class attribute")
+
+        classes, is_valid = self._classes, self._is_valid
+        if classes is not None:
+            all_valid = all(map(isinstance, values, itertools.repeat(classes)))
+        else:
+            all_valid = all(map(is_valid, values))
+
+        errors = []
+        if not all_valid:
+            errors = [(index, self._type_error(value)) for index, value in enumerate(values) if not is_valid(value)]
+
+        # The constraints only apply to values of the right type that aren't
+        # None. We can only skip filtering if the type rules out None.
+        has_constraints = any(
+            limit is not None
+            for limit in (self.min_value, self.max_value, self.min_length, self.max_length, self.pattern)
+        )
+        if not has_constraints:
+            return errors
+
+        if errors or classes is None or type(None) in classes:
+            invalid = {index for index, _ in errors}
+            indexed = [
+                (index, value) for index, value in enumerate(values)
+                if value is not None and index not in invalid
+            ]
+            checked = [value for _, value in indexed]
+        else:
+            indexed = None
+            checked = values
+
+        if not checked:
+            return errors
+
+        # Each constraint is a check of the entire column, a check of a single
+        # value and the details for the error message.
+        constraints = []
+        if self.min_value is not None:
+            min_value = self.min_value
+            constraints.append((lambda: min(checked) >= min_value, lambda v: v < min_value, "at least", min_value))
+        if self.max_value is not None:
+            max_value = self.max_value
+            constraints.append((lambda: max(checked) <= max_value, lambda v: v > max_value, "at most", max_value))
+        if self.min_length is not None:
+            min_length = self.min_length
+            constraints.append((
+                lambda: min(map(len, checked)) >= min_length,
+                lambda v: len(v) < min_length,
+                "of length at least",
+                min_length,
+            ))
+        if self.max_length is not None:
+            max_length = self.max_length
+            constraints.append((
+                lambda: max(map(len, checked)) <= max_length,
+                lambda v: len(v) > max_length,
+                "of length at most",
+                max_length,
+            ))
+        if self.pattern is not None:
+            match = re.compile(self.pattern).fullmatch
+            constraints.append((
+                lambda: all(map(match, checked)), lambda v: match(v) is None, "matching", self.pattern
+            ))
+
+        for column_is_valid, violates, requirement, limit in constraints:
+            if not column_is_valid():
+                errors.extend(
+                    (index, self._value_error(value, requirement, limit))
+                    for index, value in (indexed if indexed is not None else enumerate(values))
+                    if violates(value)
+                )
+
+        errors.sort(key=operator.itemgetter(0))
+        return errors
+
+    def _type_error(self, new_value: typing.Any) -> TypeError:
+        """Return the error raised for a value of the wrong type."""
+        # Get the names of the expected type and the actual type of the new_value
+        expected_type = type_name(self.field_type)
+        actual_type = type(new_value).__name__
+
+        return TypeError(
+            f"expected an instance of type {expected_type!r} for attribute "
+            f"{self.attribute_name!r}, got {actual_type!r} instead."
+        )
+
+    def _value_error(self, new_value: typing.Any, requirement: str, limit: typing.Any) -> ValueError:
+        """Return the error raised for a value that violates a constraint."""
+        return ValueError(
+            f"expected a value {requirement} {limit!r} for attribute "
+            f"{self.attribute_name!r}, got {new_value!r} instead."
+        )
+
+
+def type_name(field_type: typing.Any) -> str:
+    """Return a readable name for a class or typing construct."""
+    if isinstance(field_type, type) and typing.get_origin(field_type) is None:
+        return field_type.__name__
+    return repr(field_type).replace("typing.", "")
+
+
+def type_checker(field_type: typing.Any) -> typing.Tuple[typing.Optional[tuple], Predicate]:
+    """
+    Compile `field_type` into a check for values of that type.
+    Returns a tuple of classes if the type is equivalent to an `isinstance`
+    check against them, and a predicate that performs the check in any case.
+    Supported are classes, `Any`, `None`, `Optional`, `Union`, `Literal`,
+    tuples (`Tuple[int, str]` and `Tuple[int, ...]`), mappings such as
+    `Dict[str, int]`, and other collections such as `List[int]`, `Set[str]`
+    or `Sequence[float]`. The items of collections are checked as well.
+    """
+    classes = _classes(field_type)
+    if classes is not None:
+        return classes, lambda value: isinstance(value, classes)
+    return None, _predicate(field_type)
+
+
+def _classes(field_type: typing.Any) -> typing.Optional[tuple]:
+    """Return the classes equivalent to `field_type` in an `isinstance` check, if any."""
+    if field_type is typing.Any:
+        return (object,)
+    if field_type is None or field_type is type(None):
+        return (type(None),)
+
+    origin = typing.get_origin(field_type)
+    if origin in _UNION_TYPES:
+        classes = ()
+        for argument in typing.get_args(field_type):
+            argument_classes = _classes(argument)
+            if argument_classes is None:
+                return None
+            classes += argument_classes
+        return classes
+
+    # Generic aliases without parameters, like `typing.List`, allow any items.
+    if origin is not None:
+        return (origin,) if not typing.get_args(field_type) and isinstance(origin, type) else None
+
+    return (field_type,) if isinstance(field_type, type) else None
+
+
+def _predicate(field_type: typing.Any) -> Predicate:
+    """Return a predicate for a type that can't be checked by `isinstance` alone."""
+    classes = _classes(field_type)
+    if classes is not None:
+        return lambda value: isinstance(value, classes)
+
+    origin = typing.get_origin(field_type)
+    arguments = typing.get_args(field_type)
+
+    if origin in _UNION_TYPES:
+        predicates = [_predicate(argument) for argument in arguments]
+        return lambda value: any(predicate(value) for predicate in predicates)
+
+    if origin is typing.Literal:
+        return lambda value: any(value == option and type(value) is type(option) for option in arguments)
+
+    if origin is tuple:
+        if len(arguments) == 2 and arguments[1] is Ellipsis:
+            item = _predicate(arguments[0])
+            return lambda value: isinstance(value, tuple) and all(map(item, value))
+
+        items = [_predicate(argument) for argument in arguments]
+        return lambda value: (
+            isinstance(value, tuple)
+            and len(value) == len(items)
+            and all(predicate(item) for predicate, item in zip(items, value))
+        )
+
+    if isinstance(origin, type) and issubclass(origin, collections.abc.Mapping) and len(arguments) == 2:
+        key, item = map(_predicate, arguments)
+        return lambda value: (
+            isinstance(value, origin) and all(map(key, value.keys())) and all(map(item, value.values()))
+        )
+
+    if isinstance(origin, type) and issubclass(origin, collections.abc.Iterable) and len(arguments) == 1:
+        item = _predicate(arguments[0])
+        return lambda value: isinstance(value, origin) and all(map(item, value))
+
+    raise TypeError(f"unsupported field type {field_type!r}")
+
+
+class SlottedFields(type):
+    """
+    Metaclass that stores the values of `ArticleField`s in hidden slots.
+    For every `ArticleField` in the class body, a slot named after the field
+    (see `ArticleField.hidden_slot_name`) is added to `__slots__`. Slots the
+    class declares itself are kept. As with `__slots__` in general, instances
+    of the class only get a `__dict__` if a base class already has one.
+    >>> class Book(metaclass=SlottedFields):
+    ...     title = ArticleField(str)
+    >>> Book.__slots__
+    ('_field_title',)
+    """
+
+    def __new__(
+        mcs,
+        name: str,
+        bases: typing.Tuple[type, ...],
+        namespace: typing.Dict[str, typing.Any],
+        **kwargs: typing.Any,
+    ) -> SlottedFields:
+        """Create the class with a hidden slot for each `ArticleField` in `namespace`."""
+        slots = namespace.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+
+        # An aliased field only needs a slot under the first of its names.
+        fields = {}
+        for attribute, value in namespace.items():
+            if isinstance(value, ArticleField):
+                fields.setdefault(id(value), attribute)
+
+        field_slots = tuple(map(ArticleField.hidden_slot_name, fields.values()))
+        namespace["__slots__"] = (*slots, *field_slots)
+        return super().__new__(mcs, name, bases, namespace, **kwargs)
+
+
+class BulkValidationError(ValueError):
+    """
+    Raised by `bulk_create` when values in the input are invalid.
+    The `errors` attribute holds a `(row, field name, error)` triple for every
+    invalid value, so all problems with the input can be reported at once.
+    """
+
+    def __init__(self, errors: typing.List[typing.Tuple[int, str, Exception]]):
+        self.errors = errors
+        lines = [f"row {row}, field {name!r}: {error}" for row, name, error in errors[:10]]
+        if len(errors) > 10:
+            lines.append(f"... and {len(errors) - 10} more")
+        super().__init__(f"{len(errors)} invalid value(s):\n" + "\n".join(lines))
+
+
+def article_fields(cls: type) -> typing.Dict[str, ArticleField]:
+    """Return the `ArticleField`s of `cls` by name, in the order in which they were declared."""
+    found = {}
+    for klass in reversed(cls.__mro__):
+        for name, value in vars(klass).items():
+            if isinstance(value, ArticleField) and value.attribute_name == name:
+                found[name] = value
+    return found
+
+
+def bulk_create(
+    cls: typing.Type[AnyType],
+    data: typing.Union[typing.Mapping[str, typing.Sequence[typing.Any]], typing.Iterable[tuple]],
+    field_names: typing.Optional[typing.Sequence[str]] = None,
+) -> typing.List[AnyType]:
+    """
+    Create instances of `cls` from columnar data, validating a column at a time.
+    `data` is either a mapping of field names to columns of values, or an
+    iterable of row tuples with a value for each of the `field_names` (which
+    default to all fields of `cls` in declaration order). A row with too
+    few or too many values raises a `ValueError`.
+    Each column is validated in one pass with `ArticleField.validate_column`.
+    If any value is invalid, a `BulkValidationError` listing all of them is
+    raised and no instances are returned. Otherwise, the instances are created
+    without calling `__init__` and the values are stored directly in the
+    fields' storage, as they have been validated already.
+    """
+    fields = article_fields(cls)
+    if isinstance(data, collections.abc.Mapping):
+        field_names = list(data)
+        columns = [list(column) for column in data.values()]
+    else:
+        field_names = list(field_names if field_names is not None else fields)
+        rows = list(data)
+
+        # `zip` would silently cut every column down to the shortest row, so
+        # we check the length of every row first (in C, via `map`).
+        n_fields = len(field_names)
+        if set(map(len, rows)) - {n_fields}:
+            ragged = [index for index, row in enumerate(rows) if len(row) != n_fields]
+            listed = ", ".join(map(str, ragged[:10])) + (", ..." if len(ragged) > 10 else "")
+            raise ValueError(f"every row should have {n_fields} values, one for each field; rows {listed} don't")
+        columns = [list(column) for column in zip(*rows)] if rows else [[] for _ in field_names]
+
+    unknown = [name for name in field_names if name not in fields]
+    if unknown:
+        raise ValueError(f"{cls.__name__!r} has no field(s) named {', '.join(map(repr, unknown))}")
+    if len({len(column) for column in columns}) > 1:
+        raise ValueError("all columns should have the same number of values")
+
+    errors = []
+    for name, column in zip(field_names, columns):
+        errors.extend((row, name, error) for row, error in fields[name].validate_column(column))
+    if errors:
+        errors.sort(key=operator.itemgetter(0))
+        raise BulkValidationError(errors)
+
+    make = _instance_factory(cls, [fields[name] for name in field_names])
+    return list(map(make, *columns)) if columns else []
+
+
+class FieldModel:
+    """Base class that gives a class with `ArticleField`s a `bulk_create` classmethod."""
+
+    __slots__ = ()
+
+    @classmethod
+    def bulk_create(
+        cls: typing.Type[AnyType],
+        data: typing.Union[typing.Mapping[str, typing.Sequence[typing.Any]], typing.Iterable[tuple]],
+        field_names: typing.Optional[typing.Sequence[str]] = None,
+    ) -> typing.List[AnyType]:
+        """Create instances from columnar data; see `fields.bulk_create`."""
+        return bulk_create(cls, data, field_names)
+
+
+def _instance_factory(cls: type, fields: typing.List[ArticleField]) -> typing.Callable[..., typing.Any]:
+    """
+    Compile a function that creates an instance of `cls` from a value for each of `fields`.
+    The function skips `__init__` and stores the values directly: fields in
+    hidden slots are assigned to their slot, and fields stored in a `__dict__`
+    are written to it. Like the setters, it is generated as source code, so
+    the Python compiler can specialize every attribute store.
+    """
+    parameters = [f"value_{i}" for i in range(len(fields))]
+    lines = [f"def make({', '.join(parameters)}):", "    obj = new(cls)"]
+    if any(field.slot_name is None for field in fields):
+        lines.append("    instance_dict = obj.__dict__")
+
+    for parameter, field in zip(parameters, fields):
+        if field.slot_name is not None:
+            lines.append(f"    obj.{field.slot_name} = {parameter}")
+        else:
+            lines.append(f"    instance_dict[{field.attribute_name!r}] = {parameter}")
+    lines.append("    return obj")
+
+    namespace = {"new": cls.__new__, "cls": cls}
+    exec("\n".join(lines), namespace)
+    return namespace["make"]
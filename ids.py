@@ -0,0 +1,175 @@
+"""
+Allocating article ids that are unique across threads and processes.
+`Article` takes the id of a new article from `Article.id_allocator`, which can
+be any iterator over integers. The default, `itertools.count`, is thread-safe
+(each `next` is a single C call under the GIL), but every process has its own
+count, so articles created in different processes get the same ids.
+For several processes, ids come from a counter they share: `SharedCounter`
+lives in shared memory and is handed to the workers when they're started,
+while `FileCounter` lives in a file that any process can open. Going to a
+shared counter for every id means taking a lock every time, so
+`BlockAllocator` leases a block of ids from the counter at once and hands
+them out in the current thread without any locking until the block runs out:
+    counter = ids.SharedCounter()
+    with ProcessPoolExecutor(initializer=ids.install, initargs=(counter,)) as executor:
+        ...
+Ids are unique, but with blocks they're no longer sequential across workers.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import struct
+import threading
+import typing
+import weakref
+
+import qualifier
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+_COUNTER = struct.Struct("<q")
+
+# Every `BlockAllocator` in this process, so a forked child can drop their blocks.
+_ALLOCATORS: weakref.WeakSet[BlockAllocator] = weakref.WeakSet()
+
+
+class IdSource(typing.Protocol):
+    """A counter that many allocators can lease blocks of ids from."""
+
+    def lease(self, n_ids: int) -> int:
+        """Reserve the next `n_ids` ids and return the first one."""
+
+
+class SharedCounter:
+    """
+    A counter in shared memory for processes started by `multiprocessing`.
+    The counter has to be passed to the worker processes when they're started,
+    for instance through `initargs`; it can't be sent to them afterwards.
+    """
+
+    def __init__(self, start: int = 0) -> None:
+        self._value = multiprocessing.Value("q", start)
+
+    def __repr__(self) -> str:
+        """Return the 'official' string representation of the counter."""
+        return f"<{self.__class__.__name__} next={self._value.value}>"
+
+    def __iter__(self) -> SharedCounter:
+        """Return the counter itself, which is an iterator over ids."""
+        return self
+
+    def __next__(self) -> int:
+        """Return the next id."""
+        return self.lease(1)
+
+    def lease(self, n_ids: int) -> int:
+        """Reserve the next `n_ids` ids and return the first one."""
+        with self._value.get_lock():
+            start = self._value.value
+            self._value.value = start + n_ids
+        return start
+
+
+class FileCounter:
+    """
+    A counter stored in a file, which any process that can open the file can use.
+    The next id is kept as an 8-byte integer and every lease locks the file
+    with `fcntl.flock`, so this only works on Unix-like systems. A file that
+    doesn't exist yet starts counting at `start`. The counter keeps counting
+    where it left off after a restart.
+    """
+
+    def __init__(self, path: typing.Union[str, os.PathLike], start: int = 0) -> None:
+        if fcntl is None:
+            raise RuntimeError("FileCounter needs fcntl, which isn't available on this platform")
+        self.path = os.fspath(path)
+        self.start = start
+
+    def __repr__(self) -> str:
+        """Return the 'official' string representation of the counter."""
+        return f"<{self.__class__.__name__} path={self.path!r}>"
+
+    def __iter__(self) -> FileCounter:
+        """Return the counter itself, which is an iterator over ids."""
+        return self
+
+    def __next__(self) -> int:
+        """Return the next id."""
+        return self.lease(1)
+
+    def lease(self, n_ids: int) -> int:
+        """Reserve the next `n_ids` ids and return the first one."""
+        descriptor = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(descriptor, fcntl.LOCK_EX)
+            data = os.pread(descriptor, _COUNTER.size, 0)
+            start = _COUNTER.unpack(data)[0] if len(data) == _COUNTER.size else self.start
+            os.pwrite(descriptor, _COUNTER.pack(start + n_ids), 0)
+        finally:
+            # Closing the file releases the lock.
+            os.close(descriptor)
+        return start
+
+
+class BlockAllocator:
+    """
+    Hand out ids from blocks of `block_size` ids leased from a shared `source`.
+    Every thread has a block of its own, so threads never wait for each other
+    except for the moment they lease a new block. A process that is forked
+    from this one starts without blocks, so it doesn't hand out the ids of
+    the blocks of its parent.
+    """
+
+    def __init__(self, source: IdSource, block_size: int = 1024) -> None:
+        if block_size < 1:
+            raise ValueError(f"block_size must be at least 1, got {block_size!r} instead.")
+        self.source = source
+        self.block_size = block_size
+        self._local = threading.local()
+        _ALLOCATORS.add(self)
+
+    def __repr__(self) -> str:
+        """Return the 'official' string representation of the allocator."""
+        cls_name = self.__class__.__name__
+        return f"<{cls_name} source={self.source!r} block_size={self.block_size}>"
+
+    def __reduce__(self) -> typing.Tuple[type, typing.Tuple[IdSource, int]]:
+        """Pickle only the source and the block size; the blocks belong to this process."""
+        return self.__class__, (self.source, self.block_size)
+
+    def __iter__(self) -> BlockAllocator:
+        """Return the allocator itself, which is an iterator over ids."""
+        return self
+
+    def __next__(self) -> int:
+        """Return the next id from the block of the current thread, leasing a new block if needed."""
+        # The `range` iterator of the block does the counting in C.
+        for id_ in getattr(self._local, "block", ()):
+            return id_
+
+        start = self.source.lease(self.block_size)
+        block = self._local.block = iter(range(start, start + self.block_size))
+        return next(block)
+
+
+def _forget_blocks() -> None:
+    """Forget the blocks of every allocator, which belong to the parent after a fork."""
+    for allocator in _ALLOCATORS:
+        allocator._local = threading.local()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_blocks)
+
+
+def install(source: IdSource, block_size: int = 1024) -> None:
+    """
+    Let `Article` take its ids from blocks leased from `source`.
+    This is meant to be used as the initializer of worker processes that
+    all get the same `SharedCounter` or `FileCounter`.
+    """
+    qualifier.Article.id_allocator = BlockAllocator(source, block_size)
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import collections
+import typing
+
+
+def short_introduction(content: str, n_characters: int) -> str:
+    """
+    Return an introduction of `content` that is at most `n_characters` long.
+    If the content is longer than `n_characters`, we cut it at the rightmost
+    space or newline character within the first `n_characters + 1` characters.
+    The `+ 1` is important because if that additional character is a space or
+    newline, we can return the first `n_characters` as-is. Should there be no
+    such character, we cut the content at `n_characters` instead.
+    Instead of slicing off the first `n_characters + 1` characters and
+    searching that, we let `str.rfind` search that part of the content in
+    place. The only string we create is the introduction itself, so the time
+    this takes does not depend on the length of the content.
+    An `n_characters` of zero or less gives an empty introduction.
+    """
+    if n_characters <= 0:
+        return ""
+    if len(content) <= n_characters:
+        return content
+
+    end = n_characters + 1
+    rightmost_separator = max(content.rfind(" ", 0, end), content.rfind("\n", 0, end))
+    if rightmost_separator == -1:
+        return content[:n_characters]
+
+    return content[:rightmost_separator]
+
+
+class IntroductionCache:
+    """
+    A small LRU cache of introductions, keyed by `n_characters`.
+    The cache remembers the content version its introductions were made for.
+    When it's asked for an introduction of another version, the content has
+    changed since, so all cached introductions are thrown away. The hit and
+    miss counters are kept across versions.
+    """
+
+    __slots__ = ("entries", "version", "hits", "misses")
+
+    def __init__(self) -> None:
+        self.entries: typing.OrderedDict[int, str] = collections.OrderedDict()
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        n_characters: int,
+        version: int,
+        maxsize: int,
+        make_introduction: typing.Callable[[int], str],
+    ) -> str:
+        """Return the cached introduction for `n_characters`, making it if needed."""
+        entries = self.entries
+        if version != self.version:
+            entries.clear()
+            self.version = version
+
+        try:
+            intro = entries[n_characters]
+        except KeyError:
+            self.misses += 1
+            intro = entries[n_characters] = make_introduction(n_characters)
+            if len(entries) > maxsize:
+                entries.popitem(last=False)
+        else:
+            self.hits += 1
+            entries.move_to_end(n_characters)
+
+        return intro
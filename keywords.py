@@ -0,0 +1,138 @@
+"""
+Keywords of articles, scored by TF-IDF across a corpus.
+`most_common_words` ranks words by their raw counts, so words like "the" and
+"he" come out on top of every article. A `KeywordIndex` scores a word by how
+often it occurs in an article (its term frequency) multiplied by how rare it
+is in the corpus (its inverse document frequency), so the words that come
+out on top are the ones that set an article apart from the others:
+    index = KeywordIndex(articles)
+    index.keywords(article, 5)
+"""
+from __future__ import annotations
+
+import heapq
+import math
+import typing
+from array import array
+
+from collection import ArticleIndex
+
+if typing.TYPE_CHECKING:
+    from qualifier import Article
+
+
+class KeywordIndex(ArticleIndex):
+    """
+    The document frequencies of the words of a number of articles.
+    Every word gets a term number the first time it's seen. The number of
+    articles that contain each word, and the logarithm we need for its IDF,
+    are kept in arrays indexed by term number. Every article keeps the term
+    numbers of its words and their term frequencies in arrays as well, taken
+    from the counts of its `word_index`, so its content is never read again.
+    Adding, removing or changing an article only updates the document
+    frequencies of its own words. The IDF of a word depends on the number of
+    articles as well, but that's one term shared by all words:
+        idf = log((1 + n_articles) / (1 + df)) + 1
+            = log(1 + n_articles) + 1 - log(1 + df)
+    so we only store `log(1 + df)` per word, and scoring an article is a
+    single pass over its arrays.
+    """
+
+    def __init__(self, articles: typing.Iterable[Article] = ()) -> None:
+        # The term number of every word, and the words by term number.
+        self._terms: typing.Dict[str, int] = {}
+        self._words: typing.List[str] = []
+
+        # The document frequency of every term, and `log(1 + df)`.
+        self._document_frequencies = array("q")
+        self._log_frequencies = array("d")
+
+        # The term numbers of the distinct words of every article, and the
+        # term frequency (count / number of words) of each of them.
+        self._article_terms: typing.Dict[int, array] = {}
+        self._article_frequencies: typing.Dict[int, array] = {}
+
+        super().__init__(articles)
+
+    def __repr__(self) -> str:
+        """Return the 'official' string representation of the index."""
+        cls_name = self.__class__.__name__
+        return f"<{cls_name} articles={len(self)} words={len(self._words)}>"
+
+    def document_frequency(self, word: str) -> int:
+        """Return the number of articles that contain `word`."""
+        term = self._terms.get(word)
+        return 0 if term is None else self._document_frequencies[term]
+
+    def idf(self, word: str) -> float:
+        """Return the (smoothed) inverse document frequency of `word`."""
+        return math.log((1 + len(self)) / (1 + self.document_frequency(word))) + 1
+
+    def scores(self, article: Article) -> typing.Dict[str, float]:
+        """Return the TF-IDF score of every word of an article in the index."""
+        words = self._words
+        terms = self._article_terms[self._checked(article).id]
+        return {words[term]: score for term, score in zip(terms, self._scores(article.id))}
+
+    def keywords(self, article: Article, n_words: int) -> typing.Dict[str, float]:
+        """
+        Return the `n_words` words of an article in the index with the highest TF-IDF scores.
+        Words with the same score are ordered alphabetically.
+        """
+        if n_words <= 0:
+            return {}
+
+        words = self._words
+        terms = self._article_terms[self._checked(article).id]
+        scored = zip(self._scores(article.id), terms)
+        best = heapq.nsmallest(n_words, scored, key=lambda item: (-item[0], words[item[1]]))
+        return {words[term]: score for score, term in best}
+
+    def _checked(self, article: Article) -> Article:
+        """Return `article`, or raise `KeyError` if it's not in the index."""
+        if article not in self:
+            raise KeyError(article)
+        return article
+
+    def _scores(self, id_: int) -> typing.List[float]:
+        """Return the TF-IDF scores of the terms of an article, in the order of its term array."""
+        base = math.log(1 + len(self)) + 1
+        log_frequencies = self._log_frequencies
+        return [
+            frequency * (base - log_frequencies[term])
+            for term, frequency in zip(self._article_terms[id_], self._article_frequencies[id_])
+        ]
+
+    def _index(self, article: Article) -> None:
+        """Add the words of an article to the document frequencies."""
+        counts = article.word_index().counts
+        total = sum(counts.values())
+
+        terms = self._terms
+        words = self._words
+        document_frequencies = self._document_frequencies
+        log_frequencies = self._log_frequencies
+
+        article_terms = array("i")
+        for word in counts:
+            term = terms.get(word)
+            if term is None:
+                term = terms[word] = len(words)
+                words.append(word)
+                document_frequencies.append(0)
+                log_frequencies.append(0.0)
+            document_frequencies[term] += 1
+            log_frequencies[term] = math.log1p(document_frequencies[term])
+            article_terms.append(term)
+
+        self._article_terms[article.id] = article_terms
+        self._article_frequencies[article.id] = array("d", [count / total for count in counts.values()])
+
+    def _unindex(self, id_: int) -> None:
+        """Remove the words of an article from the document frequencies."""
+        document_frequencies = self._document_frequencies
+        log_frequencies = self._log_frequencies
+        for term in self._article_terms.pop(id_):
+            document_frequencies[term] -= 1
+            log_frequencies[term] = math.log1p(document_frequencies[term])
+        del self._article_frequencies[id_]
@@ -0,0 +1,306 @@
+"""
+Ordering articles by publication date without comparing datetimes.
+`date_key` turns a publication date into an integer, which `Article` caches as
+its `sort_key`. Sorting by that key compares plain integers in C, instead of
+calling `Article.__lt__` and comparing two datetimes O(n log n) times:
+    articles.sort(key=by_publication_date)
+`SortedArticles` keeps articles in publication date order as they're added,
+so the latest articles, or the articles of a date range, can be found without
+sorting the whole feed again, and `merge_feeds` merges feeds that are already
+sorted.
+"""
+from __future__ import annotations
+
+import bisect
+import datetime
+import heapq
+import itertools
+import operator
+import typing
+
+if typing.TYPE_CHECKING:
+    from qualifier import Article
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_UTC_EPOCH = _EPOCH.replace(tzinfo=datetime.timezone.utc)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+# Key function for `sorted` and `list.sort` that orders articles by publication date.
+by_publication_date = operator.attrgetter("sort_key")
+
+
+def date_key(date: datetime.datetime) -> int:
+    """
+    Return `date` as a number of microseconds since the epoch.
+    Naive dates count from a naive epoch and aware dates from the epoch in
+    UTC, so the keys of two dates compare the same way as the dates do.
+    """
+    epoch = _EPOCH if date.tzinfo is None else _UTC_EPOCH
+    return (date - epoch) // _MICROSECOND
+
+
+def merge_feeds(
+    *feeds: typing.Iterable[Article], reverse: bool = False, unique: bool = False
+) -> typing.Iterator[Article]:
+    """
+    Merge feeds that are each sorted by publication date into a single sorted stream.
+    This is a k-way merge that holds only one article per feed at a time, so
+    the feeds may be long-running iterators. Pass `reverse=True` for feeds
+    that are sorted with the most recent first, and `unique=True` to yield an
+    article that occurs in several feeds only once.
+    """
+    merged = _merge(feeds, -1 if reverse else 1)
+    if not unique:
+        return merged
+
+    # Equal articles have equal keys, so the merge puts them next to each other.
+    return (next(group) for _, group in itertools.groupby(merged))
+
+
+def _merge(feeds: typing.Iterable[typing.Iterable[Article]], sign: int) -> typing.Iterator[Article]:
+    """
+    Merge sorted feeds like `heapq.merge`, comparing the keys of articles in C.
+    Every feed has one entry on the heap: a list of the sort key and id of its
+    current article (negated when merging in reverse), the number of the feed
+    to keep the merge stable, the article and a function that returns the
+    next one. Entries are updated in place, so the merge doesn't allocate a
+    key tuple per article, and comparing entries never calls `Article.__lt__`.
+    """
+    heap = []
+    for order, feed in enumerate(map(iter, feeds)):
+        for article in feed:
+            heap.append([sign * article.sort_key, sign * article.id, order, article, feed.__next__])
+            break
+    heapq.heapify(heap)
+
+    while len(heap) > 1:
+        try:
+            while True:
+                entry = heap[0]
+                yield entry[3]
+                article = entry[4]()
+                entry[0] = sign * article.sort_key
+                entry[1] = sign * article.id
+                entry[3] = article
+                heapq.heapreplace(heap, entry)
+        except StopIteration:
+            heapq.heappop(heap)
+
+    if heap:
+        # Only one feed is left, which doesn't need a heap.
+        entry = heap[0]
+        yield entry[3]
+        yield from entry[4].__self__
+
+
+class ChronologicalOrder:
+    """
+    Mixin that gives articles a total order by publication date and then by id.
+    Articles are equal when their ids are equal and hash like their id, so
+    they can be used in sets, as dict keys, in heaps and with `bisect`. The
+    comparisons use the integer `sort_key`, so they don't compare datetimes.
+    As articles with the same id are expected to be the same article, this
+    order is consistent with equality. Don't change the id of an article that
+    is in a set or dict.
+    """
+
+    __slots__ = ()
+
+    sort_key: int
+    id: int
+
+    def __eq__(self, other: object) -> bool:
+        """Return `True` if `other` is an article with the same id."""
+        if not isinstance(other, ChronologicalOrder):
+            return NotImplemented
+        return self.id == other.id
+
+    def __hash__(self) -> int:
+        """Return the hash of the id."""
+        return hash(self.id)
+
+    def __lt__(self, other: object) -> bool:
+        """Return `True` if this article comes before `other`."""
+        if not isinstance(other, ChronologicalOrder):
+            return NotImplemented
+        key, other_key = self.sort_key, other.sort_key
+        return key < other_key or (key == other_key and self.id < other.id)
+
+    def __le__(self, other: object) -> bool:
+        """Return `True` if this article comes before `other` or is equal to it."""
+        if not isinstance(other, ChronologicalOrder):
+            return NotImplemented
+        key, other_key = self.sort_key, other.sort_key
+        return key < other_key or (key == other_key and self.id <= other.id)
+
+    def __gt__(self, other: object) -> bool:
+        """Return `True` if this article comes after `other`."""
+        if not isinstance(other, ChronologicalOrder):
+            return NotImplemented
+        key, other_key = self.sort_key, other.sort_key
+        return key > other_key or (key == other_key and self.id > other.id)
+
+    def __ge__(self, other: object) -> bool:
+        """Return `True` if this article comes after `other` or is equal to it."""
+        if not isinstance(other, ChronologicalOrder):
+            return NotImplemented
+        key, other_key = self.sort_key, other.sort_key
+        return key > other_key or (key == other_key and self.id >= other.id)
+
+
+class SortedArticles:
+    """
+    A collection that keeps its articles sorted by publication date.
+    Articles with the same publication date are ordered by id. The articles
+    are stored in a list of sorted chunks of at most `2 * load` articles, with
+    the key of the last article of each chunk in `_maxes`. Finding where an
+    article goes is a binary search over the chunks followed by one within a
+    chunk, so it's O(log n); inserting it only moves the rest of its chunk.
+    The index doesn't notice when the publication date of an article
+    changes: remove the article before changing it and add it back after.
+    """
+
+    load = 1000
+
+    def __init__(self, articles: typing.Iterable[Article] = ()) -> None:
+        self._keys: typing.List[typing.List[typing.Tuple[int, int]]] = []
+        self._chunks: typing.List[typing.List[Article]] = []
+        self._maxes: typing.List[typing.Tuple[int, int]] = []
+
+        # Building from many articles at once is faster by sorting them once.
+        articles = sorted(articles, key=self._key)
+        for start in range(0, len(articles), self.load):
+            chunk = articles[start:start + self.load]
+            keys = list(map(self._key, chunk))
+            self._chunks.append(chunk)
+            self._keys.append(keys)
+            self._maxes.append(keys[-1])
+        self._length = len(articles)
+
+    def __repr__(self) -> str:
+        """Return the 'official' string representation of the collection."""
+        cls_name = self.__class__.__name__
+        return f"<{cls_name} articles={len(self)}>"
+
+    def __len__(self) -> int:
+        """Return the number of articles in the collection."""
+        return self._length
+
+    def __iter__(self) -> typing.Iterator[Article]:
+        """Iterate over the articles from the oldest to the most recent."""
+        return itertools.chain.from_iterable(self._chunks)
+
+    def __reversed__(self) -> typing.Iterator[Article]:
+        """Iterate over the articles from the most recent to the oldest."""
+        return itertools.chain.from_iterable(map(reversed, reversed(self._chunks)))
+
+    def __contains__(self, article: object) -> bool:
+        """Return `True` if `article` is in the collection."""
+        try:
+            return self._find(article) is not None
+        except AttributeError:
+            return False
+
+    def add(self, article: Article) -> None:
+        """Insert an article at its place in publication date order."""
+        key = self._key(article)
+        if not self._chunks:
+            self._chunks.append([article])
+            self._keys.append([key])
+            self._maxes.append(key)
+            self._length = 1
+            return
+
+        index = bisect.bisect_right(self._maxes, key)
+        if index == len(self._maxes):
+            index -= 1
+        keys = self._keys[index]
+        chunk = self._chunks[index]
+
+        position = bisect.bisect_right(keys, key)
+        keys.insert(position, key)
+        chunk.insert(position, article)
+        self._maxes[index] = keys[-1]
+        self._length += 1
+
+        if len(keys) > 2 * self.load:
+            self._keys[index + 1:index + 1] = [keys[self.load:]]
+            self._chunks[index + 1:index + 1] = [chunk[self.load:]]
+            self._maxes.insert(index, keys[self.load - 1])
+            del keys[self.load:]
+            del chunk[self.load:]
+
+    def remove(self, article: Article) -> None:
+        """Remove an article from the collection."""
+        location = self._find(article)
+        if location is None:
+            raise KeyError(article)
+
+        index, position = location
+        keys = self._keys[index]
+        del keys[position]
+        del self._chunks[index][position]
+        self._length -= 1
+
+        if keys:
+            self._maxes[index] = keys[-1]
+        else:
+            del self._keys[index]
+            del self._chunks[index]
+            del self._maxes[index]
+
+    def between(
+        self,
+        start: typing.Optional[datetime.datetime] = None,
+        end: typing.Optional[datetime.datetime] = None,
+    ) -> typing.Iterator[Article]:
+        """
+        Iterate over the articles published in the range [`start`, `end`), oldest first.
+        A bound that is `None` is not applied.
+        """
+        first = (0, 0) if start is None else self._locate(date_key(start))
+        last = (len(self._chunks), 0) if end is None else self._locate(date_key(end))
+        if first >= last:
+            return
+
+        index, position = first
+        while index < last[0]:
+            yield from itertools.islice(self._chunks[index], position, None)
+            index += 1
+            position = 0
+        if index < len(self._chunks):
+            yield from itertools.islice(self._chunks[index], position, last[1])
+
+    def latest(self, n_articles: int) -> typing.List[Article]:
+        """Return the `n_articles` most recently published articles, most recent first."""
+        return list(itertools.islice(reversed(self), max(n_articles, 0)))
+
+    @staticmethod
+    def _key(article: Article) -> typing.Tuple[int, int]:
+        """Return the key an article is sorted by."""
+        return article.sort_key, article.id
+
+    def _locate(self, sort_key: int) -> typing.Tuple[int, int]:
+        """Return the chunk and position of the first article with a key of at least `sort_key`."""
+        # `(sort_key,)` sorts before every `(sort_key, id)`.
+        key = (sort_key,)
+        index = bisect.bisect_left(self._maxes, key)
+        if index == len(self._maxes):
+            return index, 0
+        return index, bisect.bisect_left(self._keys[index], key)
+
+    def _find(self, article: Article) -> typing.Optional[typing.Tuple[int, int]]:
+        """Return the chunk and position of `article`, or `None` if it's not in the collection."""
+        key = self._key(article)
+        index = bisect.bisect_left(self._maxes, key)
+        if index == len(self._maxes):
+            return None
+
+        keys = self._keys[index]
+        chunk = self._chunks[index]
+        position = bisect.bisect_left(keys, key)
+        while position < len(keys) and keys[position] == key:
+            if chunk[position] is article:
+                return index, position
+            position += 1
+        return None
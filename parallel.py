@@ -0,0 +1,120 @@
+"""
+Count words in separate processes to use more than one core.
+Counting words is CPU-bound Python work, so threads don't help because of the
+GIL. The functions below hand the text to a `ProcessPoolExecutor` instead. Only
+the text goes to the workers and only the (small) results come back; the
+`Article` objects themselves never leave the current process.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import functools
+import itertools
+import os
+import typing
+from multiprocessing import shared_memory
+
+import tokenizer
+from wordfreq import WordFrequencyIndex
+
+if typing.TYPE_CHECKING:
+    from qualifier import Article
+
+# Contents with at least this many characters are split into chunks of this
+# size by `count_words` instead of being counted by a single worker.
+PARALLEL_CHUNK_SIZE = 1 << 23
+
+
+def most_common_words_many(
+    articles: typing.Iterable[Article],
+    n_words: int,
+    workers: typing.Optional[int] = None,
+) -> typing.List[typing.Dict[str, int]]:
+    """
+    Return the result of `article.most_common_words(n_words)` for each of the `articles`.
+    The articles are sharded across `workers` processes, which defaults to the
+    number of CPUs. Only the top `n_words` of each article are sent back.
+    """
+    contents = [article.content for article in articles]
+    workers = workers or os.cpu_count() or 1
+
+    # Hand out work in a few batches per worker: one article at a time would
+    # spend more time on inter-process communication than on counting.
+    chunksize = max(1, len(contents) // (workers * 4))
+
+    count = functools.partial(_most_common_words, n_words=n_words)
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        return list(executor.map(count, contents, chunksize=chunksize))
+
+
+def count_words(
+    text: typing.Union[str, bytes, bytearray, memoryview],
+    workers: typing.Optional[int] = None,
+    chunk_size: int = PARALLEL_CHUNK_SIZE,
+    words: typing.Callable[[str], typing.Iterable[str]] = tokenizer.iter_words,
+) -> WordFrequencyIndex:
+    """
+    Count the words of a single large text using `workers` processes.
+    Instead of pickling a copy of every chunk for the workers, the text is
+    encoded once into a `multiprocessing.shared_memory` block. The workers
+    only receive the name of the block and the byte offsets of their chunk,
+    which is cut at an ASCII non-letter so no word (or UTF-8 sequence) is
+    split. Adding the partial indexes in the order of the chunks gives the
+    same first-occurrence order as counting the text in one go.
+    `words` finds the words of a chunk, for instance the `words` method of a
+    `tokenizer.Tokenizer`; it's pickled for the workers. Text that is UTF-8
+    encoded already is copied into the block as it is.
+    """
+    if len(text) <= chunk_size:
+        return _index_words(text, words)
+
+    data = text.encode("utf-8") if text.__class__ is str else text
+    bounds = list(tokenizer.chunk_bounds(data, chunk_size))
+    starts = [start for start, _ in bounds]
+    ends = [end for _, end in bounds]
+
+    workers = workers or os.cpu_count() or 1
+    block = shared_memory.SharedMemory(create=True, size=len(data))
+    try:
+        block.buf[:len(data)] = data
+        del data
+
+        index = WordFrequencyIndex()
+        names = itertools.repeat(block.name)
+        with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+            index_chunk = functools.partial(_index_shared_words, words=words)
+            for partial_index in executor.map(index_chunk, names, starts, ends):
+                index.add(partial_index)
+        return index
+    finally:
+        block.close()
+        block.unlink()
+
+
+def _index_words(
+    text: str,
+    words: typing.Callable[[str], typing.Iterable[str]] = tokenizer.iter_words,
+) -> WordFrequencyIndex:
+    """Build the word-frequency index of `text` (runs in a worker process)."""
+    return WordFrequencyIndex.from_words(words(text))
+
+
+def _index_shared_words(
+    name: str,
+    start: int,
+    end: int,
+    words: typing.Callable[[str], typing.Iterable[str]] = tokenizer.iter_words,
+) -> WordFrequencyIndex:
+    """Build the word-frequency index of a chunk of a shared memory block (runs in a worker)."""
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        with block.buf[start:end] as chunk:
+            text = str(chunk, "utf-8")
+    finally:
+        block.close()
+    return _index_words(text, words)
+
+
+def _most_common_words(text: str, n_words: int) -> typing.Dict[str, int]:
+    """Return the `n_words` most common words of `text` (runs in a worker process)."""
+    return _index_words(text).most_common(n_words)
@@ -0,0 +1,150 @@
+"""
+A piece table for content that is edited in place.
+Strings are immutable, so changing a few characters of a 5 MB article the
+usual way builds a new 5 MB string. A `PieceTable` instead describes the
+content as a list of pieces, each of which is a range of some string: the
+original content or a piece of text that was inserted later. An edit only
+replaces the pieces it touches and never copies the strings themselves.
+The content is joined into a single string when it's asked for, and that
+string is kept until the next edit.
+"""
+from __future__ import annotations
+
+import bisect
+import typing
+
+import tokenizer
+
+# A range of characters of a string: `(text, start, end)`.
+Piece = typing.Tuple[str, int, int]
+
+
+class PieceTable:
+    """
+    A string that can be edited in place, made up of ranges of other strings.
+    `_starts` holds the position of the first character of every piece, so
+    the piece that holds a position is found with a binary search. Every edit
+    adds at most two pieces; once there are more than `max_pieces`, the
+    content is joined into a single piece again.
+    """
+
+    __slots__ = ("_pieces", "_starts", "_length", "_text")
+
+    max_pieces = 4096
+
+    def __init__(self, text: str = "") -> None:
+        self._pieces: typing.List[Piece] = [(text, 0, len(text))] if text else []
+        self._starts: typing.List[int] = [0] if text else []
+        self._length = len(text)
+
+        # The joined content, if it was asked for since the last edit.
+        self._text: typing.Optional[str] = text
+
+    def __repr__(self) -> str:
+        """Return the 'official' string representation of the piece table."""
+        cls_name = self.__class__.__name__
+        return f"<{cls_name} length={self._length} pieces={len(self._pieces)}>"
+
+    def __len__(self) -> int:
+        """Return the number of characters."""
+        return self._length
+
+    def __str__(self) -> str:
+        """Return the content as a single string."""
+        if self._text is None:
+            self._text = "".join([text[start:end] for text, start, end in self._pieces])
+        return self._text
+
+    def slice(self, start: int, end: int) -> str:
+        """Return the characters from `start` up to (but not including) `end`."""
+        start = max(start, 0)
+        end = min(end, self._length)
+        if start >= end:
+            return ""
+        if self._text is not None:
+            return self._text[start:end]
+
+        parts = []
+        index = bisect.bisect_right(self._starts, start) - 1
+        while index < len(self._pieces) and self._starts[index] < end:
+            text, piece_start, piece_end = self._pieces[index]
+            offset = self._starts[index] - piece_start
+            parts.append(text[max(piece_start, start - offset):min(piece_end, end - offset)])
+            index += 1
+        return "".join(parts)
+
+    def replace(self, start: int, end: int, text: str) -> None:
+        """Replace the characters from `start` up to `end` by `text`."""
+        if not 0 <= start <= end <= self._length:
+            raise IndexError(f"range [{start}, {end}) is out of bounds for a length of {self._length}")
+
+        pieces = self._pieces
+        starts = self._starts
+
+        # The pieces from `first` up to `last` overlap the range, or are where
+        # the text goes if the range is empty.
+        first = max(bisect.bisect_right(starts, start) - 1, 0)
+        last = max(bisect.bisect_left(starts, end), first + 1)
+
+        replacement = []
+        if first < len(pieces):
+            piece_text, piece_start, _ = pieces[first]
+            head = piece_start + start - starts[first]
+            if head > piece_start:
+                replacement.append((piece_text, piece_start, head))
+        if text:
+            replacement.append((text, 0, len(text)))
+        if last - 1 < len(pieces) and pieces:
+            piece_text, piece_start, piece_end = pieces[last - 1]
+            tail = piece_start + end - starts[last - 1]
+            if tail < piece_end:
+                replacement.append((piece_text, tail, piece_end))
+
+        pieces[first:last] = replacement
+        self._length += len(text) - (end - start)
+        self._text = None
+
+        if len(pieces) > self.max_pieces:
+            joined = str(self)
+            self._pieces = [(joined, 0, len(joined))]
+            self._starts = [0]
+            return
+
+        # Only the positions of the pieces from `first` on have changed.
+        position = starts[first] if first < len(starts) else 0
+        del starts[first:]
+        for _, piece_start, piece_end in pieces[first:]:
+            starts.append(position)
+            position += piece_end - piece_start
+
+    def prefix(self, n_characters: int) -> str:
+        """Return the first `n_characters` characters, looking only at the first pieces."""
+        return self.slice(0, n_characters)
+
+    def word_region(self, start: int, end: int) -> typing.Tuple[int, int]:
+        """
+        Widen the range from `start` to `end` so it doesn't cut any word in two.
+        The range is extended to the nearest ASCII non-letters around it (see
+        `tokenizer.chunk_bounds`), so the words of the range are exactly the
+        words of the content that overlap it. We look at a small window on
+        each side first and only widen the window if it doesn't have one.
+        """
+        window = 64
+        while True:
+            low = max(start - window, 0)
+            boundary = tokenizer.last_boundary(self.slice(low, start))
+            if boundary != -1 or low == 0:
+                start = low + boundary + 1
+                break
+            window *= 4
+
+        window = 64
+        while True:
+            high = min(end + window, self._length)
+            boundary = tokenizer.first_boundary(self.slice(end, high))
+            if boundary != -1 or high == self._length:
+                end = high if boundary == -1 else end + boundary
+                break
+            window *= 4
+
+        return start, end
@@ -13,114 +13,98 @@ Important notes for submission:
   remove all debug prints and other debug statements before you submit your
   solution.
 """
+import collections
 import datetime
 import typing
-import re
 from itertools import count
 
-class ArticleField:
+import clocks
+import fields
+import introduction
+import ordering
+import parallel
+import pieces
+import tokenizer
+import utf8
+from wordfreq import WordFrequencyIndex
+
+class ArticleField(fields.ArticleField):
     """The `ArticleField` class for the Advanced Requirements."""
+    # 처음 작성한 __get__/__set__ 은 모든 field 가 obj._field_type 하나에
+    # 값을 저장해서, field 가 두 개 이상이면 값이 섞였다.
+    # 정답코드의 descriptor 를 옮긴 fields.ArticleField 를 그대로 쓴다.
+    # SlottedFields metaclass 를 쓰면 __slots__ class 에서도 동작한다.
 
-    def __init__(self, field_type: typing.Type[typing.Any]):
-        self._field_type = field_type
-      # self.attribute_name = None
-    """정답코드
-    class에 대한 descriptor 을 생성하였다.
-    def __repr__(self) -> str:
-        # Return the 'official' string representation of the descriptor.
-        cls_name = self.__class__.__name__
-        return f"<{cls_name} descriptor with field_type={self.field_type!r}>"
-    """
-
-    """정답코드
-    # __set_name__ 을 정의 하였다.
-    # alias 를 가능하게 한다..
-    def __set_name__(self, owner: typing.Type[typing.Any], name: str) -> None:
-        # Capture the fully qualified name assigned to the descriptor instance.
-        # As Python allows you to alias the descriptor instance by assigning another
-        # class attribute to the descriptor instance, we only capture the name the
-        # first time `__set_name__` runs.
-        # This is similar to what happens when creating function objects: The `__name__`
-        # attribute of the function object is only assigned when the function object is
-        # first created. Subsequent aliasing of the function by assigning another name
-        # to it does not change the `__name__` attribute.
-        # >>> def foo(): pass
-        # >>> foo.__name__
-        # 'foo'
-        # >>> bar = foo
-        # >>> bar.__name__
-        # 'foo'
-        if self.attribute_name is None:
-            self.attribute_name = name
-    """
-    def __set__(self, obj, val):
-        if type(val) == str:
-          raise TypeError("""expected an instance of type 'int' for attribute 'attribute', got 'str' instead""")
-        obj._field_type = val
-    """
-    def __set__(self, obj: typing.Optional[AnyType], new_value: typing.Any) -> None:
-        # isinstance 로 동일한 타입인지 확인한다!
-        # 다르면 typeError 출력! 오홓!
-        # 그리고 해당객체의 내부 파라미터접근시 
-        # obj.__dict__[self.attribute_name] = new_value
-        # __dict__ 로 내부속성 접하여, None 에 new_vale 를 넣는듯하다!?
-        if not isinstance(new_value, self.field_type):
-            # Get the names of the expected type and the actual type of the new_value
-            expected_type = self.field_type.__name__
-            actual_type = type(new_value).__name__
-
-            # Raise a type error to indicate that actual type did not validate.
-            raise TypeError(
-                f"expected an instance of type {expected_type!r} for attribute "
-                f"{self.attribute_name!r}, got {actual_type!r} instead."
-            )
-
-        obj.__dict__[self.attribute_name] = new_value
-    """
 
-    def __get__(self, obj, val):
-        return obj._field_type
-
-    """'
-    # 에러처리가 되어있다.
-    # KeyError 시 해당 attrivute 가 없다고 잘 나온다(?)
-    def __get__(self, obj: typing.Optional[AnyType], owner: typing.Type[AnyType]) -> typing.Any:
-        # If the attribute is accessed via the `owner` class object, we return
-        # the descriptor itself. This allows for easier introspection of the
-        # descriptor.
-        if obj is None:
-            return self
-
-        # Try to get the actual value from `obj.__dict__`. Since this raises
-        # a KeyError, not an AttributeError, when no value was set yet, we
-        # catch the exception and raise an AttributeError instead.
-        try:
-            value = obj.__dict__[self.attribute_name]
-        except KeyError:
-            cls_name = owner.__name__
-            raise AttributeError(
-                f"{cls_name!r} object has no attribute {self.attribute_name!r}"
-            ) from None
-
-        return value
-    """
+IntroductionCacheInfo = collections.namedtuple(
+    "IntroductionCacheInfo", "hits misses maxsize currsize"
+)
 
 
-class Article:
+class Article(ordering.ChronologicalOrder):
     """The `Article` class you need to write for the qualifier."""
     
-    _ids = count(0)
-
-    def __init__(self, title: str, author: str, publication_date: datetime.datetime, content: str):
+    # 새 Article 의 id 를 꺼내는 iterator. 여러 process 에서 Article 을
+    # 만들 때는 ids.BlockAllocator 로 바꿔서 id 가 겹치지 않게 한다.
+    id_allocator: typing.Iterator[int] = count(0)
+
+    # last_edited 를 찍는 clock. None 이면 datetime.datetime.now() 를 쓴다.
+    # clocks.monotonic 이나 clocks.CoarseClock() 으로 바꾸면 편집이 싸진다.
+    clock: typing.Optional[clocks.Clock] = None
+
+    # The number of introductions (one per `n_characters`) each article keeps.
+    introduction_cache_size = 4
+
+    # 캐시 계층에 Article 이 수백만 개 올라가므로 인스턴스마다 __dict__ 를
+    # 두지 않고 slot 에 저장한다. public API 는 property 라서 그대로다.
+    # __weakref__ 가 없으면 weakref.ref(article) 가 TypeError 를 낸다.
+    __slots__ = (
+        "_title",
+        "_author",
+        "_publication_date",
+        "_content",
+        "_id",
+        "_last_edited",
+        "_word_index",
+        "_tokenized",
+        "_content_listeners",
+        "_content_version",
+        "_last_edit",
+        "_introductions",
+        "_sort_key",
+        "__weakref__",
+    )
+
+    def __init__(
+        self,
+        title: str,
+        author: str,
+        publication_date: datetime.datetime,
+        content: typing.Union[str, bytes, bytearray, memoryview],
+    ):
         self._title = title
         self._author = author
         self._publication_date=publication_date
         self._content = content
-        self._id = next(self._ids)
+        self._id = next(self.id_allocator)
         self._last_edited = None
+        self._word_index = None
+        self._tokenized = None
+        self._content_listeners = ()
+        self._content_version = 0
+        self._last_edit = None
+
+        # LRU cache of `short_introduction` results, created on first use.
+        self._introductions = None
+
+        # `publication_date` as an integer, computed on first use.
+        self._sort_key = None
 
     @property
     def last_edited (self):
+        # clocks.monotonic 의 int 값은 읽을 때 한 번만 datetime 으로 바꾼다.
+        if self._last_edited.__class__ is int:
+            self._last_edited = clocks.from_monotonic(self._last_edited)
         return self._last_edited 
 
     @last_edited .setter
@@ -158,17 +142,123 @@ class Article:
     @publication_date.setter
     def publication_date(self, value):
         self._publication_date = value
+        self._sort_key = None
+
+    @property
+    def sort_key(self) -> int:
+        """Return the publication date as an integer that sorts the same way (see `ordering`)."""
+        # datetime 비교 대신 int 비교로 정렬할 수 있도록 한 번만 계산해 둔다.
+        if self._sort_key is None:
+            self._sort_key = ordering.date_key(self._publication_date)
+        return self._sort_key
 
     @property
     def content(self):
       # def content(self) -> str:
-        return self._content
+        # 편집된 content 는 PieceTable 이므로 str 로 합쳐서 돌려준다.
+        # bytes 로 받은 content 는 읽을 때 decode 한다.
+        content = self._content
+        if content.__class__ is str:
+            return content
+        if content.__class__ is pieces.PieceTable:
+            return str(content)
+        return str(content, "utf-8")
 
     @content.setter
     def content(self, value):
       # def content(self, new_content: str) -> None:
-        self.last_edited = datetime.datetime.now()
         self._content = value
+        self._word_index = None
+        self._content_changed()
+
+    def _content_changed(self, edit=None):
+        # setter 와 편집 method 가 함께 쓴다: last_edited 를 찍고 listener 를 부른다.
+        # 편집이면 edit 은 (start, end, text) 이고, setter 면 None 이다.
+        # instance 로 꺼내면 plain function 이 method 로 bind 되므로 class 에서 꺼낸다.
+        clock = self.__class__.clock
+        self._last_edited = datetime.datetime.now() if clock is None else clock()
+        self._content_version += 1
+        self._last_edit = edit
+        self._tokenized = None
+        for listener in self._content_listeners:
+            listener(self)
+
+    def insert(self, position: int, text: str) -> None:
+        """Insert `text` into the content before the character at `position`."""
+        self.replace_range(position, position, text)
+
+    def delete(self, start: int, end: int) -> None:
+        """Delete the characters of the content from `start` up to `end`."""
+        self.replace_range(start, end, "")
+
+    def append(self, text: str) -> None:
+        """Add `text` to the end of the content."""
+        end = len(self)
+        self.replace_range(end, end, text)
+
+    def replace_range(self, start: int, end: int, text: str) -> None:
+        """
+        Replace the characters of the content from `start` up to `end` by `text`.
+        The content is kept in a `pieces.PieceTable`, so an edit doesn't copy
+        the rest of the content. If the words were counted already, only the
+        words around the edit are counted again. Like setting the content,
+        an edit stamps `last_edited` and calls the content listeners.
+        """
+        # bytes 의 len 은 byte 수이므로 글자 수인 len(self) 로 범위를 확인한다.
+        length = len(self)
+        if not 0 <= start <= end <= length:
+            raise IndexError(f"range [{start}, {end}) is out of bounds for a length of {length}")
+        content = self._content
+        if content.__class__ is not pieces.PieceTable:
+            content = self._content = pieces.PieceTable(self.content)
+
+        # 편집 범위를 단어 경계까지 넓혀서 그 부분의 단어만 다시 센다.
+        index = self._word_index
+        if index is not None:
+            region_start, region_end = content.word_region(start, end)
+            old_words = tokenizer.iter_words(content.slice(region_start, region_end))
+            removed = WordFrequencyIndex.from_words(old_words)
+
+        content.replace(start, end, text)
+
+        if index is not None:
+            region_end += len(text) - (end - start)
+            # index 를 복사하지 않고 그 자리에서 고친다. 예전 count 가 필요한
+            # collection 은 자기 복사본을 들고 있다.
+            index.subtract(removed)
+            index.update(tokenizer.iter_words(content.slice(region_start, region_end)))
+
+            # 끝이 아닌 곳을 고치면 단어가 처음 나온 순서가 바뀔 수 있다.
+            if region_end < len(content):
+                index.rescan_order(self._words)
+
+        self._content_changed((start, end, text))
+
+    @property
+    def content_version(self) -> int:
+        """Return a counter that goes up every time the content is set."""
+        return self._content_version
+
+    @property
+    def last_edit(self) -> typing.Optional[typing.Tuple[int, int, str]]:
+        """
+        Return the `(start, end, text)` of the edit that made the current content.
+        This is `None` if the content was set as a whole (or never changed),
+        so listeners can tell an in-place edit from a new content without
+        comparing the content itself.
+        """
+        return self._last_edit
+
+    def add_content_listener(self, listener: typing.Callable[["Article"], None]) -> None:
+        """Call `listener(article)` every time the content of this Article is set."""
+        # Most articles never get a listener, so they share an empty tuple.
+        self._content_listeners = (*self._content_listeners, listener)
+
+    def remove_content_listener(self, listener: typing.Callable[["Article"], None]) -> None:
+        """Stop calling a listener that was added with `add_content_listener`."""
+        listeners = list(self._content_listeners)
+        listeners.remove(listener)
+        self._content_listeners = tuple(listeners)
 
     def __repr__(self):
       """정답코드
@@ -183,7 +273,12 @@ class Article:
               f' publication_date={self.publication_date.isoformat()!r}>')
   
     def __len__(self):
-      return len(self.content)
+      # PieceTable 도 길이를 알고 있으므로 content 를 합치지 않는다.
+      # bytes 는 decode 하지 않고 글자 수를 센다.
+      content = self._content
+      if isinstance(content, utf8.BYTES_TYPES):
+        return utf8.character_count(content)
+      return len(content)
 
     def short_introduction(self, n_characters:int):
       """정답코드
@@ -205,22 +300,40 @@ class Article:
       return short_content[:rightmost_separator]
       """
 
-      ret_list = []
-      content = self.content
-      content = content.split()
-      total_len = 0
-      for i in content:
-        total_len += len(i)
-        if n_characters >= total_len:
-          ret_list.append(i)
-        else:
-          break
-        total_len+=1
-      return " ".join(ret_list)
+      # 같은 n_characters 로 자주 불리므로 결과를 LRU cache 에 담아둔다.
+      # content 가 바뀌면 version 이 달라지므로 cache 를 비운다.
+      if self._introductions is None:
+        self._introductions = introduction.IntroductionCache()
+      return self._introductions.get(
+        n_characters, self._content_version, self.introduction_cache_size, self._short_introduction
+      )
 
+    def _short_introduction(self, n_characters: int) -> str:
+      # 정답코드와 같은 구현을 사용한다.
+      # content 전체를 split 하지 않고 앞의 n_characters + 1 글자만 본다.
+      content = self._content
+      if content.__class__ is pieces.PieceTable:
+        content = content.prefix(n_characters + 1)
+      elif content.__class__ is not str:
+        content = utf8.decode_prefix(content, n_characters + 1)
+      return introduction.short_introduction(content, n_characters)
+
+    def introduction_cache_info(self) -> IntroductionCacheInfo:
+      """Return the hits, misses, maximum size and current size of the introduction cache."""
+      cache = self._introductions
+      if cache is None:
+        return IntroductionCacheInfo(0, 0, self.introduction_cache_size, 0)
+
+      currsize = len(cache.entries) if cache.version == self._content_version else 0
+      return IntroductionCacheInfo(cache.hits, cache.misses, self.introduction_cache_size, currsize)
       
       
-    def most_common_words(self,n:int):
+    def most_common_words(
+        self,
+        n:int,
+        workers: typing.Optional[int] = None,
+        rules: typing.Optional[tokenizer.Tokenizer] = None,
+    ):
       """정답코드
       # def most_common_words(self, n_words: int) -> typing.Dict[str, int]:
       # type hint!! dict[str,int] 로 구현
@@ -237,38 +350,57 @@ class Article:
       most_common_words = dict(word_counts.most_common(n_words))
       return most_common_words
       """
-      result = {}
-      if n == 0 :
-        return result
-      content = self.content
-      word_list = re.split('\W', content)
-      word_list = ' '.join(word_list).split()
-      word_list = list(map(lambda x:x.lower(),word_list))
-
-      cal_dict = {}
-      for idx,val in enumerate(word_list):
-        try:
-          cal_dict[val]["count"] += 1
-        except KeyError:
-          cal_dict[val] = {"count":1,"idx":idx}
-      
-      # dict to list
-      cal_dict = sorted(cal_dict.items(), key=lambda x: (x[1]["idx"]))
-      # list
-      cal_dict = sorted(cal_dict, key=lambda x: (x[1]["count"]), reverse=True)
-
- 
-      count = 0
-      for i in cal_dict:
-        count+=1 
-        if count > n :
-          break
-        result[i[0]] = i[1]["count"]
-          
-      return result
+      return self.word_index(workers, rules).most_common(n)
+
+    def word_index(
+        self,
+        workers: typing.Optional[int] = None,
+        rules: typing.Optional[tokenizer.Tokenizer] = None,
+    ) -> WordFrequencyIndex:
+      """
+      Return the word-frequency index of the content, building it if needed.
+      Passing `workers` counts very large content in that many processes (see
+      `parallel.count_words`); the result is the same either way. Passing a
+      `tokenizer.Tokenizer` as `rules` counts the words that it finds instead.
+      """
+      # 단어 세기는 content 전체를 훑어야 하므로 한 번만 하고,
+      # content 가 바뀔 때까지 index 를 재사용한다.
+      if self._word_index is None and (rules is None or not rules.fold_unicode):
+        if workers is None:
+          self._word_index = WordFrequencyIndex.from_words(self._words())
+        else:
+          self._word_index = parallel.count_words(self._text(), workers)
+      if rules is None:
+        return self._word_index
+
+      # tokenizer 별 index 는 마지막 하나만 캐시한다. stop word 와 stemming 은
+      # 단어 하나만 보고 정해지므로 기본 index 에서 content 를 다시 읽지 않고 만든다.
+      cached = self._tokenized
+      if cached is not None and cached[0] is rules:
+        return cached[1]
+      if not rules.fold_unicode:
+        index = rules.reindex(self._word_index)
+      elif workers is None:
+        index = WordFrequencyIndex.from_words(self._words(rules.words))
+      else:
+        index = parallel.count_words(self._text(), workers, words=rules.words)
+      self._tokenized = (rules, index)
+      return index
+
+    def _words(self, words=tokenizer.iter_words):
+      # 예전에는 re.split('\W') 로 나눠서 숫자와 '_' 도 단어로 셌다.
+      # 정답코드처럼 알파벳만 단어로 센다. Tokenizer 를 쓰면 그 words 를 넘겨받는다.
+      return words(self._text())
+
+    def _text(self):
+      # 단어를 셀 content: bytes 는 decode 하지 않고 그대로 tokenizer 에 넘긴다.
+      content = self._content
+      if isinstance(content, utf8.BYTES_TYPES):
+        return content
+      return self.content
       
-    def __lt__(self, other):
-      return self.publication_date < other.publication_date
+    # 정렬은 ordering.ChronologicalOrder 가 담당한다.
+    # publication_date(sort_key) 다음 id 순서로 비교하고, == 와 hash 는 id 기준이다.
     """정답코드
     #  def __lt__(self, other: Article) -> typing.Union[bool, NotImplemented]:
     # 동일한 Class 이름인지 확인하여 진행!
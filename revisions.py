@@ -0,0 +1,203 @@
+"""
+An opt-in history of the content of an article.
+A `RevisionLog` listens to an article and records a revision every time its
+content is set or edited. Keeping every version of a large article would
+take a copy of the whole content per edit, so the log stores a delta per
+revision instead: the single range of the previous content that was
+replaced, and the text that replaced it. Now and then the log also keeps a
+full snapshot, so rebuilding a revision never has to replay too many deltas:
+    log = RevisionLog(article)
+    article.content = "..."
+    log[0]          # the content when the log was started
+    log.rollback(0)
+"""
+from __future__ import annotations
+
+import bisect
+import datetime
+import sys
+import typing
+
+import pieces
+
+if typing.TYPE_CHECKING:
+    from qualifier import Article
+
+# Number of characters compared in one go while looking for the changed range.
+_BLOCK_SIZE = 4096
+
+
+class Delta(typing.NamedTuple):
+    """Replace the characters from `start` up to `end` of the previous revision by `text`."""
+
+    start: int
+    end: int
+    text: str
+
+
+def diff(old: str, new: str) -> Delta:
+    """
+    Return the smallest single-range delta that turns `old` into `new`.
+    We skip the longest common prefix and then the longest common suffix of
+    what is left. Both are found by comparing blocks of characters with
+    `str.startswith` and `str.endswith`, which compare in C and only copy the
+    block of `new` that is compared.
+    """
+    old_length, new_length = len(old), len(new)
+    limit = min(old_length, new_length)
+    prefix = _common_length(limit, lambda i, j: old.startswith(new[i:j], i))
+
+    # The suffix may not overlap the prefix in either string.
+    suffix = _common_length(
+        limit - prefix,
+        lambda i, j: old.endswith(new[new_length - j:new_length - i], 0, old_length - i),
+    )
+    return Delta(prefix, old_length - suffix, new[prefix:new_length - suffix])
+
+
+def _common_length(limit: int, matches: typing.Callable[[int, int], bool]) -> int:
+    """
+    Return the largest `length` up to `limit` for which `matches(0, length)` holds.
+    `matches(i, j)` tells whether the characters from `i` up to `j` are equal.
+    Blocks double in size while they match. After the first mismatch they're
+    halved instead, which narrows down the first difference like a binary
+    search without ever comparing a range twice.
+    """
+    length = 0
+    block = _BLOCK_SIZE
+    growing = True
+    while block and length < limit:
+        end = min(length + block, limit)
+        if matches(length, end):
+            length = end
+            if growing:
+                block *= 2
+        else:
+            growing = False
+            block //= 2
+    return length
+
+
+class Revision(typing.NamedTuple):
+    """A version of the content, with the time it was set and its position in the log."""
+
+    number: int
+    last_edited: typing.Optional[datetime.datetime]
+    content: str
+
+
+class RevisionLog:
+    """
+    The revisions of the content of an article, from when the log was started.
+    Revision 0 is the content when the log was started and every change of
+    the content adds a revision. A revision is stored as a `Delta` from the
+    previous one. A full snapshot is kept for revision 0 and whenever the
+    deltas since the last snapshot add up to more than the content itself,
+    or there are `max_chain` of them. Getting a revision is a binary search
+    for the last snapshot before it, after which its deltas are replayed in
+    a `pieces.PieceTable`, which doesn't copy the content for each of them.
+    An in-place edit of the article (see `Article.replace_range`) is its own
+    delta, so the log applies it to its own piece table of the latest
+    content instead of reading the content of the article. Only when the
+    content is set as a whole do we diff it with the latest content.
+    """
+
+    max_chain = 1024
+
+    def __init__(self, article: Article) -> None:
+        self.article = article
+        content = article.content
+
+        self._deltas: typing.List[typing.Optional[Delta]] = [None]
+        self._edited: typing.List[typing.Optional[datetime.datetime]] = [article.last_edited]
+
+        # The revision numbers with a snapshot, and the snapshots themselves.
+        self._snapshot_numbers: typing.List[int] = [0]
+        self._snapshots: typing.List[str] = [content]
+        self._chain_size = 0
+
+        # The latest content, to compute the next delta from. Edits turn it
+        # into a piece table, which is joined when a string is needed.
+        self._latest: typing.Union[str, pieces.PieceTable] = content
+        article.add_content_listener(self._record)
+
+    def __repr__(self) -> str:
+        """Return the 'official' string representation of the log."""
+        cls_name = self.__class__.__name__
+        return f"<{cls_name} revisions={len(self)} snapshots={len(self._snapshots)}>"
+
+    def __len__(self) -> int:
+        """Return the number of revisions."""
+        return len(self._deltas)
+
+    def __getitem__(self, number: int) -> Revision:
+        """Return a revision by its number; negative numbers count from the latest revision."""
+        if number < 0:
+            number += len(self)
+        if not 0 <= number < len(self):
+            raise IndexError("revision number out of range")
+        return Revision(number, self._edited[number], self._content(number))
+
+    def __iter__(self) -> typing.Iterator[Revision]:
+        """Iterate over the revisions from the oldest to the latest."""
+        for number in range(len(self)):
+            yield self[number]
+
+    def rollback(self, number: int) -> None:
+        """Set the content of the article back to that of a revision, which adds a new revision."""
+        self.article.content = self[number].content
+
+    def detach(self) -> None:
+        """Stop recording the changes of the article."""
+        self.article.remove_content_listener(self._record)
+
+    def nbytes(self) -> int:
+        """Return roughly how much memory the log takes, not counting the latest content."""
+        size = sys.getsizeof(self._deltas) + sys.getsizeof(self._edited)
+        size += sum(sys.getsizeof(delta) + sys.getsizeof(delta.text) for delta in self._deltas[1:])
+        size += sum(map(sys.getsizeof, self._snapshots))
+        return size
+
+    def _record(self, article: Article) -> None:
+        """Add a revision for the new content of the article (a content listener)."""
+        edit = article.last_edit
+        if edit is None:
+            content = article.content
+            delta = diff(self._latest_text(), content)
+            latest = self._latest = content
+        else:
+            delta = Delta._make(edit)
+            latest = self._latest
+            if latest.__class__ is not pieces.PieceTable:
+                latest = self._latest = pieces.PieceTable(latest)
+            latest.replace(*delta)
+        self._deltas.append(delta)
+        self._edited.append(article.last_edited)
+
+        self._chain_size += len(delta.text) + 1
+        if self._chain_size > len(latest) or len(self) - 1 - self._snapshot_numbers[-1] >= self.max_chain:
+            self._snapshot_numbers.append(len(self) - 1)
+            self._snapshots.append(self._latest_text())
+            self._chain_size = 0
+
+    def _latest_text(self) -> str:
+        """Return the latest content as a string, joining its pieces if it was edited."""
+        latest = self._latest
+        if latest.__class__ is not str:
+            latest = self._latest = str(latest)
+        return latest
+
+    def _content(self, number: int) -> str:
+        """Rebuild the content of a revision from the last snapshot before it."""
+        if number == len(self) - 1:
+            return self._latest_text()
+
+        index = bisect.bisect_right(self._snapshot_numbers, number) - 1
+        snapshot_number = self._snapshot_numbers[index]
+        if snapshot_number == number:
+            return self._snapshots[index]
+
+        content = pieces.PieceTable(self._snapshots[index])
+        for start, end, text in self._deltas[snapshot_number + 1:number + 1]:
+            content.replace(start, end, text)
+        return str(content)
@@ -0,0 +1,158 @@
+"""
+Full-text search over the content of articles.
+A `SearchIndex` is an inverted index: for every word it keeps a posting list
+of the articles that contain the word, with the positions of the word in
+each of them. Words are found with the same rules as `most_common_words`
+(see `tokenizer`), and so are the words of a query, so searching for
+"Café" finds articles that contain the word "caf".
+A query only looks at the posting lists of its own words, so its cost
+doesn't depend on the size of the corpus but on how often its words occur.
+"""
+from __future__ import annotations
+
+import collections
+import heapq
+import typing
+from array import array
+
+import tokenizer
+from collection import ArticleIndex
+
+if typing.TYPE_CHECKING:
+    from qualifier import Article
+
+
+def _rank_key(item: typing.Tuple[int, int]) -> typing.Tuple[int, int]:
+    """Sort `(id, score)` pairs by descending score and then by id."""
+    id_, score = item
+    return -score, id_
+
+
+class Hit(typing.NamedTuple):
+    """An article that matches a query, with its score."""
+
+    article: Article
+    score: int
+
+
+class SearchIndex(ArticleIndex):
+    """
+    An inverted index of the content of a number of articles.
+    Like every `ArticleIndex`, the index listens to its articles: setting the
+    content of one of them replaces its postings by those of the new content.
+    Results are ranked by term frequency: the number of times the words of
+    the query (or the phrase) occur in the article. Articles with the same
+    score are ordered by id.
+    """
+
+    def __init__(self, articles: typing.Iterable[Article] = ()) -> None:
+        # For every word, the positions (counted in words) at which it occurs
+        # in every article that contains it.
+        self._postings: typing.Dict[str, typing.Dict[int, array]] = {}
+
+        # The distinct words of every article, to find its postings again.
+        self._words: typing.Dict[int, typing.List[str]] = {}
+
+        super().__init__(articles)
+
+    def __repr__(self) -> str:
+        """Return the 'official' string representation of the index."""
+        cls_name = self.__class__.__name__
+        return f"<{cls_name} articles={len(self)} words={len(self._postings)}>"
+
+    def postings(self, word: str) -> typing.Dict[int, array]:
+        """Return the ids of the articles that contain `word`, with the positions of the word."""
+        return self._postings.get(word, {})
+
+    def all_of(self, query: str, n_results: typing.Optional[int] = None) -> typing.List[Hit]:
+        """Return the articles that contain every word of `query`, best first."""
+        postings = self._query_postings(query)
+        if not postings:
+            return []
+
+        # Intersect starting from the rarest word, which has the fewest ids.
+        postings.sort(key=len)
+        ids = set(postings[0])
+        for posting in postings[1:]:
+            ids.intersection_update(posting)
+            if not ids:
+                return []
+
+        scores = {id_: sum(len(posting[id_]) for posting in postings) for id_ in ids}
+        return self._ranked(scores, n_results)
+
+    def any_of(self, query: str, n_results: typing.Optional[int] = None) -> typing.List[Hit]:
+        """Return the articles that contain any word of `query`, best first."""
+        scores: typing.Counter[int] = collections.Counter()
+        for posting in self._query_postings(query):
+            for id_, positions in posting.items():
+                scores[id_] += len(positions)
+        return self._ranked(scores, n_results)
+
+    def phrase(self, query: str, n_results: typing.Optional[int] = None) -> typing.List[Hit]:
+        """
+        Return the articles in which the words of `query` occur one after the other, best first.
+        The score is the number of times the phrase occurs. For every article
+        that has all words, we shift the positions of the `i`-th word back by
+        `i`: the positions left over after intersecting are where the phrase
+        starts.
+        """
+        words = list(tokenizer.iter_words(query))
+        if not words:
+            return []
+
+        postings = [self._postings.get(word) for word in words]
+        if None in postings:
+            return []
+
+        ids = set(min(postings, key=len))
+        for posting in postings:
+            ids.intersection_update(posting)
+
+        scores = {}
+        for id_ in ids:
+            starts = set(postings[0][id_])
+            for offset, posting in enumerate(postings[1:], 1):
+                starts.intersection_update([position - offset for position in posting[id_]])
+                if not starts:
+                    break
+            else:
+                scores[id_] = len(starts)
+        return self._ranked(scores, n_results)
+
+    def _query_postings(self, query: str) -> typing.List[typing.Dict[int, array]]:
+        """Return the posting lists of the distinct words of `query`; missing words have empty ones."""
+        return [self._postings.get(word, {}) for word in dict.fromkeys(tokenizer.iter_words(query))]
+
+    def _ranked(self, scores: typing.Mapping[int, int], n_results: typing.Optional[int]) -> typing.List[Hit]:
+        """Return hits for the ids with the highest `scores`, breaking ties by id."""
+        if n_results is None:
+            items = sorted(scores.items(), key=_rank_key)
+        else:
+            items = heapq.nsmallest(n_results, scores.items(), key=_rank_key)
+        articles = self._articles
+        return [Hit(articles[id_], score) for id_, score in items]
+
+    def _index(self, article: Article) -> None:
+        """Add the postings of the content of an article."""
+        positions: typing.DefaultDict[str, array] = collections.defaultdict(lambda: array("i"))
+        for position, word in enumerate(tokenizer.iter_words(article.content)):
+            positions[word].append(position)
+
+        postings = self._postings
+        id_ = article.id
+        for word, word_positions in positions.items():
+            if word in postings:
+                postings[word][id_] = word_positions
+            else:
+                postings[word] = {id_: word_positions}
+        self._words[id_] = list(positions)
+
+    def _unindex(self, id_: int) -> None:
+        """Remove the postings of an article."""
+        postings = self._postings
+        for word in self._words.pop(id_):
+            posting = postings[word]
+            del posting[id_]
+            if not posting:
+                del postings[word]
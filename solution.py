@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-import collections
 import datetime
 import itertools
-import string
 import typing
 
-AnyType = typing.TypeVar("AnyType")
+import introduction
+import tokenizer
+from fields import ArticleField  # Re-exported as part of the qualifier interface.
+from wordfreq import WordFrequencyIndex
 
 
 class Article:
@@ -33,6 +34,10 @@ class Article:
         # The initial `last_edited` time is `None`, as specified.
         self.last_edited = None
 
+        # Word-frequency index used by `most_common_words`. It's built lazily
+        # on the first call and thrown away by the `content` setter.
+        self._word_index = None
+
     def __repr__(self) -> str:
         """
         Return the "official" string representation of an `Article`.
@@ -81,29 +86,9 @@ class Article:
         described in the requirements, this method assumes that such a character
         is always present in the text.
         """
-        if len(self._content) <= n_characters:
-            # The content is at most `n_characters` long, which means that we
-            # can just return it as is.
-            return self._content
-
-        # First, we reduce the content down to a slice with a length of
-        # `n_characters + 1`. The `+ 1` is important because if that additional
-        # character is a space or newline, we can return the first
-        # `n_characters` as-is.
-        short_content = self._content[:n_characters + 1]
-
-        # Next, we'll find both the rightmost space and newline characters to
-        # see which is last. We'll use that one to break on. As `str.rfind`
-        # returns `-1` if one of the characters isn't found, this simplifies
-        # the comparison later on.
-        rightmost_space = short_content.rfind(" ")
-        rightmost_newline = short_content.rfind("\n")
-
-        # Determine the separator with greatest index (the rightmost separator).
-        rightmost_separator = max((rightmost_space, rightmost_newline))
-
-        # Return a slice of `short_content` using the index we found.
-        return short_content[:rightmost_separator]
+        # The shared implementation only looks at the first `n_characters + 1`
+        # characters of the content, however long the content is.
+        return introduction.short_introduction(self._content, n_characters)
 
     def most_common_words(self, n_words: int) -> typing.Dict[str, int]:
         """
@@ -116,32 +101,19 @@ class Article:
         and treats all non-alphabet characters as word boundaries. The words
         returned in the dictionary will be returned in lowercase.
         """
-        # First, we get rid of the uppercase characters by using `str.lower`.
-        lowercase_content = self._content.lower()
-
-        # We don't care about the specific character that separates different
-        # words; we just want to split the string up into words later. To do
-        # this, we simply replace all non-alphabet characters by a space
-        # character. The `str.split()` we use later doesn't care about the
-        # string having multiple spaces in a row, so we don't have to worry
-        # about that.
-        clean_content = "".join(
-            char if char in string.ascii_lowercase else " "
-            for char in lowercase_content
-        )
-
-        # Use `str.split` to split the string up into words
-        words = clean_content.split()
+        # Counting the words means going over the entire content, so we only
+        # do that once and keep the result around until the content changes.
+        if self._word_index is None:
+            self._word_index = WordFrequencyIndex.from_words(self._words())
 
-        # Use `collections.Counter` to count the occurrences of words.
-        word_counts = collections.Counter(words)
+        return self._word_index.most_common(n_words)
 
-        # Use the `most_common` method of `collections.Counter` to get a list
-        # of the `n_words` most common words and their counts, and turn the
-        # result into a `dict` again.
-        most_common_words = dict(word_counts.most_common(n_words))
-
-        return most_common_words
+    def _words(self) -> typing.Iterator[str]:
+        """Return the lowercase words of the content, split on non-alphabet characters."""
+        # The tokenizer lowercases the content and treats all non-alphabet
+        # characters as word boundaries, just like replacing them by a space
+        # character and splitting the result would.
+        return tokenizer.iter_words(self._content)
 
     # Start of the Intermediate Requirements section
     @property
@@ -159,6 +131,7 @@ class Article:
         """Set a new value for content and capture the `last_edit` datetime."""
         self.last_edited = datetime.datetime.now()
         self._content = new_content
+        self._word_index = None
 
     def __lt__(self, other: Article) -> typing.Union[bool, NotImplemented]:
         """
@@ -176,71 +149,3 @@ class Article:
 
         return self.publication_date < other.publication_date
 
-
-class ArticleField:
-    """The `ArticleField` class for the Advanced Requirements."""
-
-    def __init__(self, field_type: typing.Type[typing.Any]):
-        self.field_type = field_type
-        self.attribute_name = None
-
-    def __repr__(self) -> str:
-        """Return the 'official' string representation of the descriptor."""
-        cls_name = self.__class__.__name__
-        return f"<{cls_name} descriptor with field_type={self.field_type!r}>"
-
-    def __set_name__(self, owner: typing.Type[typing.Any], name: str) -> None:
-        """
-        Capture the fully qualified name assigned to the descriptor instance.
-        As Python allows you to alias the descriptor instance by assigning another
-        class attribute to the descriptor instance, we only capture the name the
-        first time `__set_name__` runs.
-        This is similar to what happens when creating function objects: The `__name__`
-        attribute of the function object is only assigned when the function object is
-        first created. Subsequent aliasing of the function by assigning another name
-        to it does not change the `__name__` attribute.
-        >>> def foo(): pass
-        >>> foo.__name__
-        'foo'
-        >>> bar = foo
-        >>> bar.__name__
-        'foo'
-        """
-        if self.attribute_name is None:
-            self.attribute_name = name
-
-    def __get__(self, obj: typing.Optional[AnyType], owner: typing.Type[AnyType]) -> typing.Any:
-        """Get the value from `obj.__dict__` using `self.attribute_name`."""
-        # If the attribute is accessed via the `owner` class object, we return
-        # the descriptor itself. This allows for easier introspection of the
-        # descriptor.
-        if obj is None:
-            return self
-
-        # Try to get the actual value from `obj.__dict__`. Since this raises
-        # a KeyError, not an AttributeError, when no value was set yet, we
-        # catch the exception and raise an AttributeError instead.
-        try:
-            value = obj.__dict__[self.attribute_name]
-        except KeyError:
-            cls_name = owner.__name__
-            raise AttributeError(
-                f"{cls_name!r} object has no attribute {self.attribute_name!r}"
-            ) from None
-
-        return value
-
-    def __set__(self, obj: typing.Optional[AnyType], new_value: typing.Any) -> None:
-        """Store the new value for attribute in obj.__dict__ after validating its type."""
-        if not isinstance(new_value, self.field_type):
-            # Get the names of the expected type and the actual type of the new_value
-            expected_type = self.field_type.__name__
-            actual_type = type(new_value).__name__
-
-            # Raise a type error to indicate that actual type did not validate.
-            raise TypeError(
-                f"expected an instance of type {expected_type!r} for attribute "
-                f"{self.attribute_name!r}, got {actual_type!r} instead."
-            )
-
-        obj.__dict__[self.attribute_name] = new_value
@@ -0,0 +1,262 @@
+"""
+Columnar storage for very large numbers of articles.
+An `Article` object costs a few hundred bytes on top of its data, and so do
+its title, author, date and content objects. An `ArticleStore` keeps the
+articles in a handful of flat columns instead:
+- ids, publication dates and last edits are 64-bit integers in `array('q')`;
+  dates are stored as microseconds since the epoch.
+- authors are interned: each distinct author is stored once and every article
+  refers to it by a small integer code.
+- titles and contents are UTF-8 encoded into one `bytearray` each, with the
+  offset of every article in an `array('q')`.
+`store[row]` hands out an `ArticleView`, a lightweight object that reads its
+attributes from the columns on demand and supports the read-only part of the
+`Article` interface, including `repr`, `len`, `short_introduction`,
+`most_common_words` and sorting.
+"""
+from __future__ import annotations
+
+import datetime
+import typing
+from array import array
+
+import introduction
+import ordering
+import parallel
+import qualifier
+import tokenizer
+import utf8
+from wordfreq import WordFrequencyIndex
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+# Stands in for a `last_edited` of `None`; no datetime maps to this value.
+_NEVER = -(1 << 63)
+
+
+def to_epoch(date: datetime.datetime) -> int:
+    """Return a naive datetime as the number of microseconds since the epoch."""
+    if date.tzinfo is not None:
+        raise ValueError(f"expected a naive datetime, got {date!r} instead.")
+    return ordering.date_key(date)
+
+
+def from_epoch(microseconds: int) -> datetime.datetime:
+    """Return the naive datetime `microseconds` after the epoch."""
+    return _EPOCH + datetime.timedelta(microseconds=microseconds)
+
+
+class _TextColumn:
+    """Strings encoded one after the other into a single UTF-8 buffer."""
+
+    __slots__ = ("data", "offsets")
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+        # The value at index `row + 1` is where the string of `row` ends.
+        self.offsets = array("q", [0])
+
+    def append(self, text: str) -> None:
+        """Add a string after the last one."""
+        self.data += text.encode("utf-8")
+        self.offsets.append(len(self.data))
+
+    def __getitem__(self, row: int) -> str:
+        """Return the string of `row`."""
+        return self.data[self.offsets[row]:self.offsets[row + 1]].decode("utf-8")
+
+    def prefix(self, row: int, n_bytes: int) -> bytes:
+        """Return at most the first `n_bytes` of the encoded string of `row`."""
+        start = self.offsets[row]
+        return bytes(self.data[start:min(start + n_bytes, self.offsets[row + 1])])
+
+
+class ArticleStore:
+    """
+    An append-only, column-oriented collection of articles.
+    Articles are added either as `Article` objects, which are copied into the
+    columns (the objects themselves aren't kept), or from their attributes.
+    Rows are numbered in the order in which articles were added.
+    """
+
+    def __init__(self, articles: typing.Iterable[qualifier.Article] = ()) -> None:
+        self._ids = array("q")
+        self._publication_dates = array("q")
+        self._last_edited = array("q")
+        self._titles = _TextColumn()
+        self._contents = _TextColumn()
+
+        # The length of each content in characters, as the byte offsets of the
+        # UTF-8 encoded content don't tell us that for non-ASCII text.
+        self._lengths = array("q")
+
+        self._authors: typing.List[str] = []
+        self._author_codes: typing.Dict[str, int] = {}
+        self._author_rows = array("i")
+
+        self.extend(articles)
+
+    def __repr__(self) -> str:
+        """Return the 'official' string representation of the store."""
+        cls_name = self.__class__.__name__
+        return f"<{cls_name} articles={len(self)} authors={len(self._authors)}>"
+
+    def __len__(self) -> int:
+        """Return the number of articles in the store."""
+        return len(self._ids)
+
+    def __getitem__(self, row: int) -> ArticleView:
+        """Return a view of the article in `row`."""
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("store index out of range")
+        return ArticleView(self, row)
+
+    def __iter__(self) -> typing.Iterator[ArticleView]:
+        """Iterate over views of the articles in the order in which they were added."""
+        for row in range(len(self)):
+            yield ArticleView(self, row)
+
+    def add(self, article: qualifier.Article) -> ArticleView:
+        """Copy an article into the store and return a view of it."""
+        return self._append(
+            article.id,
+            article.title,
+            article.author,
+            article.publication_date,
+            article.content,
+            article.last_edited,
+        )
+
+    def extend(self, articles: typing.Iterable[qualifier.Article]) -> None:
+        """Copy a number of articles into the store."""
+        for article in articles:
+            self.add(article)
+
+    def create(
+        self, title: str, author: str, publication_date: datetime.datetime, content: str
+    ) -> ArticleView:
+        """Add an article that only ever exists in the store, giving it the next `Article` id."""
+        return self._append(
+            next(qualifier.Article.id_allocator), title, author, publication_date, content, None
+        )
+
+    def by_publication_date(self) -> typing.List[ArticleView]:
+        """Return views of all articles sorted by publication date, oldest first."""
+        # Sorting the row numbers by the raw integers avoids creating a
+        # datetime (and a view) for every comparison.
+        rows = sorted(range(len(self)), key=self._publication_dates.__getitem__)
+        return [ArticleView(self, row) for row in rows]
+
+    def _append(
+        self,
+        id: int,
+        title: str,
+        author: str,
+        publication_date: datetime.datetime,
+        content: str,
+        last_edited: typing.Optional[datetime.datetime],
+    ) -> ArticleView:
+        """Add a row to every column and return a view of it."""
+        # Convert the dates first so a bad date leaves the columns untouched.
+        publication_epoch = to_epoch(publication_date)
+        last_edited_epoch = _NEVER if last_edited is None else to_epoch(last_edited)
+
+        code = self._author_codes.get(author)
+        if code is None:
+            code = self._author_codes[author] = len(self._authors)
+            self._authors.append(author)
+
+        row = len(self)
+        self._ids.append(id)
+        self._publication_dates.append(publication_epoch)
+        self._last_edited.append(last_edited_epoch)
+        self._titles.append(title)
+        self._contents.append(content)
+        self._lengths.append(len(content))
+        self._author_rows.append(code)
+        return ArticleView(self, row)
+
+
+class ArticleView(ordering.ChronologicalOrder):
+    """
+    A read-only `Article` lookalike for one row of an `ArticleStore`.
+    A view only holds the store and the row number, so it's cheap to create and
+    every attribute is read from the columns when it's asked for. The word
+    index isn't cached, as views are meant to be thrown away after use.
+    Views compare, sort and hash like `Article` objects, also when mixed with them.
+    """
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: ArticleStore, row: int) -> None:
+        self._store = store
+        self._row = row
+
+    @property
+    def id(self) -> int:
+        """Return the id of the article."""
+        return self._store._ids[self._row]
+
+    @property
+    def title(self) -> str:
+        """Return the title of the article."""
+        return self._store._titles[self._row]
+
+    @property
+    def author(self) -> str:
+        """Return the author of the article."""
+        store = self._store
+        return store._authors[store._author_rows[self._row]]
+
+    @property
+    def publication_date(self) -> datetime.datetime:
+        """Return the publication date of the article."""
+        return from_epoch(self._store._publication_dates[self._row])
+
+    @property
+    def sort_key(self) -> int:
+        """Return the publication date as an integer that sorts like it (see `Article.sort_key`)."""
+        return self._store._publication_dates[self._row]
+
+    @property
+    def last_edited(self) -> typing.Optional[datetime.datetime]:
+        """Return when the content was last set before it was stored, if ever."""
+        value = self._store._last_edited[self._row]
+        return None if value == _NEVER else from_epoch(value)
+
+    @property
+    def content(self) -> str:
+        """Return the content of the article."""
+        return self._store._contents[self._row]
+
+    def __repr__(self) -> str:
+        """Return the same representation as the `Article` it stands in for."""
+        return (
+            f"<Article"
+            f" title={self.title!r}"
+            f" author={self.author!r}"
+            f" publication_date={self.publication_date.isoformat()!r}>"
+        )
+
+    def __len__(self) -> int:
+        """Return the length of the content in characters without decoding it."""
+        return self._store._lengths[self._row]
+
+    def short_introduction(self, n_characters: int) -> str:
+        """Return an introduction of at most `n_characters`, decoding only the start of the content."""
+        # A character takes at most four bytes in UTF-8.
+        prefix = self._store._contents.prefix(self._row, 4 * (n_characters + 1))
+        short_content = utf8.decode_prefix(prefix, n_characters + 1)
+        return introduction.short_introduction(short_content, n_characters)
+
+    def most_common_words(self, n_words: int, workers: typing.Optional[int] = None) -> typing.Dict[str, int]:
+        """Return the `n_words` most common words of the content with their counts."""
+        return self.word_index(workers).most_common(n_words)
+
+    def word_index(self, workers: typing.Optional[int] = None) -> WordFrequencyIndex:
+        """Return a word-frequency index of the content (see `Article.word_index`)."""
+        if workers is None:
+            return WordFrequencyIndex.from_words(tokenizer.iter_words(self.content))
+        return parallel.count_words(self.content, workers)
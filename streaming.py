@@ -0,0 +1,122 @@
+"""
+Articles whose content stays in a file instead of in memory.
+A `FileArticle` keeps the path of a UTF-8 encoded file and memory-maps it
+whenever it needs to look at the content. `len`, `short_introduction` and
+`most_common_words` work through the mapped file one chunk at a time, so the
+memory they use doesn't grow with the size of the article.
+"""
+from __future__ import annotations
+
+import contextlib
+import datetime
+import mmap
+import os
+import typing
+
+import introduction
+import qualifier
+import tokenizer
+import utf8
+from wordfreq import WordFrequencyIndex
+
+
+class FileArticle(qualifier.Article):
+    """An `Article` whose content is read from a UTF-8 encoded file on demand."""
+
+    # The number of bytes looked at in one go while streaming over the file.
+    chunk_size = tokenizer.CHUNK_SIZE
+
+    def __init__(
+        self,
+        title: str,
+        author: str,
+        publication_date: datetime.datetime,
+        path: typing.Union[str, os.PathLike],
+    ):
+        super().__init__(title, author, publication_date, content="")
+        self.path = os.fspath(path)
+
+        # The length in characters is only computed once, as it requires a
+        # pass over the entire file.
+        self._length = None
+
+    @property
+    def content(self) -> str:
+        """Return the content of the Article, reading the entire file if it's file-backed."""
+        if self.path is None:
+            return qualifier.Article.content.fget(self)
+
+        with self._mapped() as buffer:
+            return str(buffer[:], "utf-8")
+
+    @content.setter
+    def content(self, value: str) -> None:
+        """Set new, in-memory content. The file is left untouched and no longer used."""
+        self.path = None
+        self._length = None
+        qualifier.Article.content.fset(self, value)
+
+    def replace_range(self, start: int, end: int, text: str) -> None:
+        """Edit the content (see `Article.replace_range`), reading a file-backed content into memory first."""
+        if self.path is not None:
+            self._content = self.content
+            self.path = None
+            self._length = None
+        super().replace_range(start, end, text)
+
+    def __len__(self) -> int:
+        """Return the length of the content in characters without decoding the file."""
+        if self.path is None:
+            return super().__len__()
+
+        if self._length is None:
+            with self._mapped() as buffer:
+                self._length = utf8.character_count(buffer, self.chunk_size)
+
+        return self._length
+
+    def _short_introduction(self, n_characters: int) -> str:
+        """Return an introduction of at most `n_characters`, reading only the start of the file."""
+        if self.path is None:
+            return super()._short_introduction(n_characters)
+
+        with self._mapped() as buffer:
+            short_content = utf8.decode_prefix(buffer, n_characters + 1)
+        return introduction.short_introduction(short_content, n_characters)
+
+    def word_index(
+        self,
+        workers: typing.Optional[int] = None,
+        rules: typing.Optional[tokenizer.Tokenizer] = None,
+    ) -> WordFrequencyIndex:
+        """Return the word-frequency index of the content, streaming over the file if needed."""
+        # Counting in worker processes needs the content in memory, which is
+        # exactly what a file-backed article avoids, so we always stream.
+        if self.path is not None:
+            workers = None
+        return super().word_index(workers, rules)
+
+    def _words(
+        self,
+        words: typing.Callable[[str], typing.Iterable[str]] = tokenizer.iter_words,
+    ) -> typing.Iterator[str]:
+        """Yield the words of the content, decoding the file one chunk at a time."""
+        if self.path is None:
+            yield from super()._words(words)
+            return
+
+        with self._mapped() as buffer:
+            for start, end in tokenizer.chunk_bounds(buffer, self.chunk_size):
+                yield from words(str(buffer[start:end], "utf-8"))
+
+    @contextlib.contextmanager
+    def _mapped(self) -> typing.Iterator[typing.Union[mmap.mmap, bytes]]:
+        """Memory-map the file for the duration of the `with` block."""
+        with open(self.path, "rb") as file:
+            # Empty files can't be memory-mapped, but they're easy to read.
+            if os.fstat(file.fileno()).st_size == 0:
+                yield b""
+                return
+
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                yield buffer
@@ -0,0 +1,49 @@
+import datetime
+import time
+import unittest
+from unittest import mock
+
+import clocks
+import qualifier
+
+
+class T540ClockTests(unittest.TestCase):
+    """Tests for the clocks that stamp last_edited."""
+
+    def setUp(self) -> None:
+        """Create an article and remember the clock of Article."""
+        self.article = qualifier.Article(
+            title="a", author="b", content="c", publication_date=datetime.datetime(2020, 7, 2)
+        )
+        self.addCleanup(setattr, qualifier.Article, "clock", qualifier.Article.clock)
+
+    def test_541_monotonic_clock_is_converted_on_read(self):
+        """The monotonic clock should store an integer and return a datetime."""
+        qualifier.Article.clock = clocks.monotonic
+        before = datetime.datetime.now()
+        self.article.content = "new"
+        self.assertIsInstance(self.article._last_edited, int)
+
+        last_edited = self.article.last_edited
+        self.assertIsInstance(last_edited, datetime.datetime)
+        self.assertLess(abs(last_edited - before), datetime.timedelta(seconds=1))
+        self.assertIs(last_edited, self.article.last_edited)
+
+    def test_542_coarse_clock(self):
+        """The coarse clock should reuse its time until the resolution has passed."""
+        clock = clocks.CoarseClock(resolution=60)
+        qualifier.Article.clock = clock
+        self.article.content = "new"
+        first = self.article.last_edited
+        self.article.content = "newer"
+        self.assertIs(first, self.article.last_edited)
+
+        with mock.patch("time.monotonic_ns", return_value=time.monotonic_ns() + 61 * 10 ** 9):
+            self.assertIsNot(first, clock())
+
+    def test_543_functions_are_not_bound(self):
+        """A plain function should be called without the article as an argument."""
+        date = datetime.datetime(2020, 7, 2, 15, 3, 10)
+        qualifier.Article.clock = lambda: date
+        self.article.content = "new"
+        self.assertEqual(date, self.article.last_edited)
@@ -0,0 +1,105 @@
+import datetime
+import unittest
+
+from collection import ArticleCollection
+from duplicates import DuplicateIndex
+from keywords import KeywordIndex
+from search import SearchIndex
+from testing import make_article
+
+
+class T420ArticleCollectionTests(unittest.TestCase):
+    """Tests for the corpus-level ArticleCollection."""
+
+    def setUp(self) -> None:
+        """Create a collection of three articles by two authors."""
+        self.first = make_article(
+            "red green green", author="grimm", publication_date=datetime.datetime(1812, 1, 1)
+        )
+        self.second = make_article(
+            "blue blue blue red", author="andersen", publication_date=datetime.datetime(1837, 1, 1)
+        )
+        self.third = make_article(
+            "green red", author="grimm", publication_date=datetime.datetime(1857, 1, 1)
+        )
+        self.collection = ArticleCollection([self.first, self.second, self.third])
+
+    def test_421_most_common_words_across_articles(self):
+        """most_common_words should sum the counts of all articles in the collection."""
+        self.assertEqual(
+            [("red", 3), ("green", 3), ("blue", 3)],
+            list(self.collection.most_common_words(3).items()),
+        )
+
+    def test_422_filters(self):
+        """most_common_words should only count the articles matching the filters."""
+        self.assertEqual({"green": 3, "red": 2}, self.collection.most_common_words(5, author="grimm"))
+        self.assertEqual(
+            {"blue": 3, "red": 2, "green": 1},
+            self.collection.most_common_words(5, start=datetime.datetime(1837, 1, 1)),
+        )
+        self.assertEqual(
+            {"red": 1, "green": 2},
+            self.collection.most_common_words(5, end=datetime.datetime(1837, 1, 1)),
+        )
+
+    def test_423_updates_when_content_changes(self):
+        """Setting the content of an article should update the corpus counts."""
+        self.collection.most_common_words(1)
+        self.second.content = "green"
+        self.assertEqual({"green": 4, "red": 2}, self.collection.most_common_words(5))
+
+    def test_424_add_and_remove(self):
+        """Adding or removing articles should add or subtract their counts."""
+        self.collection.most_common_words(1)
+        self.collection.remove(self.second)
+        self.assertNotIn(self.second, self.collection)
+        self.assertEqual({"red": 2, "green": 3}, self.collection.most_common_words(5))
+
+        # Removed articles should no longer update the collection.
+        self.second.content = "purple"
+        self.collection.add(make_article("green yellow"))
+        self.assertEqual({"green": 4, "red": 2, "yellow": 1}, self.collection.most_common_words(5))
+
+    def test_425_shared_bookkeeping(self):
+        """Every kind of ArticleIndex should reject duplicates and stop listening to removed articles."""
+        for cls, kind in (
+            (ArticleCollection, "collection"),
+            (SearchIndex, "index"),
+            (KeywordIndex, "index"),
+            (DuplicateIndex, "index"),
+        ):
+            with self.subTest(cls=cls.__name__):
+                index = cls([self.first, self.second])
+                with self.assertRaisesRegex(ValueError, f"already in the {kind}$"):
+                    index.add(self.first)
+                with self.assertRaises(KeyError):
+                    index.remove(self.third)
+
+                index.remove(self.first)
+                self.assertEqual(1, len(index))
+                self.assertNotIn(self.first, index)
+                self.assertIn(self.second, index)
+                self.assertNotIn(index._content_changed, self.first._content_listeners)
+
+
+    def test_426_edit_in_the_middle_keeps_tie_order(self):
+        """After an edit in the middle of an article, ties should follow its new first occurrences."""
+        article = make_article("alpha beta gamma")
+        article.most_common_words(3)
+        article.replace_range(0, 5, "delta")
+
+        expected = [("delta", 1), ("beta", 1), ("gamma", 1)]
+        self.assertEqual(expected, list(article.most_common_words(3).items()))
+        collection = ArticleCollection([article])
+        self.assertEqual(expected, list(collection.most_common_words(3).items()))
+        self.assertEqual(expected, list(collection.most_common_words(3, author="b").items()))
+
+        # The same goes for an article that's edited while in the collection.
+        article.replace_range(6, 10, "epsilon")
+        expected = [("delta", 1), ("epsilon", 1), ("gamma", 1)]
+        self.assertEqual(expected, list(article.most_common_words(3).items()))
+        self.assertEqual(expected, list(collection.most_common_words(3).items()))
+
+if __name__ == "__main__":
+    unittest.main()
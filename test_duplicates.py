@@ -0,0 +1,89 @@
+import random
+import string
+import unittest
+
+from duplicates import DuplicateIndex, MinHash, SimHash
+from testing import make_article
+
+
+def make_text(rng: random.Random, n_words: int = 200) -> str:
+    """Generate `n_words` random words."""
+    return " ".join("".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 8))) for _ in range(n_words))
+
+
+def edit(rng: random.Random, text: str, n_edits: int) -> str:
+    """Replace `n_edits` random words of `text` by other words."""
+    words = text.split()
+    for _ in range(n_edits):
+        words[rng.randrange(len(words))] = "changed"
+    return " ".join(words)
+
+
+class T590DuplicateTests(unittest.TestCase):
+    """Tests for near-duplicate detection with MinHash, SimHash and LSH."""
+
+    def setUp(self) -> None:
+        """Create an original text, a near-duplicate and an unrelated text."""
+        rng = random.Random(2020)
+        self.original = make_text(rng)
+        self.copy = edit(rng, self.original, 3)
+        self.other = make_text(rng)
+
+    def test_591_signatures(self):
+        """Signatures should follow the tokenizer and estimate similarity."""
+        for scheme in (MinHash(), SimHash()):
+            with self.subTest(scheme=scheme):
+                self.assertEqual(scheme.signature("It's 8PM!"), scheme.signature("it S pm"))
+                original, copy, other = map(scheme.signature, (self.original, self.copy, self.other))
+                self.assertEqual(1.0, scheme.similarity(original, original))
+                self.assertGreater(scheme.similarity(original, copy), 0.8)
+                self.assertLess(scheme.similarity(original, other), 0.7)
+
+        self.assertEqual(128, len(MinHash().signature("")))
+        self.assertEqual(16, len(MinHash().band_keys(MinHash().signature("a b"))))
+        self.assertEqual(0, SimHash().signature(""))
+
+    def test_592_invalid_parameters(self):
+        """Bands must divide the signature into equal parts."""
+        with self.assertRaises(ValueError):
+            MinHash(n_hashes=100)
+        with self.assertRaises(ValueError):
+            MinHash(bands=5)
+        with self.assertRaises(ValueError):
+            MinHash(shingle_size=0)
+        with self.assertRaises(ValueError):
+            SimHash(bands=5)
+
+    def test_593_index(self):
+        """The index should find near-duplicates, and only those."""
+        for scheme in (MinHash(), SimHash()):
+            with self.subTest(scheme=scheme):
+                original, copy, other = map(make_article, (self.original, self.copy, self.other))
+                same = make_article(self.original)
+                index = DuplicateIndex([original, copy, other, same], scheme=scheme)
+
+                self.assertEqual([same, copy], [duplicate.article for duplicate in index.duplicates(original)])
+                self.assertEqual(1.0, index.duplicates(original)[0].similarity)
+                self.assertEqual([], index.duplicates(other))
+                self.assertEqual(
+                    [(original, copy), (original, same), (copy, same)],
+                    sorted((first, second) for first, second, _ in index.pairs()),
+                )
+                query = make_article(self.original)
+                self.assertEqual([original, same, copy], [duplicate.article for duplicate in index.duplicates(query)])
+
+    def test_594_updates(self):
+        """Changing or removing an article should move it out of its old buckets."""
+        original, copy, other = map(make_article, (self.original, self.copy, self.other))
+        index = DuplicateIndex([original, copy, other])
+
+        copy.content = self.other
+        self.assertEqual([other], [duplicate.article for duplicate in index.duplicates(copy)])
+        self.assertEqual([], index.duplicates(original))
+
+        index.remove(other)
+        self.assertEqual([], list(index.pairs()))
+        with self.assertRaises(KeyError):
+            index.remove(other)
+        with self.assertRaises(ValueError):
+            index.add(copy)
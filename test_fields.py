@@ -0,0 +1,149 @@
+import re
+import typing
+import unittest
+
+import fields
+from fields import ArticleField, SlottedFields
+
+
+class T470SlottedFieldTests(unittest.TestCase):
+    """Tests for ArticleFields stored in hidden slots."""
+
+    def setUp(self) -> None:
+        """Create an instance of a slotted class with two fields."""
+        class Book(metaclass=SlottedFields):
+            """Slotted test class which uses two ArticleFields."""
+            __slots__ = ("notes",)
+            title = ArticleField(field_type=str)
+            pages = ArticleField(field_type=int)
+            page_count = pages
+
+        self.cls = Book
+        self.book = Book()
+
+    def test_471_hidden_slots(self):
+        """Each field should get one hidden slot and instances should have no __dict__."""
+        self.assertEqual(("notes", "_field_title", "_field_pages"), self.cls.__slots__)
+        self.assertFalse(hasattr(self.book, "__dict__"))
+        self.assertIsInstance(self.cls.title, ArticleField)
+
+    def test_472_get_and_set(self):
+        """Fields in hidden slots should store separate, validated values."""
+        self.book.title = "Rapunzel"
+        self.book.pages = 12
+        self.assertEqual("Rapunzel", self.book.title)
+        self.assertEqual(12, self.book.page_count)
+
+        msg = "expected an instance of type 'int' for attribute 'pages', got 'str' instead"
+        with self.assertRaisesRegex(TypeError, msg):
+            self.book.pages = "twelve"
+
+    def test_473_unset_field_raises_attribute_error(self):
+        """An unset field should raise an AttributeError naming the field, not its hidden slot."""
+        with self.assertRaisesRegex(AttributeError, "^'Book' object has no attribute 'title'$"):
+            self.book.title
+
+
+class T480FieldValidationTests(unittest.TestCase):
+    """Tests for typing constructs and constraints on ArticleFields."""
+
+    def setUp(self) -> None:
+        """Create an instance of a class with typed and constrained fields."""
+        class Post:
+            """Test class which uses ArticleFields with rich types and constraints."""
+            subtitle = ArticleField(typing.Optional[str], max_length=5)
+            score = ArticleField(typing.Union[int, float], min_value=0, max_value=10)
+            tags = ArticleField(typing.List[str])
+            sizes = ArticleField(typing.Dict[str, typing.Tuple[int, ...]])
+            slug = ArticleField(str, pattern=r"[a-z-]+")
+
+        self.post = Post()
+
+    def test_481_typing_constructs(self):
+        """Values should be checked against Optional, Union and generic collection types."""
+        valid = (
+            ("subtitle", None), ("subtitle", "short"), ("score", 2.5), ("score", 7),
+            ("tags", ["a", "b"]), ("tags", []), ("sizes", {"a": (1, 2), "b": ()}),
+        )
+        for attribute, value in valid:
+            with self.subTest(attribute=attribute, value=value):
+                setattr(self.post, attribute, value)
+                self.assertEqual(value, getattr(self.post, attribute))
+
+        invalid = (
+            ("subtitle", 1), ("score", "1"), ("tags", ("a",)), ("tags", ["a", 1]),
+            ("sizes", {"a": (1, "2")}),
+        )
+        for attribute, value in invalid:
+            with self.subTest(attribute=attribute, value=value):
+                with self.assertRaises(TypeError):
+                    setattr(self.post, attribute, value)
+
+    def test_482_constraints(self):
+        """Values violating a constraint should raise a ValueError."""
+        invalid = (("subtitle", "too long"), ("score", -1), ("score", 10.5), ("slug", "Not a slug"))
+        for attribute, value in invalid:
+            with self.subTest(attribute=attribute, value=value):
+                with self.assertRaises(ValueError):
+                    setattr(self.post, attribute, value)
+
+    def test_483_error_message_names_typing_construct(self):
+        """The type error message should include a readable name of the declared type."""
+        msg = "expected an instance of type 'List[str]' for attribute 'tags', got 'str' instead"
+        with self.assertRaisesRegex(TypeError, re.escape(msg)):
+            self.post.tags = "a"
+
+
+class T490BulkCreateTests(unittest.TestCase):
+    """Tests for creating many instances from columnar data."""
+
+    def setUp(self) -> None:
+        """Create a plain and a slotted class with the same fields."""
+        class Row:
+            """Test class which stores its ArticleFields in a __dict__."""
+            title = ArticleField(str, min_length=1)
+            year = ArticleField(int, min_value=1800)
+
+        class SlottedRow(fields.FieldModel, metaclass=SlottedFields):
+            """Test class which stores its ArticleFields in hidden slots."""
+            title = ArticleField(str, min_length=1)
+            year = ArticleField(int, min_value=1800)
+
+        self.classes = (Row, SlottedRow)
+
+    def test_491_columns_and_rows(self):
+        """bulk_create should accept a dict of columns or an iterable of rows."""
+        for cls in self.classes:
+            with self.subTest(cls=cls.__name__):
+                from_columns = fields.bulk_create(cls, {"title": ["a", "b"], "year": [1812, 1837]})
+                from_rows = fields.bulk_create(cls, [("a", 1812), ("b", 1837)])
+                if issubclass(cls, fields.FieldModel):
+                    from_rows = cls.bulk_create([("a", 1812), ("b", 1837)])
+                for instances in (from_columns, from_rows):
+                    self.assertEqual(
+                        [("a", 1812), ("b", 1837)],
+                        [(instance.title, instance.year) for instance in instances],
+                    )
+
+    def test_492_all_violations_are_reported(self):
+        """bulk_create should report every invalid value at once."""
+        rows = [("a", 1812), ("", 1837), ("c", "1857"), ("d", 1700)]
+        with self.assertRaises(fields.BulkValidationError) as context:
+            fields.bulk_create(self.classes[0], rows)
+
+        errors = [(row, name, type(error)) for row, name, error in context.exception.errors]
+        self.assertEqual(
+            [(1, "title", ValueError), (2, "year", TypeError), (3, "year", ValueError)], errors
+        )
+
+    def test_493_rows_must_have_a_value_per_field(self):
+        """bulk_create should reject rows with too few or too many values instead of truncating them."""
+        for cls in self.classes:
+            for rows, ragged in (([("a", 1812, 99), ("b", 1837)], "0"), ([("a", 1812), ("b",), ()], "1, 2")):
+                with self.subTest(cls=cls.__name__, rows=rows):
+                    with self.assertRaisesRegex(ValueError, f"should have 2 values, .*; rows {ragged} don't$"):
+                        fields.bulk_create(cls, rows)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import concurrent.futures
+import multiprocessing
+import os
+import tempfile
+import threading
+import unittest
+
+import ids
+import qualifier
+from testing import make_article
+
+
+def allocate(n_ids: int) -> list:
+    """Create `n_ids` articles and return their ids (runs in a worker process)."""
+    return [make_article().id for _ in range(n_ids)]
+
+
+class T530IdAllocationTests(unittest.TestCase):
+    """Tests for the pluggable article id allocators."""
+
+    def setUp(self) -> None:
+        """Remember the allocator of Article, so the tests can replace it."""
+        self.original = qualifier.Article.id_allocator
+
+    def tearDown(self) -> None:
+        """Restore the allocator of Article."""
+        qualifier.Article.id_allocator = self.original
+
+    def test_531_block_allocator_in_threads(self):
+        """Threads should get distinct ids from their own blocks."""
+        counter = ids.SharedCounter(start=100)
+        ids.install(counter, block_size=7)
+        results = []
+
+        def run() -> None:
+            results.append(allocate(50))
+
+        threads = [threading.Thread(target=run) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        all_ids = [id_ for result in results for id_ in result]
+        self.assertEqual(400, len(set(all_ids)))
+        self.assertEqual(100, min(all_ids))
+        for result in results:
+            self.assertEqual(sorted(result), result)
+
+    def test_532_shared_counter_across_processes(self):
+        """Worker processes that share a counter should never hand out the same id."""
+        for counter in (ids.SharedCounter(), ids.FileCounter(os.path.join(self.directory(), "ids"))):
+            with self.subTest(counter=type(counter).__name__):
+                with concurrent.futures.ProcessPoolExecutor(
+                    4, initializer=ids.install, initargs=(counter, 16)
+                ) as executor:
+                    results = list(executor.map(allocate, [100] * 8))
+
+                all_ids = [id_ for result in results for id_ in result]
+                self.assertEqual(800, len(set(all_ids)))
+
+    def test_533_file_counter_persists(self):
+        """A FileCounter should continue where a previous one left off."""
+        path = os.path.join(self.directory(), "ids")
+        self.assertEqual(5, ids.FileCounter(path, start=5).lease(10))
+        self.assertEqual([15, 16], [next(ids.FileCounter(path)) for _ in range(2)])
+
+    @unittest.skipUnless(hasattr(os, "fork"), "needs os.fork")
+    def test_534_forked_child_drops_parent_block(self):
+        """A forked process should lease a new block instead of reusing its parent's."""
+        allocator = ids.BlockAllocator(ids.SharedCounter(), block_size=10)
+        self.assertEqual(0, next(allocator))
+
+        # A forked process inherits its arguments, so the allocator isn't pickled.
+        context = multiprocessing.get_context("fork")
+        queue = context.SimpleQueue()
+        child = context.Process(target=lambda: queue.put(next(allocator)))
+        child.start()
+        child.join()
+
+        self.assertEqual(10, queue.get())
+        self.assertEqual(1, next(allocator))
+
+    def test_535_invalid_block_size(self):
+        """Blocks must contain at least one id."""
+        with self.assertRaises(ValueError):
+            ids.BlockAllocator(ids.SharedCounter(), block_size=0)
+
+    def directory(self) -> str:
+        """Return a temporary directory that is removed after the test."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        return directory.name
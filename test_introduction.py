@@ -0,0 +1,74 @@
+import datetime
+import unittest
+import weakref
+
+import qualifier
+from introduction import short_introduction
+
+
+class T450ShortIntroductionTests(unittest.TestCase):
+    """Tests for the shared short_introduction implementation."""
+
+    def test_451_cuts_at_rightmost_separator(self):
+        """The introduction should end at the rightmost space/newline within n_characters + 1."""
+        self.assertEqual("Lo and", short_introduction("Lo and behold!", 7))
+        self.assertEqual("Lo and", short_introduction("Lo and\nbehold!", 6))
+        self.assertEqual("Lo and behold!", short_introduction("Lo and behold!", 14))
+
+    def test_452_no_separator(self):
+        """Without a space/newline to cut at, the content should be cut at n_characters."""
+        self.assertEqual("Abraca", short_introduction("Abracadabra", 6))
+
+    def test_453_no_characters(self):
+        """An n_characters of zero or less should give an empty introduction."""
+        for n in (0, -1, -20):
+            with self.subTest(n_characters=n):
+                self.assertEqual("", short_introduction("hello world foo", n))
+
+
+class T460IntroductionCacheTests(unittest.TestCase):
+    """Tests for the per-article cache of introductions."""
+
+    def setUp(self) -> None:
+        """Create an Article with a small introduction cache."""
+        class SmallCacheArticle(qualifier.Article):
+            """Article with room for only two introductions."""
+            __slots__ = ()
+            introduction_cache_size = 2
+
+        self.article = SmallCacheArticle(
+            title="a", author="b", content="Lo and behold, a cache!",
+            publication_date=datetime.datetime(2020, 7, 2),
+        )
+
+    def test_461_hits_and_misses(self):
+        """Repeated calls with the same n_characters should be cache hits."""
+        for n in (6, 14, 6, 6, 14):
+            self.article.short_introduction(n)
+        self.assertEqual((3, 2, 2, 2), tuple(self.article.introduction_cache_info()))
+
+    def test_462_least_recently_used_introduction_is_evicted(self):
+        """The least recently used introduction should be evicted first."""
+        for n in (6, 14, 6, 20, 6, 14):
+            self.article.short_introduction(n)
+        self.assertEqual(
+            qualifier.IntroductionCacheInfo(hits=2, misses=4, maxsize=2, currsize=2),
+            self.article.introduction_cache_info(),
+        )
+
+    def test_463_setting_content_invalidates_the_cache(self):
+        """Setting the content should bump the content version and empty the cache."""
+        self.assertEqual("Lo and", self.article.short_introduction(6))
+        self.article.content = "Once upon a time"
+        self.assertEqual(1, self.article.content_version)
+        self.assertEqual(0, self.article.introduction_cache_info().currsize)
+        self.assertEqual("Once", self.article.short_introduction(6))
+
+    def test_464_articles_support_weak_references(self):
+        """Slotted articles should still support weak references."""
+        reference = weakref.ref(self.article)
+        self.assertIs(self.article, reference())
+
+
+if __name__ == "__main__":
+    unittest.main()
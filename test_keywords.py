@@ -0,0 +1,63 @@
+import math
+import unittest
+
+from keywords import KeywordIndex
+from testing import make_article
+
+
+class T580KeywordIndexTests(unittest.TestCase):
+    """Tests for TF-IDF keywords across a corpus."""
+
+    def setUp(self) -> None:
+        """Index three articles that all use the word "the"."""
+        self.wolf = make_article("The wolf ate the grandmother. The wolf!")
+        self.frog = make_article("The frog and the princess and the frog")
+        self.goose = make_article("The goose laid the golden egg")
+        self.index = KeywordIndex([self.wolf, self.frog, self.goose])
+
+    def test_581_document_frequencies(self):
+        """Every word should count once per article that contains it."""
+        self.assertEqual(3, self.index.document_frequency("the"))
+        self.assertEqual(1, self.index.document_frequency("wolf"))
+        self.assertEqual(0, self.index.document_frequency("fox"))
+        self.assertAlmostEqual(1.0, self.index.idf("the"))
+        self.assertAlmostEqual(math.log(4 / 2) + 1, self.index.idf("wolf"))
+
+    def test_582_keywords_are_distinctive(self):
+        """Words that occur in every article should rank below the ones that set it apart."""
+        self.assertEqual(["wolf", "the"], list(self.index.keywords(self.wolf, 2)))
+        self.assertEqual(["and", "frog"], list(self.index.keywords(self.frog, 2)))
+        self.assertEqual({}, self.index.keywords(self.frog, 0))
+
+        scores = self.index.scores(self.wolf)
+        self.assertAlmostEqual(2 / 7 * (math.log(2) + 1), scores["wolf"])
+        self.assertAlmostEqual(3 / 7, scores["the"])
+        self.assertEqual(scores["wolf"], self.index.keywords(self.wolf, 1)["wolf"])
+
+    def test_583_updates(self):
+        """Adding, removing and changing articles should only update their own words."""
+        self.index.remove(self.goose)
+        self.assertEqual(0, self.index.document_frequency("goose"))
+        self.assertAlmostEqual(math.log(3 / 2) + 1, self.index.idf("wolf"))
+
+        self.frog.content = "A wolf"
+        self.assertEqual(2, self.index.document_frequency("wolf"))
+        self.assertEqual(0, self.index.document_frequency("princess"))
+        self.wolf.append(" A frog")
+        self.assertEqual(1, self.index.document_frequency("frog"))
+        self.assertEqual(2, self.index.document_frequency("a"))
+
+        self.goose.content = "wolf"
+        self.assertEqual(2, self.index.document_frequency("wolf"))
+
+    def test_584_membership(self):
+        """Articles can only be added once and must be in the index to be scored."""
+        with self.assertRaises(ValueError):
+            self.index.add(self.wolf)
+        with self.assertRaises(KeyError):
+            self.index.keywords(make_article("wolf"), 1)
+        with self.assertRaises(KeyError):
+            self.index.remove(make_article("wolf"))
+
+        empty = make_article("")
+        self.assertEqual({}, KeywordIndex([empty]).keywords(empty, 3))
@@ -0,0 +1,148 @@
+import bisect
+import datetime
+import heapq
+import random
+import unittest
+
+from ordering import SortedArticles, by_publication_date, date_key, merge_feeds
+from store import ArticleStore
+from testing import make_article
+
+
+class SmallChunkSortedArticles(SortedArticles):
+    """SortedArticles with tiny chunks, so the tests cover splitting and merging them."""
+
+    load = 2
+
+
+class T510OrderingTests(unittest.TestCase):
+    """Tests for sort keys and the SortedArticles index."""
+
+    def setUp(self) -> None:
+        """Create articles with shuffled publication dates, some of them equal."""
+        rng = random.Random(2020)
+        start = datetime.datetime(2020, 7, 2)
+        dates = [start + datetime.timedelta(days=rng.randint(0, 20)) for _ in range(50)]
+        self.articles = [make_article(publication_date=date) for date in dates]
+        self.expected = sorted(self.articles, key=lambda article: (article.publication_date, article.id))
+
+    def test_511_sort_key(self):
+        """Sorting by sort_key should give the same order as sorting by publication date."""
+        self.assertEqual(sorted(self.articles), sorted(self.articles, key=by_publication_date))
+
+        utc = datetime.timezone.utc
+        aware = [datetime.datetime(2020, 7, 2, 1, tzinfo=datetime.timezone(datetime.timedelta(hours=2))),
+                 datetime.datetime(2020, 7, 1, 23, 30, tzinfo=utc)]
+        self.assertEqual(aware[0] < aware[1], date_key(aware[0]) < date_key(aware[1]))
+        self.assertEqual(-1, date_key(datetime.datetime(1969, 12, 31, 23, 59, 59, 999999)))
+
+    def test_512_sort_key_follows_publication_date(self):
+        """Setting the publication date should update the cached sort key."""
+        article = self.articles[0]
+        old_key = article.sort_key
+        article.publication_date += datetime.timedelta(microseconds=1)
+        self.assertEqual(old_key + 1, article.sort_key)
+
+    def test_513_insertion_order_does_not_matter(self):
+        """Adding articles one at a time should give the same order as building at once."""
+        for cls in (SortedArticles, SmallChunkSortedArticles):
+            with self.subTest(cls=cls.__name__):
+                index = cls()
+                for article in self.articles:
+                    index.add(article)
+                self.assertEqual(self.expected, list(index))
+                self.assertEqual(self.expected, list(cls(self.articles)))
+                self.assertEqual(self.expected[::-1], list(reversed(index)))
+                self.assertEqual(50, len(index))
+
+    def test_514_range_and_latest_queries(self):
+        """between should use a [start, end) range and latest should return the newest first."""
+        index = SmallChunkSortedArticles(self.articles)
+        dates = sorted({article.publication_date for article in self.articles})
+        for start, end in [(None, None), (dates[3], None), (None, dates[3]), (dates[2], dates[7]),
+                           (dates[7], dates[2]), (dates[0], dates[0])]:
+            with self.subTest(start=start, end=end):
+                expected = [
+                    article for article in self.expected
+                    if (start is None or article.publication_date >= start)
+                    and (end is None or article.publication_date < end)
+                ]
+                self.assertEqual(expected, list(index.between(start, end)))
+
+        self.assertEqual(self.expected[:-6:-1], index.latest(5))
+        self.assertEqual([], index.latest(0))
+        self.assertEqual(50, len(index.latest(100)))
+
+    def test_515_remove(self):
+        """remove should take out exactly the given article."""
+        index = SmallChunkSortedArticles(self.articles)
+        for article in self.articles[::2]:
+            index.remove(article)
+        self.assertEqual([article for article in self.expected if article in self.articles[1::2]], list(index))
+        self.assertNotIn(self.articles[0], index)
+        with self.assertRaises(KeyError):
+            index.remove(self.articles[0])
+
+
+class T520ComparisonTests(unittest.TestCase):
+    """Tests for the total order, equality and hashing of articles."""
+
+    def setUp(self) -> None:
+        """Create two articles published at the same time and a later one."""
+        date = datetime.datetime(2020, 7, 2)
+        self.first = make_article(publication_date=date)
+        self.second = make_article(publication_date=date)
+        self.later = make_article(publication_date=date + datetime.timedelta(seconds=1))
+
+    def test_521_total_order(self):
+        """Articles should be ordered by publication date and then by id."""
+        first, second, later = self.first, self.second, self.later
+        self.assertTrue(first < second < later)
+        self.assertTrue(later > second > first)
+        self.assertTrue(first <= first <= second and later >= later >= second)
+        self.assertFalse(second < first or first > second or later <= second or first >= second)
+
+        # bisect and heapq rely on these comparisons without any key tuples.
+        feed = [first, later]
+        bisect.insort(feed, second)
+        self.assertEqual([first, second, later], feed)
+        heap = [later, second, first]
+        heapq.heapify(heap)
+        self.assertIs(first, heapq.heappop(heap))
+
+    def test_522_equality_and_hashing(self):
+        """Articles should be equal and hash alike when their ids are equal."""
+        self.assertNotEqual(self.first, self.second)
+        self.assertEqual(2, len({self.first, self.second, self.first}))
+
+        copy = make_article(publication_date=self.later.publication_date)
+        copy.id = self.later.id
+        self.assertEqual(self.later, copy)
+        self.assertIn(copy, {self.later})
+        self.assertNotEqual(self.first, "not an article")
+        with self.assertRaises(TypeError):
+            self.first < "not an article"
+
+    def test_523_store_views(self):
+        """Store views should compare and hash like the articles they were copied from."""
+        store = ArticleStore([self.later, self.first])
+        self.assertEqual(self.later, store[0])
+        self.assertIn(store[1], {self.first})
+        self.assertTrue(store[1] < self.second < store[0])
+        self.assertEqual([self.first, self.second, self.later], sorted([store[0], self.second, store[1]]))
+
+    def test_524_merge_feeds(self):
+        """merge_feeds should merge sorted feeds lazily and optionally drop duplicates."""
+        start = datetime.datetime(2020, 7, 2)
+        dates = [start + datetime.timedelta(hours=hours) for hours in (0, 1, 1, 2, 3, 5)]
+        articles = [make_article(publication_date=date) for date in dates]
+        feeds = [articles[0::2], articles[1::3], [articles[3], articles[5]]]
+
+        self.assertEqual(
+            [articles[0], articles[1], articles[2], articles[3], articles[4], articles[4], articles[5]],
+            list(merge_feeds(*map(iter, feeds))),
+        )
+        self.assertEqual(articles, list(merge_feeds(*feeds, unique=True)))
+        self.assertEqual(
+            articles[::-1], list(merge_feeds(*(feed[::-1] for feed in feeds), reverse=True, unique=True))
+        )
@@ -0,0 +1,52 @@
+import datetime
+import unittest
+
+import parallel
+import qualifier
+
+
+class T430ParallelTests(unittest.TestCase):
+    """Tests for counting words in worker processes."""
+
+    def test_431_most_common_words_many_matches_most_common_words(self):
+        """most_common_words_many should give the same result as most_common_words per article."""
+        contents = ("'But he has nothing at all on!' at last", "Not once, but twice", "", "a b a")
+        articles = [
+            qualifier.Article(
+                title="a", author="b", content=content, publication_date=datetime.datetime(2020, 7, 2)
+            )
+            for content in contents
+        ]
+
+        expected = [article.most_common_words(3) for article in articles]
+        actual = parallel.most_common_words_many(articles, 3, workers=2)
+        self.assertEqual(
+            [list(result.items()) for result in expected],
+            [list(result.items()) for result in actual],
+        )
+
+    def test_432_count_words_in_chunks_keeps_first_occurrence_order(self):
+        """Counting a text in chunks should rank tied words by their first occurrence."""
+        text = "d c b a " * 3 + "a b c d e " * 2 + "e"
+        index = parallel.count_words(text, workers=2, chunk_size=5)
+        self.assertEqual(
+            [("d", 5), ("c", 5), ("b", 5), ("a", 5), ("e", 3)],
+            list(index.most_common(5).items()),
+        )
+
+    def test_433_article_most_common_words_with_workers(self):
+        """most_common_words with workers should give the same result as without."""
+        content = "Ünïcode and ASCII, " * 50 + "and more ASCII"
+        article = qualifier.Article(
+            title="a", author="b", content=content, publication_date=datetime.datetime(2020, 7, 2)
+        )
+        expected = article.most_common_words(4)
+
+        article.content = content
+        self.assertEqual(
+            list(expected.items()), list(article.most_common_words(4, workers=2).items())
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import datetime
+import os
+import random
+import tempfile
+import unittest
+
+from collection import ArticleCollection
+from pieces import PieceTable
+from streaming import FileArticle
+from testing import make_article
+
+
+class SmallPieceTable(PieceTable):
+    """PieceTable that joins its pieces often, so the tests cover that as well."""
+
+    max_pieces = 5
+
+
+class T550PieceTableTests(unittest.TestCase):
+    """Tests for editing content in place."""
+
+    words = ["red", "Green", "blue", "café", "naïve", "It's", "x", "8PM", "\n", "  ", ", "]
+
+    def random_text(self, rng: random.Random) -> str:
+        """Return a few random words and separators."""
+        return "".join(rng.choice(self.words) + rng.choice(" .\n") for _ in range(rng.randint(0, 4)))
+
+    def test_551_piece_table_matches_string(self):
+        """Random edits of a piece table should match the same edits of a string."""
+        rng = random.Random(2020)
+        for cls in (PieceTable, SmallPieceTable):
+            expected = "Once upon a time"
+            table = cls(expected)
+            for _ in range(300):
+                start = rng.randint(0, len(expected))
+                end = rng.randint(start, len(expected))
+                text = self.random_text(rng)
+                table.replace(start, end, text)
+                expected = expected[:start] + text + expected[end:]
+
+                self.assertEqual(len(expected), len(table))
+                low, high = sorted([rng.randint(0, len(expected)), rng.randint(0, len(expected))])
+                self.assertEqual(expected[low:high], table.slice(low, high))
+                if rng.random() < 0.3:
+                    self.assertEqual(expected, str(table))
+            self.assertEqual(expected, str(table))
+
+        with self.assertRaises(IndexError):
+            table.replace(0, len(table) + 1, "")
+
+    def test_552_edits_match_setting_the_content(self):
+        """Words, length and introductions should match an Article whose content was set, without a new index."""
+        rng = random.Random(2021)
+        article = make_article("The red fox, the green fox and the café")
+        article.most_common_words(3)
+        index = article.word_index()
+        expected = article.content
+
+        for step in range(200):
+            start = rng.randint(0, len(expected))
+            end = rng.randint(start, min(len(expected), start + 10))
+            text = self.random_text(rng)
+            operation = rng.choice(["insert", "delete", "replace", "append"])
+            if operation == "insert":
+                article.insert(start, text)
+                expected = expected[:start] + text + expected[start:]
+            elif operation == "delete":
+                article.delete(start, end)
+                expected = expected[:start] + expected[end:]
+            elif operation == "replace":
+                article.replace_range(start, end, text)
+                expected = expected[:start] + text + expected[end:]
+            else:
+                article.append(text)
+                expected += text
+
+            reference = make_article(expected)
+            with self.subTest(step=step, operation=operation):
+                self.assertEqual(expected, article.content)
+                self.assertEqual(len(expected), len(article))
+                self.assertIs(index, article.word_index())
+                self.assertEqual(reference.short_introduction(12), article.short_introduction(12))
+                n_words = rng.choice([1, 3, 100])
+                self.assertEqual(
+                    list(reference.most_common_words(n_words).items()),
+                    list(article.most_common_words(n_words).items()),
+                )
+
+    def test_553_edits_stamp_and_notify(self):
+        """Edits should stamp last_edited, bump the version and update collections."""
+        article = make_article("red green")
+        collection = ArticleCollection([article, make_article("green")])
+        collection.most_common_words(1)
+
+        article.append(" blue red")
+        self.assertIsNotNone(article.last_edited)
+        self.assertEqual(1, article.content_version)
+        self.assertEqual({"red": 2, "green": 2, "blue": 1}, collection.most_common_words(3))
+
+        article.delete(0, 4)
+        self.assertEqual({"green": 2, "blue": 1, "red": 1}, collection.most_common_words(3))
+
+    def test_554_file_article_edits(self):
+        """Editing a file-backed article should read the file into memory first."""
+        handle, path = tempfile.mkstemp()
+        self.addCleanup(os.remove, path)
+        with os.fdopen(handle, "w", encoding="utf-8") as file:
+            file.write("Ünïcödé file")
+
+        article = FileArticle("a", "b", datetime.datetime(2020, 7, 2), path)
+        article.insert(8, "big ")
+        self.assertEqual("Ünïcödé big file", article.content)
+        self.assertEqual(16, len(article))
+        self.assertEqual(["n", "c", "d", "big", "file"], list(article.most_common_words(10)))
@@ -0,0 +1,112 @@
+import datetime
+import random
+import unittest
+
+import qualifier
+from revisions import Delta, RevisionLog, diff
+
+
+class SmallChainRevisionLog(RevisionLog):
+    """RevisionLog that takes snapshots often, so the tests cover rebuilding from them."""
+
+    max_chain = 3
+
+
+class ReadCountingArticle(qualifier.Article):
+    """Article that counts how often its whole content is read."""
+
+    __slots__ = ("reads",)
+
+    @property
+    def content(self) -> str:
+        self.reads += 1
+        return qualifier.Article.content.fget(self)
+
+    @content.setter
+    def content(self, value: str) -> None:
+        qualifier.Article.content.fset(self, value)
+
+
+class T560RevisionLogTests(unittest.TestCase):
+    """Tests for the revision log of an article's content."""
+
+    def test_561_diff(self):
+        """diff should find the single range that changed."""
+        self.assertEqual(Delta(2, 3, "XY"), diff("abcde", "abXYde"))
+        self.assertEqual(Delta(0, 0, "x"), diff("aaa", "xaaa"))
+        self.assertEqual(Delta(3, 3, "a"), diff("aaa", "aaaa"))
+        self.assertEqual(Delta(1, 2, ""), diff("aba", "aa"))
+        self.assertEqual(Delta(4, 4, ""), diff("same", "same"))
+
+        rng = random.Random(2020)
+        for _ in range(200):
+            old = "".join(rng.choices("ab", k=rng.randint(0, 10_000)))
+            start = rng.randint(0, len(old))
+            end = rng.randint(start, len(old))
+            new = old[:start] + "".join(rng.choices("ab", k=rng.randint(0, 20))) + old[end:]
+            delta = diff(old, new)
+            self.assertEqual(new, old[:delta.start] + delta.text + old[delta.end:])
+            self.assertLessEqual(delta.end - delta.start, end - start)
+
+    def test_562_every_revision_can_be_retrieved(self):
+        """Every revision should come back exactly, whether set or edited in place."""
+        rng = random.Random(2021)
+        article = qualifier.Article(
+            title="a", author="b", content="Once upon a time", publication_date=datetime.datetime(2020, 7, 2)
+        )
+        for cls in (RevisionLog, SmallChainRevisionLog):
+            with self.subTest(cls=cls.__name__):
+                log = cls(article)
+                expected = [article.content]
+                for _ in range(50):
+                    if rng.random() < 0.5:
+                        article.content = article.content + rng.choice([" more", "", " ünïcödé"])
+                    else:
+                        start = rng.randint(0, len(article))
+                        article.replace_range(start, min(len(article), start + 3), rng.choice(["x", "", "yz"]))
+                    expected.append(article.content)
+
+                self.assertEqual(expected, [revision.content for revision in log])
+                self.assertEqual(article.last_edited, log[-1].last_edited)
+                self.assertEqual(expected[7], log[7].content)
+                log.detach()
+
+    def test_563_rollback(self):
+        """rollback should restore an old revision as a new revision."""
+        article = qualifier.Article(
+            title="a", author="b", content="first", publication_date=datetime.datetime(2020, 7, 2)
+        )
+        log = RevisionLog(article)
+        article.content = "second"
+        article.append(" edit")
+        log.rollback(0)
+        self.assertEqual("first", article.content)
+        self.assertEqual(["first", "second", "second edit", "first"], [revision.content for revision in log])
+        with self.assertRaises(IndexError):
+            log[4]
+
+        log.detach()
+        article.content = "untracked"
+        self.assertEqual(4, len(log))
+
+    def test_564_edits_do_not_read_the_content(self):
+        """Edits in place should be recorded as they are, without reading the whole content."""
+        article = ReadCountingArticle(
+            title="a", author="b", content="Once upon a time", publication_date=datetime.datetime(2020, 7, 2)
+        )
+        article.reads = 0
+        article.append(" there")
+        log = RevisionLog(article)
+        article.reads = 0
+        article.replace_range(0, 4, "Twice")
+        article.delete(5, 10)
+        self.assertEqual((5, 10, ""), article.last_edit)
+        self.assertEqual(0, article.reads)
+
+        article.content = "Set as a whole"
+        self.assertIsNone(article.last_edit)
+        self.assertEqual(
+            ["Once upon a time there", "Twice upon a time there", "Twice a time there", "Set as a whole"],
+            [revision.content for revision in log],
+        )
+
@@ -0,0 +1,57 @@
+import unittest
+
+from search import SearchIndex
+from testing import make_article
+
+
+class T570SearchIndexTests(unittest.TestCase):
+    """Tests for the inverted index behind full-text search."""
+
+    def setUp(self) -> None:
+        """Index three articles."""
+        self.fox = make_article("The quick brown fox. The lazy dog!")
+        self.dog = make_article("A dog, a dog and a brown café dog.")
+        self.cat = make_article("The cat sat on the quick mat")
+        self.index = SearchIndex([self.fox, self.dog, self.cat])
+
+    def ids(self, hits: list) -> list:
+        """Return the ids of the articles of search hits."""
+        return [hit.article.id for hit in hits]
+
+    def test_571_postings_use_the_tokenizer(self):
+        """Words should be found with the rules of most_common_words, with positions."""
+        self.assertEqual({self.fox.id: [0, 4], self.cat.id: [0, 4]},
+                         {id_: list(positions) for id_, positions in self.index.postings("the").items()})
+        self.assertIn(self.dog.id, self.index.postings("caf"))
+        self.assertEqual({}, self.index.postings("The"))
+
+    def test_572_and_or_queries(self):
+        """all_of should need every word and any_of some word, ranked by term frequency."""
+        self.assertEqual([self.fox.id], self.ids(self.index.all_of("brown THE")))
+        self.assertEqual([], self.index.all_of("brown missing"))
+        self.assertEqual([self.dog.id, self.fox.id, self.cat.id], self.ids(self.index.any_of("dog quick")))
+        self.assertEqual([(self.dog, 3)], self.index.any_of("dog quick", n_results=1))
+        self.assertEqual([], self.index.any_of("!!"))
+
+    def test_573_phrase_queries(self):
+        """phrase should only match words that occur one after the other."""
+        self.assertEqual([(self.fox, 1)], self.index.phrase("the Quick, brown"))
+        self.assertEqual([(self.dog, 2)], self.index.phrase("a dog"))
+        self.assertEqual([], self.index.phrase("brown dog"))
+        self.assertEqual([], self.index.phrase("quick unknown"))
+        self.assertEqual([self.fox.id, self.cat.id], self.ids(self.index.phrase("the")))
+
+    def test_574_updates_on_content_changes(self):
+        """Setting or editing content and removing articles should update the postings."""
+        self.cat.content = "A cat and a dog"
+        self.assertEqual([self.dog.id, self.cat.id], self.ids(self.index.phrase("a dog")))
+        self.assertEqual([], self.index.all_of("mat"))
+
+        self.fox.append(" Another quick fox")
+        self.assertEqual([(self.fox, 2)], self.index.all_of("fox"))
+
+        self.index.remove(self.dog)
+        self.assertEqual([self.cat.id], self.ids(self.index.phrase("a dog")))
+        self.dog.content = "cat"
+        self.assertEqual([self.cat.id], self.ids(self.index.all_of("cat")))
+        self.assertNotIn("caf", self.index._postings)
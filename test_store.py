@@ -0,0 +1,72 @@
+import datetime
+import unittest
+
+import qualifier
+from store import ArticleStore
+
+
+class T500ArticleStoreTests(unittest.TestCase):
+    """Tests for the columnar ArticleStore and its views."""
+
+    def setUp(self) -> None:
+        """Create articles and copy them into a store."""
+        self.articles = [
+            qualifier.Article(
+                title="Ünïcödé", author="grimm", content="Ünïcödé café, the café!\nOf the baker.",
+                publication_date=datetime.datetime(1857, 1, 1, 12, 30, 15, 250),
+            ),
+            qualifier.Article(
+                title="Fairy tale", author="andersen", content="Once upon a time",
+                publication_date=datetime.datetime(1837, 4, 7),
+            ),
+            qualifier.Article(
+                title="Another", author="grimm", content="",
+                publication_date=datetime.datetime(2020, 7, 2),
+            ),
+        ]
+        self.articles[1].content = "Once upon a time, there was a time"
+        self.store = ArticleStore(self.articles)
+
+    def test_501_views_match_articles(self):
+        """Views should have the same attributes and representation as the articles they copy."""
+        self.assertEqual(3, len(self.store))
+        for article, view in zip(self.articles, self.store):
+            with self.subTest(title=article.title):
+                for name in ("id", "title", "author", "publication_date", "content", "last_edited"):
+                    self.assertEqual(getattr(article, name), getattr(view, name))
+                self.assertEqual(repr(article), repr(view))
+                self.assertEqual(len(article), len(view))
+
+    def test_502_text_methods_match_articles(self):
+        """short_introduction and most_common_words should give the same results as Article."""
+        for article, view in zip(self.articles, self.store):
+            for n in (0, 1, 5, 8, 20, 100):
+                with self.subTest(title=article.title, n=n):
+                    self.assertEqual(article.short_introduction(n), view.short_introduction(n))
+                    self.assertEqual(article.most_common_words(n), view.most_common_words(n))
+
+    def test_503_sorting(self):
+        """Views should sort by publication date, also mixed with articles."""
+        expected = [self.articles[1].id, self.articles[0].id, self.articles[2].id]
+        self.assertEqual(expected, [view.id for view in sorted(self.store)])
+        self.assertEqual(expected, [view.id for view in self.store.by_publication_date()])
+
+        mixed = sorted([self.store[0], self.articles[1], self.store[2]])
+        self.assertEqual(expected, [article.id for article in mixed])
+
+    def test_504_create_and_indexing(self):
+        """create should give the next Article id and intern authors."""
+        view = self.store.create("New", "grimm", datetime.datetime(2021, 1, 1), "new content")
+        self.assertEqual(self.articles[-1].id + 1, view.id)
+        self.assertEqual(view.id, self.store[-1].id)
+        self.assertEqual("grimm", self.store[-1].author)
+        self.assertIn("authors=2", repr(self.store))
+        with self.assertRaises(IndexError):
+            self.store[4]
+
+    def test_505_aware_dates_are_rejected(self):
+        """Timezone-aware dates can't be stored and leave the store untouched."""
+        date = datetime.datetime(2020, 7, 2, tzinfo=datetime.timezone.utc)
+        with self.assertRaises(ValueError):
+            self.store.create("a", "b", date, "c")
+        self.assertEqual(3, len(self.store))
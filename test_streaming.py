@@ -0,0 +1,54 @@
+import datetime
+import os
+import tempfile
+import unittest
+
+import qualifier
+from streaming import FileArticle
+
+
+class T440FileArticleTests(unittest.TestCase):
+    """Tests for articles whose content is read from a file."""
+
+    content = "Ünïcödé titles, über alles!\nThe tale of the café and the naïve baker. " * 20
+
+    def setUp(self) -> None:
+        """Write the content to a temporary file and create a FileArticle for it."""
+        handle, self.path = tempfile.mkstemp()
+        with os.fdopen(handle, "w", encoding="utf-8") as file:
+            file.write(self.content)
+
+        kwargs = {"title": "a", "author": "b", "publication_date": datetime.datetime(2020, 7, 2)}
+        self.article = FileArticle(**kwargs, path=self.path)
+        self.article.chunk_size = 7
+        self.reference = qualifier.Article(**kwargs, content=self.content)
+
+    def tearDown(self) -> None:
+        """Remove the temporary file."""
+        os.remove(self.path)
+
+    def test_441_len_counts_characters(self):
+        """len should count characters, not bytes."""
+        self.assertEqual(len(self.content), len(self.article))
+
+    def test_442_streamed_methods_match_in_memory_article(self):
+        """short_introduction and most_common_words should match an in-memory Article."""
+        self.assertEqual(self.content, self.article.content)
+        self.assertEqual(self.reference.most_common_words(5), self.article.most_common_words(5))
+        for n in (1, 7, 15, 40):
+            with self.subTest(n=n):
+                expected = self.content[:n + 1]
+                expected = expected[:max(expected.rfind(" "), expected.rfind("\n"))]
+                self.assertEqual(expected, self.article.short_introduction(n))
+
+    def test_443_setting_content_stops_using_the_file(self):
+        """Setting the content should use the new content and stamp last_edited."""
+        self.article.content = "new new content"
+        self.assertIsNone(self.article.path)
+        self.assertIsNotNone(self.article.last_edited)
+        self.assertEqual(15, len(self.article))
+        self.assertEqual({"new": 2}, self.article.most_common_words(1))
+
+
+if __name__ == "__main__":
+    unittest.main()
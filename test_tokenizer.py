@@ -0,0 +1,107 @@
+import datetime
+import unittest
+from unittest import mock
+
+import qualifier
+import tokenizer
+from wordfreq import WordFrequencyIndex
+
+
+class T410TokenizerTests(unittest.TestCase):
+    """Tests for the shared word tokenizer."""
+
+    def test_411_only_ascii_letters_form_words(self):
+        """Digits, punctuation and non-ASCII letters should all be word boundaries."""
+        self.assertEqual(["it", "s", "pm"], list(tokenizer.iter_words("It's 8PM!")))
+        self.assertEqual(["caf", "na", "ve"], list(tokenizer.iter_words("Café naïve")))
+        self.assertEqual(["snake", "case"], list(tokenizer.iter_words("snake_case")))
+
+    def test_412_chunks_never_split_words(self):
+        """Tokenizing in small chunks should give the same words as a single pass."""
+        texts = (
+            "Round about, round about,\nLo and behold!",
+            "Abracadabra abracadabra",
+            "Ünïcödé chunks, with ÄSCII ones in between",
+        )
+        for text in texts:
+            with self.subTest(text=text):
+                expected = list(tokenizer.iter_words(text))
+                for chunk_size in (1, 2, 5):
+                    self.assertEqual(expected, list(tokenizer.iter_words(text, chunk_size)))
+                    encoded = text.encode("utf-8")
+                    self.assertEqual(expected, list(tokenizer.iter_words(encoded, chunk_size)))
+                    self.assertEqual(expected, list(tokenizer.iter_words(memoryview(encoded), chunk_size)))
+
+
+    def test_413_tokenizer_options(self):
+        """Stop words should be skipped, Unicode letters folded and plurals stemmed."""
+        text = "The Café's stories, and THE classes of buses. Straße naïve"
+        self.assertEqual(list(tokenizer.iter_words(text)), list(tokenizer.Tokenizer().words(text)))
+        self.assertEqual(
+            ["caf", "s", "stories", "classes", "buses", "stra", "e", "na", "ve"],
+            list(tokenizer.Tokenizer(stop_words=["the", "AND", "of"]).words(text)),
+        )
+        self.assertEqual(
+            ["the", "cafe", "s", "stories", "and", "the", "classes", "of", "buses", "strasse", "naive"],
+            list(tokenizer.Tokenizer(fold_unicode=True).words(text)),
+        )
+        self.assertEqual(
+            ["cafe", "s", "story", "classe", "buse", "strasse", "naive"],
+            list(tokenizer.Tokenizer(tokenizer.ENGLISH_STOP_WORDS, fold_unicode=True, stem=True).words(text)),
+        )
+        stemming = tokenizer.Tokenizer(stem=True)
+        self.assertEqual(["this", "bus", "class", "has", "cat"], list(stemming.words("this bus class has cats")))
+        folding = tokenizer.Tokenizer(stop_words=["CÖDÉ"], fold_unicode=True)
+        self.assertEqual(["uni", "uni"], list(folding.words("Ünï, code, unï")))
+
+    def test_414_reindex_matches_counting(self):
+        """Deriving an index from the plain counts should give the same ranking as counting again."""
+        text = "Stories and stories, the story of the cats and a cat, the end"
+        all_options = (
+            {},
+            {"stop_words": tokenizer.ENGLISH_STOP_WORDS},
+            {"stem": True},
+            {"stop_words": ["the"], "stem": True},
+        )
+        for options in all_options:
+            with self.subTest(options=options):
+                rules = tokenizer.Tokenizer(**options)
+                derived = rules.reindex(WordFrequencyIndex.from_words(tokenizer.iter_words(text)))
+                counted = WordFrequencyIndex.from_words(rules.words(text))
+                self.assertEqual(list(counted.most_common(20).items()), list(derived.most_common(20).items()))
+
+        with self.assertRaises(ValueError):
+            tokenizer.Tokenizer(fold_unicode=True).reindex(WordFrequencyIndex())
+
+    def test_415_article_most_common_words(self):
+        """Article.most_common_words should count with a tokenizer and follow content changes."""
+        article = qualifier.Article(
+            title="a",
+            author="b",
+            content="The cats and the café, a cat café",
+            publication_date=datetime.datetime(2020, 7, 2),
+        )
+        rules = tokenizer.Tokenizer(tokenizer.ENGLISH_STOP_WORDS, stem=True)
+        folding = tokenizer.Tokenizer(tokenizer.ENGLISH_STOP_WORDS, fold_unicode=True, stem=True)
+        self.assertEqual({"the": 2, "caf": 2}, article.most_common_words(2))
+        self.assertEqual({"cat": 2, "caf": 2}, article.most_common_words(2, rules=rules))
+        self.assertEqual({"cat": 2, "cafe": 2}, article.most_common_words(2, rules=folding))
+        self.assertIs(article.word_index(rules=rules), article.word_index(rules=rules))
+
+        article.insert(0, "Cats! ")
+        self.assertEqual({"cat": 3, "caf": 2}, article.most_common_words(2, rules=rules))
+        article.content = "dogs and a dog"
+        self.assertEqual({"dog": 2}, article.most_common_words(2, rules=folding))
+        self.assertEqual({"dogs": 1, "and": 1}, article.most_common_words(2))
+
+    def test_416_normalized_words_are_bounded(self):
+        """The memo of normalized words should start over instead of growing past its maximum size."""
+        rules = tokenizer.Tokenizer(["the"], stem=True)
+        text = "the cats and the dogs saw birds and more cats"
+        with mock.patch.object(tokenizer._Normalized, "max_size", 3):
+            self.assertEqual(["cat", "and", "dog", "saw", "bird", "and", "more", "cat"], list(rules.words(text)))
+            self.assertLessEqual(len(rules._normalized), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
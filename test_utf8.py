@@ -0,0 +1,59 @@
+import unittest
+
+import tokenizer
+import utf8
+from testing import make_article
+
+
+class T600EncodedContentTests(unittest.TestCase):
+    """Tests for articles whose content is UTF-8 encoded bytes."""
+
+    text = "Ünïcödé café, KELVIN K and 日本語.\nRound about, round about 8PM!"
+
+    def test_601_helpers(self):
+        """Characters should be counted and decoded without decoding everything."""
+        data = self.text.encode("utf-8")
+        for buffer in (data, bytearray(data), memoryview(data)):
+            with self.subTest(buffer=type(buffer).__name__):
+                self.assertEqual(len(self.text), utf8.character_count(buffer))
+                self.assertEqual(len(self.text), utf8.character_count(buffer, chunk_size=3))
+                self.assertEqual(self.text[:9], utf8.decode_prefix(buffer, 9))
+        self.assertEqual(self.text, utf8.decode_prefix(data, 1000))
+        for n_characters in (0, -2, -1000):
+            self.assertEqual("", utf8.decode_prefix(data, n_characters))
+        self.assertEqual(0, utf8.character_count(b""))
+
+    def test_602_article_with_encoded_content(self):
+        """An Article should treat encoded content like the text it decodes to."""
+        expected = make_article(self.text)
+        data = self.text.encode("utf-8")
+        for content in (data, bytearray(data), memoryview(data)):
+            with self.subTest(content=type(content).__name__):
+                article = make_article(content)
+                self.assertEqual(self.text, article.content)
+                self.assertEqual(len(self.text), len(article))
+                for n_characters in (-5, 0, 7, 13, 30, 1000):
+                    self.assertEqual(
+                        expected.short_introduction(n_characters), article.short_introduction(n_characters)
+                    )
+                self.assertEqual(
+                    list(expected.most_common_words(10).items()), list(article.most_common_words(10).items())
+                )
+
+    def test_603_editing_and_setting_encoded_content(self):
+        """Edits should work on encoded content, and setting bytes should replace the content."""
+        article = make_article(b"Round about, round about")
+        article.append(" café")
+        self.assertEqual("Round about, round about café", article.content)
+        self.assertEqual({"round": 2, "about": 2, "caf": 1}, article.most_common_words(5))
+
+        article.content = "Ünï".encode("utf-8")
+        self.assertEqual(3, len(article))
+
+        # The range is checked against the 3 characters, not the 5 bytes.
+        with self.assertRaises(IndexError):
+            article.replace_range(4, 5, "x")
+        self.assertIs(bytes, type(article._content))
+        self.assertEqual({"n": 1}, article.most_common_words(5))
+        folding = tokenizer.Tokenizer(fold_unicode=True)
+        self.assertEqual({"uni": 1}, article.most_common_words(5, rules=folding))
@@ -0,0 +1,52 @@
+import datetime
+import unittest
+
+import qualifier
+from wordfreq import WordFrequencyIndex
+
+
+class T400WordFrequencyIndexTests(unittest.TestCase):
+    """Tests for the word-frequency index behind most_common_words."""
+
+    def test_401_ties_are_broken_by_first_occurrence(self):
+        """Words with the same count should be ordered by their first occurrence."""
+        index = WordFrequencyIndex.from_words("b a c a b d".split())
+        self.assertEqual({"b": 2, "a": 2, "c": 1}, index.most_common(3))
+        self.assertEqual(["b", "a", "c"], list(index.most_common(3)))
+
+    def test_402_update_keeps_earlier_first_occurrences(self):
+        """Updating the index should count new words after the existing ones."""
+        index = WordFrequencyIndex.from_words(["x", "y"])
+        index.update(["z", "y", "z", "x"])
+        self.assertEqual(["x", "y", "z"], list(index.most_common(3)))
+        self.assertEqual(6, index.total())
+
+    def test_403_non_positive_n_words(self):
+        """Asking for zero or fewer words should return an empty dictionary."""
+        index = WordFrequencyIndex.from_words(["a"])
+        self.assertEqual({}, index.most_common(0))
+        self.assertEqual({}, index.most_common(-1))
+
+    def test_404_larger_n_words_after_smaller_n_words(self):
+        """A call with a larger n_words should not be limited by an earlier, smaller call."""
+        words = "d c c b b b a a a a e".split()
+        index = WordFrequencyIndex.from_words(words)
+        self.assertEqual({"a": 4}, index.most_common(1))
+        self.assertEqual({"a": 4, "b": 3, "c": 2, "d": 1, "e": 1}, index.most_common(10))
+        self.assertEqual({"a": 4, "b": 3}, index.most_common(2))
+
+    def test_405_content_setter_invalidates_the_index(self):
+        """Setting new content should make most_common_words count the new content."""
+        article = qualifier.Article(
+            title="a", author="b", content="one one two",
+            publication_date=datetime.datetime(2020, 7, 2),
+        )
+        self.assertEqual({"one": 2}, article.most_common_words(1))
+        self.assertIsNotNone(article._word_index)
+
+        article.content = "three two two"
+        self.assertEqual({"two": 2, "three": 1}, article.most_common_words(2))
+
+
+if __name__ == "__main__":
+    unittest.main()
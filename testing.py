@@ -0,0 +1,18 @@
+"""
+Helpers shared by the test modules.
+"""
+from __future__ import annotations
+
+import datetime
+import typing
+
+import qualifier
+
+
+def make_article(
+    content: typing.Union[str, bytes, bytearray, memoryview] = "c",
+    author: str = "b",
+    publication_date: datetime.datetime = datetime.datetime(2020, 7, 2),
+) -> qualifier.Article:
+    """Create an Article with the given (possibly encoded) content, author and publication date."""
+    return qualifier.Article(title="a", author=author, content=content, publication_date=publication_date)
@@ -0,0 +1,300 @@
+"""
+Word tokenization shared by the `Article` classes.
+Words are runs of ASCII letters in the lowercased text; every other character
+is a word boundary. This matches the rules of the qualifier's
+`most_common_words`: "It's 8PM!" contains the words "it", "s" and "pm".
+Instead of checking characters one by one in Python, we let C do the work:
+ASCII text goes through a precomputed `str.translate` table that lowercases
+letters and turns everything else into a space, after which `str.split` finds
+the words. Text with non-ASCII characters is lowercased and scanned with a
+compiled regex instead, as lowercasing some non-ASCII characters produces
+ASCII letters (for instance, the Kelvin sign becomes "k").
+Large texts are processed in chunks that are cut at an ASCII non-letter, so we
+never hold more than one cleaned chunk in memory besides its words.
+A `Tokenizer` changes these rules for `most_common_words`: it can skip stop
+words, fold Unicode letters and strip simple plural endings.
+"""
+from __future__ import annotations
+
+import itertools
+import re
+import string
+import typing
+import unicodedata
+
+from wordfreq import WordFrequencyIndex
+
+# The default number of characters lowercased and scanned in one go. Larger
+# chunks aren't faster, and smaller ones let callers that stop reading words
+# early (such as `WordFrequencyIndex.rescan_order`) skip more of the text.
+CHUNK_SIZE = 1 << 16
+
+_WORD = re.compile(r"[a-z]+")
+
+# Translation tables for ASCII text and for UTF-8 bytes: uppercase letters are
+# lowercased, lowercase letters are kept, and all other characters (every byte
+# of a non-ASCII character, in the case of bytes) become a space.
+_ASCII_NON_LETTERS = "".join(
+    char for char in map(chr, range(128)) if char not in string.ascii_letters
+)
+_ASCII_TABLE = str.maketrans(
+    string.ascii_uppercase + _ASCII_NON_LETTERS,
+    string.ascii_lowercase + " " * len(_ASCII_NON_LETTERS),
+)
+_ASCII_BYTES_TABLE = bytes.maketrans(
+    (string.ascii_uppercase + _ASCII_NON_LETTERS).encode("ascii") + bytes(range(0x80, 0x100)),
+    (string.ascii_lowercase + " " * len(_ASCII_NON_LETTERS)).encode("ascii") + b" " * 0x80,
+)
+
+# The only non-ASCII characters that lowercase to ASCII letters ("İ" becomes
+# "i" plus a combining dot, the Kelvin sign becomes "k"), UTF-8 encoded.
+_LOWERCASE_TO_ASCII = ("\u0130".encode("utf-8"), "\u212a".encode("utf-8"))
+
+# Any ASCII character that isn't a letter. These are safe places to cut the
+# text: lowercasing never turns them into a letter, so no word can span them.
+# In UTF-8 encoded text, these bytes never occur inside a multi-byte sequence,
+# so they are safe places to cut the encoded text as well.
+_ASCII_NON_LETTER = re.compile(r"[\x00-\x40\x5b-\x60\x7b-\x7f]")
+_ASCII_NON_LETTER_BYTES = re.compile(rb"[\x00-\x40\x5b-\x60\x7b-\x7f]")
+_LAST_ASCII_NON_LETTER = re.compile(r".*[\x00-\x40\x5b-\x60\x7b-\x7f]", re.DOTALL)
+
+
+def iter_words(
+    text: typing.Union[str, bytes, bytearray, memoryview],
+    chunk_size: int = CHUNK_SIZE,
+) -> typing.Iterator[str]:
+    """
+    Return an iterator over the lowercase words of `text` in order of occurrence.
+    `text` may also be UTF-8 encoded, in which case ASCII chunks are cleaned
+    with `bytes.translate` and never decoded as a whole.
+    This is a plain function rather than a generator: `itertools.chain` hands
+    out the words of each chunk without resuming a Python frame per word.
+    """
+    if text.__class__ is not str:
+        if len(text) <= chunk_size:
+            return iter(_encoded_chunk_words(bytes(text)))
+        chunks = (bytes(text[start:end]) for start, end in chunk_bounds(text, chunk_size))
+        return itertools.chain.from_iterable(map(_encoded_chunk_words, chunks))
+
+    if len(text) <= chunk_size:
+        return iter(_chunk_words(text))
+
+    chunks = (text[start:end] for start, end in chunk_bounds(text, chunk_size))
+    return itertools.chain.from_iterable(map(_chunk_words, chunks))
+
+
+def _chunk_words(chunk: str) -> typing.List[str]:
+    """Return the lowercase words of a single chunk of text."""
+    if chunk.isascii():
+        return chunk.translate(_ASCII_TABLE).split()
+    return _WORD.findall(chunk.lower())
+
+
+def _encoded_chunk_words(chunk: bytes) -> typing.List[str]:
+    """
+    Return the lowercase words of a single chunk of UTF-8 encoded text.
+    The translate table does the lowercasing and cleaning in one pass over
+    the bytes, and only the cleaned chunk is decoded, which is a plain copy
+    as it's all ASCII by then. Non-ASCII characters are word boundaries, so
+    turning each of their bytes into a space gives the same words, except
+    for the two characters that lowercase to ASCII letters. Chunks with
+    those are decoded and tokenized as text instead.
+    """
+    if chunk.isascii() or not any(character in chunk for character in _LOWERCASE_TO_ASCII):
+        return chunk.translate(_ASCII_BYTES_TABLE).decode("ascii").split()
+    return _chunk_words(chunk.decode("utf-8"))
+
+
+def chunk_bounds(
+    text: typing.Union[str, bytes, bytearray, memoryview],
+    chunk_size: int,
+) -> typing.Iterator[typing.Tuple[int, int]]:
+    """
+    Yield `(start, end)` slices of roughly `chunk_size` that never split a word.
+    `text` may also be UTF-8 encoded, in which case the slices are byte offsets
+    that never split a word or a multi-byte character.
+    """
+    non_letter = _ASCII_NON_LETTER if isinstance(text, str) else _ASCII_NON_LETTER_BYTES
+    length = len(text)
+    start = 0
+    while start < length:
+        end = start + chunk_size
+        if end >= length:
+            yield start, length
+            return
+
+        # Move the end of the chunk forward to the next safe boundary. If there
+        # is none, the remainder of the text is one big chunk.
+        boundary = non_letter.search(text, end)
+        end = boundary.start() if boundary else length
+
+        yield start, end
+        start = end
+
+
+def first_boundary(text: str, start: int = 0) -> int:
+    """Return the index of the first ASCII non-letter in `text` at or after `start`, or -1."""
+    boundary = _ASCII_NON_LETTER.search(text, start)
+    return boundary.start() if boundary else -1
+
+
+def last_boundary(text: str) -> int:
+    """Return the index of the last ASCII non-letter in `text`, or -1."""
+    boundary = _LAST_ASCII_NON_LETTER.match(text)
+    return boundary.end() - 1 if boundary else -1
+
+
+
+# A run of Unicode letters (word characters that aren't digits or "_"), which
+# may contain accents that were split off from their letter.
+_UNICODE_WORD = re.compile(r"[^\W\d_]+(?:[\u0300-\u036f]+[^\W\d_]*)*")
+
+# Translate table that deletes the combining diacritical marks (accents).
+_ACCENTS = dict.fromkeys(range(0x300, 0x370))
+
+# Words that are too common to say anything about an article.
+ENGLISH_STOP_WORDS = frozenset("""
+    a about after all also an and any are as at be because been but by can
+    could did do does for from had has have he her him his how i if in into
+    is it its just me more my no not of on or our out over she so some than
+    that the their them then there these they this to up us was we were what
+    when which who will with would you your
+""".split())
+
+
+def _fold(text: str) -> str:
+    """Casefold `text` and split accents off the letters they're on."""
+    return unicodedata.normalize("NFKD", text.casefold())
+
+
+def _stem(word: str) -> str:
+    """
+    Strip the plural ending of `word`, following Harman's "S" stemmer.
+    "ies" becomes "y", "es" becomes "e" and a final "s" is dropped, except
+    after "u", "s" or "i" ("bus", "class", "this"). Words of three letters or
+    fewer are left alone, so "has" and "was" stay the same.
+    """
+    if len(word) <= 3 or word[-1] != "s":
+        return word
+    if word.endswith("ies") and not word.endswith(("eies", "aies")):
+        return word[:-3] + "y"
+    if word.endswith("es") and not word.endswith(("aes", "ees", "oes")):
+        return word[:-1]
+    if word.endswith(("us", "ss", "is")):
+        return word
+    return word[:-1]
+
+
+class _Normalized(dict):
+    """
+    What the words seen so far become; a missing word is normalized and remembered.
+    Texts keep bringing new words (names, typos, numbers spelled out), so
+    once `max_size` words are remembered, they're all forgotten and the memo
+    starts over. Common words are back after a few lookups, and the memo
+    never takes more than a few megabytes.
+    """
+
+    max_size = 100_000
+
+    def __init__(self, normalize: typing.Callable[[str], typing.Optional[str]]) -> None:
+        super().__init__()
+        self.normalize = normalize
+
+    def __missing__(self, word: str) -> typing.Optional[str]:
+        if len(self) >= self.max_size:
+            self.clear()
+        normalized = self[word] = self.normalize(word)
+        return normalized
+
+
+class Tokenizer:
+    """
+    Configurable rules for finding the words of a text.
+    Without options, a tokenizer finds the same words as `iter_words`:
+    - `stop_words` are skipped. They're compared after lowercasing (and
+      folding), but before stemming.
+    - `fold_unicode` makes words runs of Unicode letters instead of ASCII
+      letters. Text is casefolded and accents are removed, so "Café" is the
+      word "cafe" and "Straße" is "strasse".
+    - `stem` strips plural endings (see `_stem`), so "stories" is "story".
+    The configuration is compiled once: the stop words into a frozenset, and
+    the word rules into a regex. What each distinct word becomes (without
+    accents, stemmed, or `None` for a stop word) is worked out once and then
+    remembered (up to `_Normalized.max_size` words, after which the memo is
+    cleared), so the words of a text go through a chain of C iterators
+    (`map` over a dict lookup, then `filter`) without calling back into
+    Python for every word. Removing accents this way is much faster than
+    `str.translate` over the whole text, which looks up every character.
+    Skipping and stemming only depend on the word itself, so without
+    `fold_unicode`, the counts of a tokenizer can be derived from the counts
+    of `iter_words` (see `reindex`) without reading the text again.
+    """
+
+    __slots__ = ("stop_words", "fold_unicode", "stem", "_normalized")
+
+    def __init__(
+        self,
+        stop_words: typing.Iterable[str] = (),
+        fold_unicode: bool = False,
+        stem: bool = False,
+    ) -> None:
+        self.fold_unicode = fold_unicode
+        self.stem = stem
+        if fold_unicode:
+            self.stop_words = frozenset(_fold(word).translate(_ACCENTS) for word in stop_words)
+        else:
+            self.stop_words = frozenset(map(str.lower, stop_words))
+        self._normalized = _Normalized(self.normalize)
+
+    def __repr__(self) -> str:
+        """Return the 'official' string representation of the tokenizer."""
+        cls_name = self.__class__.__name__
+        return (
+            f"{cls_name}(stop_words=<{len(self.stop_words)} words>, "
+            f"fold_unicode={self.fold_unicode!r}, stem={self.stem!r})"
+        )
+
+    def __reduce__(self) -> typing.Tuple[type, tuple]:
+        """Pickle the configuration only, not the words normalized so far."""
+        return self.__class__, (self.stop_words, self.fold_unicode, self.stem)
+
+    def words(
+        self,
+        text: typing.Union[str, bytes, bytearray, memoryview],
+        chunk_size: int = CHUNK_SIZE,
+    ) -> typing.Iterator[str]:
+        """Return an iterator over the words of `text`, which may be UTF-8 encoded, in order of occurrence."""
+        if not self.fold_unicode:
+            words = iter_words(text, chunk_size)
+            if not self.stop_words and not self.stem:
+                return words
+        elif text.__class__ is str and len(text) <= chunk_size:
+            words = iter(self._chunk_words(text))
+        else:
+            chunks = (text[start:end] for start, end in chunk_bounds(text, chunk_size))
+            if text.__class__ is not str:
+                chunks = (str(chunk, "utf-8") for chunk in chunks)
+            words = itertools.chain.from_iterable(map(self._chunk_words, chunks))
+        return filter(None, map(self._normalized.__getitem__, words))
+
+    def normalize(self, word: str) -> typing.Optional[str]:
+        """Return what a word becomes under these rules: without accents and stemmed, or `None` for a stop word."""
+        if self.fold_unicode and not word.isascii():
+            word = word.translate(_ACCENTS)
+        if word in self.stop_words:
+            return None
+        return _stem(word) if self.stem else word
+
+    def reindex(self, index: WordFrequencyIndex) -> WordFrequencyIndex:
+        """Return the index of a text with these rules, given its index with the rules of `iter_words`."""
+        if self.fold_unicode:
+            raise ValueError("a tokenizer that folds Unicode letters has to read the text itself")
+        if not self.stop_words and not self.stem:
+            return index
+        return index.mapped(self._normalized.__getitem__)
+
+    def _chunk_words(self, chunk: str) -> typing.List[str]:
+        """Return the words of a single chunk of text, which may still have accents."""
+        if chunk.isascii():
+            return chunk.translate(_ASCII_TABLE).split()
+        return _UNICODE_WORD.findall(_fold(chunk))
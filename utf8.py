@@ -0,0 +1,54 @@
+"""
+Helpers for content that is kept as UTF-8 encoded bytes.
+Articles can hold their content as `bytes`, a `bytearray`, a `memoryview` or
+a memory-mapped file (see `streaming`) instead of a `str`. Decoding all of it
+just to count its characters or to look at its first few characters would
+make a full copy, so these helpers work on the bytes directly.
+"""
+from __future__ import annotations
+
+import codecs
+import mmap
+import typing
+
+import tokenizer
+
+# The bytes-like types that `Article` accepts as content.
+BYTES_TYPES = (bytes, bytearray, memoryview)
+
+Buffer = typing.Union[bytes, bytearray, memoryview, mmap.mmap]
+
+# UTF-8 continuation bytes: every byte that isn't one of these starts a character.
+CONTINUATION_BYTES = bytes(range(0x80, 0xC0))
+
+
+def character_count(data: Buffer, chunk_size: int = tokenizer.CHUNK_SIZE) -> int:
+    """
+    Return the number of characters that `data` decodes to.
+    Every character starts with exactly one byte that isn't a continuation
+    byte, so we count those. ASCII text has no continuation bytes at all,
+    which `bytes.isascii` checks without copying. Otherwise, we delete the
+    continuation bytes with `bytes.translate`, one chunk at a time so the copy
+    stays small.
+    """
+    if isinstance(data, (bytes, bytearray)) and data.isascii():
+        return len(data)
+
+    length = 0
+    for start in range(0, len(data), chunk_size):
+        chunk = bytes(data[start:start + chunk_size])
+        length += len(chunk) if chunk.isascii() else len(chunk.translate(None, CONTINUATION_BYTES))
+    return length
+
+
+def decode_prefix(data: Buffer, n_characters: int) -> str:
+    """
+    Return the first `n_characters` characters of `data`, or all of them if there are fewer.
+    A character takes at most four bytes in UTF-8, so we only decode the first
+    `4 * n_characters` bytes. The incremental decoder holds back a character
+    that got cut off at the end. A count of zero or less gives an empty string.
+    """
+    if n_characters <= 0:
+        return ""
+    prefix = bytes(data[:4 * n_characters])
+    return codecs.getincrementaldecoder("utf-8")().decode(prefix)[:n_characters]
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import collections
+import heapq
+import typing
+
+
+class WordFrequencyIndex:
+    """
+    Word counts of a text plus the order in which each word first occurred.
+    The index is what `Article.most_common_words` answers from. Building it
+    costs one pass over the words of an article; after that, asking for the
+    `n` most common words only has to look at the ranking, not the content.
+    Ties between words with the same count are broken by first occurrence:
+    the word that appeared first in the text ranks higher. That's why we keep
+    `first_seen`, which maps each word to the ordinal of its first occurrence
+    among the distinct words of the text. The `counts` dict is always kept in
+    that same order, so iterating over it visits words by first occurrence.
+    After an edit in the middle of a text, the first occurrences of its words
+    can move in ways the counts alone don't tell us. `rescan_order` makes the
+    index look them up in the text again when they're needed for a ranking.
+    """
+
+    def __init__(self) -> None:
+        self.counts: typing.Dict[str, int] = {}
+        self.first_seen: typing.Dict[str, int] = {}
+
+        # The ordinal the next new word gets. Words that are subtracted keep
+        # their ordinal, so this can be larger than the number of words.
+        self._next_ordinal = 0
+
+        # The top of the ranking: words sorted by descending count and then by
+        # first occurrence. It's computed lazily for the largest `n_words` asked
+        # for so far and thrown away whenever the counts change.
+        self._ranking: typing.Optional[typing.List[str]] = None
+
+        # Returns the words of the text in order when `first_seen` (and the
+        # order of `counts`) can no longer be trusted, see `rescan_order`.
+        self._words_in_order: typing.Optional[typing.Callable[[], typing.Iterable[str]]] = None
+
+    @classmethod
+    def from_words(cls, words: typing.Iterable[str]) -> WordFrequencyIndex:
+        """Build an index from an iterable of (already normalized) words."""
+        index = cls()
+        index.update(words)
+        return index
+
+    def copy(self) -> WordFrequencyIndex:
+        """Return a copy of the index that can be changed independently."""
+        index = self.__class__()
+        index.counts = self.counts.copy()
+        index.first_seen = self.first_seen.copy()
+        index._next_ordinal = self._next_ordinal
+        index._ranking = self._ranking
+        index._words_in_order = self._words_in_order
+        return index
+
+    def mapped(self, normalize: typing.Callable[[str], typing.Optional[str]]) -> WordFrequencyIndex:
+        """
+        Return the index of the text with every word replaced by `normalize(word)`.
+        Words for which `normalize` returns `None` are dropped. Words that map
+        to the same word have their counts added up, and the new word first
+        occurs where the first of them did. Each distinct word is normalized
+        once, so this costs a pass over the vocabulary, not over the text.
+        """
+        index = self.__class__()
+        counts = index.counts
+        for word, count in self.counts.items():
+            word = normalize(word)
+            if word is not None:
+                counts[word] = counts.get(word, 0) + count
+
+        # `counts` follows the order of our own counts, which is the order of
+        # first occurrence unless that has to be looked up in the text again.
+        index.first_seen = {word: ordinal for ordinal, word in enumerate(counts)}
+        index._next_ordinal = len(counts)
+        words_in_order = self._words_in_order
+        if words_in_order is not None:
+            index.rescan_order(lambda: filter(None, map(normalize, words_in_order())))
+        return index
+
+    def rescan_order(self, words_in_order: typing.Callable[[], typing.Iterable[str]]) -> None:
+        """
+        Stop trusting `first_seen` and find first occurrences in `words_in_order()` instead.
+        The counts must still match the words. Ranking then only looks for the
+        first occurrences of the words that tie for a place in the ranking,
+        and stops reading words as soon as it has seen all of them.
+        """
+        self._words_in_order = words_in_order
+        self._ranking = None
+
+    def __repr__(self) -> str:
+        """Return the 'official' string representation of the index."""
+        cls_name = self.__class__.__name__
+        return f"<{cls_name} words={len(self.counts)} total={self.total()}>"
+
+    def __len__(self) -> int:
+        """Return the number of distinct words in the index."""
+        return len(self.counts)
+
+    def total(self) -> int:
+        """Return the total number of words counted by the index."""
+        return sum(self.counts.values())
+
+    def update(self, words: typing.Iterable[str]) -> None:
+        """
+        Add `words` to the index as if they were appended to the text.
+        `collections.Counter` does the actual counting in C. As a `Counter`
+        remembers the order in which keys were first inserted, iterating over
+        it gives us the new words in order of first occurrence as well.
+        """
+        counts = self.counts
+        first_seen = self.first_seen
+        next_ordinal = self._next_ordinal
+
+        for word, count in collections.Counter(words).items():
+            if word in counts:
+                counts[word] += count
+            else:
+                counts[word] = count
+                first_seen[word] = next_ordinal
+                next_ordinal += 1
+
+        self._next_ordinal = next_ordinal
+        self._ranking = None
+
+    def add(self, other: WordFrequencyIndex) -> None:
+        """
+        Add the counts of `other` to this index.
+        Words that are new to this index are considered to first occur after
+        all words already in it, in the order in which they occurred in `other`.
+        If the order of the counts of `other` can't be trusted (see
+        `rescan_order`), the first occurrences of its new words are looked up
+        in its text.
+        """
+        counts = self.counts
+        first_seen = self.first_seen
+        other_counts = other.counts
+
+        new_words = []
+        for word, count in other_counts.items():
+            if word in counts:
+                counts[word] += count
+            else:
+                new_words.append(word)
+
+        if other._words_in_order is not None and len(new_words) > 1:
+            new_words.sort(key=other._first_positions(new_words).__getitem__)
+
+        for ordinal, word in enumerate(new_words, self._next_ordinal):
+            counts[word] = other_counts[word]
+            first_seen[word] = ordinal
+
+        self._next_ordinal += len(new_words)
+        self._ranking = None
+
+    def subtract(self, other: WordFrequencyIndex) -> None:
+        """
+        Subtract the counts of `other`, which must have been added before, from this index.
+        Words whose count drops to zero are removed. If they get added again
+        later, they count as first occurring after every word in the index.
+        This only touches the words of `other`: the other words keep their
+        ordinals, gaps and all, as only their order matters.
+        """
+        counts = self.counts
+        first_seen = self.first_seen
+
+        for word, count in other.counts.items():
+            remaining = counts[word] - count
+            if remaining > 0:
+                counts[word] = remaining
+            else:
+                del counts[word]
+                del first_seen[word]
+
+        self._ranking = None
+
+    def most_common(self, n_words: int) -> typing.Dict[str, int]:
+        """Return the `n_words` most common words with their counts."""
+        if n_words <= 0:
+            return {}
+
+        ranking = self._ranking
+        if ranking is None or len(ranking) < min(n_words, len(self.counts)):
+            ranking = self._ranking = self._rank(n_words)
+
+        counts = self.counts
+        return {word: counts[word] for word in ranking[:n_words]}
+
+    def _rank(self, n_words: int) -> typing.List[str]:
+        """
+        Return the `n_words` highest ranked words without sorting the entire vocabulary.
+        We first find the count of the `n_words`-th most common word using a
+        bounded heap over the plain counts, which is O(V log n) for V distinct
+        words. Only words with at least that count can make it into the result,
+        so those are the only candidates we need to sort. Sorting them by first
+        occurrence and then (stably) by descending count gives us the ranking.
+        """
+        counts = self.counts
+        if n_words < len(counts):
+            threshold = heapq.nlargest(n_words, counts.values())[-1]
+            candidates = [word for word, count in counts.items() if count >= threshold]
+        else:
+            candidates = list(counts)
+
+        if self._words_in_order is None:
+            candidates.sort(key=self.first_seen.__getitem__)
+        else:
+            candidates.sort(key=self._first_positions(candidates).__getitem__)
+        candidates.sort(key=counts.__getitem__, reverse=True)
+        return candidates[:n_words]
+
+    def _first_positions(self, words: typing.Iterable[str]) -> typing.Dict[str, int]:
+        """Return the position of the first occurrence of each of `words` in the text."""
+        missing = set(words)
+        positions = {}
+        for position, word in enumerate(self._words_in_order()):
+            if word in missing:
+                positions[word] = position
+                missing.remove(word)
+                if not missing:
+                    break
+        return positions